@@ -0,0 +1,9 @@
+"""
+Pytest setup for the backend tests (run from backend/: pytest py/tests).
+pytest imports its own top-level ``py`` compatibility module at startup, which
+shadows this backend's ``py`` package; drop it so the tests can import py.*.
+"""
+
+import sys
+
+sys.modules.pop("py", None)
@@ -13,19 +13,32 @@ backend_dir = Path(__file__).parent
 py_dir = backend_dir / "py"
 sys.path.insert(0, str(py_dir))
 
-# Load environment variables first
-from dotenv import load_dotenv
-load_dotenv(backend_dir / ".env")
+# Load environment variables first (cached, so py.main reuses the parsed .env)
+from py.core.config import load_env, env
+load_env()
 
 # Import and run the main application
 import uvicorn
 
 if __name__ == "__main__":
-    # Run development server
-    uvicorn.run(
-        "py.main:app",
-        host="0.0.0.0",
-        port=8000,
-        reload=True,
-        log_level="info"
-    )
\ No newline at end of file
+    if env("ENV") == "production":
+        # Production server: uvloop + httptools, one worker per core (capped at 4)
+        uvicorn.run(
+            "py.main:app",
+            host="0.0.0.0",
+            port=int(env("PORT", "8000")),
+            reload=False,
+            workers=min(os.cpu_count() or 1, 4),
+            loop="uvloop",
+            http="httptools",
+            log_level="info"
+        )
+    else:
+        # Run development server
+        uvicorn.run(
+            "py.main:app",
+            host="0.0.0.0",
+            port=8000,
+            reload=True,
+            log_level="info"
+        )
\ No newline at end of file
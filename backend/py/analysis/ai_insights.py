@@ -5,21 +5,88 @@ Generates strategic recommendations and insights from churn analysis data.
 """
 
 import os
-import json
+import copy
+import time
+import random
+import asyncio
+import hashlib
+import importlib.util
 import logging
-from typing import Dict, Any, Optional
-from datetime import datetime
+import functools
+from typing import Dict, Any, AsyncIterator, List, Optional, Tuple
 
-# OpenAI imports
-try:
-    from openai import OpenAI
-    OPENAI_AVAILABLE = True
-except ImportError:
-    OPENAI_AVAILABLE = False
+import orjson
+
+from ..core.config import env
+from ..core.utils import utc_now_iso
+
+# The OpenAI SDK is imported lazily by ChurnInsightsAI so workers that never
+# serve the AI endpoints don't pay for importing it at startup
+OPENAI_AVAILABLE = importlib.util.find_spec("openai") is not None
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# Retry policy for transient OpenAI failures (rate limits and 5xx)
+MAX_RETRY_ATTEMPTS = 8
+MAX_RETRY_DELAY_SECONDS = 60
+RETRYABLE_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+
+# Prompt size limits. Token count is estimated from character length
+# (~4 characters per token for English text) to avoid a tokenizer dependency.
+MAX_FEATURE_ROWS = 10
+MAX_PROMPT_TOKENS = 6000
+CHARS_PER_TOKEN = 4
+
+# Static prompt sections, built once at import time
+SYSTEM_MESSAGE = {
+    "role": "system",
+    "content": "You are a senior customer retention analyst and business strategist with expertise in telecom and subscription businesses. Provide actionable, data-driven insights and recommendations."
+}
+
+PROMPT_HEADER = """
+You are a senior customer retention strategist specializing in Apple's subscription services ecosystem. Analyze the following subscription churn data from an Apple service (Apple Music, Apple TV+, iCloud+, etc.) and provide customer-centric insights and strategic recommendations that align with Apple's values of thoughtful innovation and exceptional user experience.
+
+# SUBSCRIPTION CHURN ANALYSIS DATA
+
+## Overall Metrics
+"""
+
+PROMPT_FOOTER = """
+
+# ANALYSIS REQUEST
+
+As an Apple subscription retention strategist, provide a comprehensive analysis that reflects Apple's customer-first philosophy:
+
+1. **KEY INSIGHTS**: Identify the 3 most critical findings from this subscription data that reveal why customers are leaving Apple's service ecosystem.
+
+2. **STRATEGIC RECOMMENDATIONS**: Provide 2 specific, actionable strategies to improve subscriber retention that leverage Apple's strengths in user experience, ecosystem integration, and customer delight.
+
+3. **IMPACT FORECAST**: Write one clear paragraph predicting what will happen if no retention action is taken. Consider the potential consequences including: projected churn rate increases, revenue impact, damage to Apple's customer loyalty reputation, and long-term effects on the Apple services ecosystem. Be specific about timeframes and quantify the risks where possible based on the current data trends.
+
+Frame your analysis with Apple's focus on creating meaningful customer relationships, seamless experiences across devices, and long-term value creation. Consider how subscription churn affects the broader Apple ecosystem and customer lifetime value. Use the actual data points to support your strategic insights and recommendations.
+"""
+
+# Upper bound on in-flight OpenAI requests when generating insights in batch
+MAX_CONCURRENT_REQUESTS = 5
+
+
+def _top_feature_rows(feature_data: List[Dict[str, Any]], limit: int) -> List[Dict[str, Any]]:
+    """
+    Keep the `limit` highest-impact rows (churn_rate * n) of a feature breakdown.
+    
+    Original row order is preserved for the rows that are kept.
+    """
+    if len(feature_data) <= limit:
+        return feature_data
+    
+    ranked = sorted(
+        range(len(feature_data)),
+        key=lambda i: feature_data[i]["churn_rate"] * feature_data[i]["n"],
+        reverse=True
+    )
+    return [feature_data[i] for i in sorted(ranked[:limit])]
+
 
 class ChurnInsightsAI:
     """
@@ -33,11 +100,13 @@ class ChurnInsightsAI:
         Args:
             api_key: OpenAI API key (if None, loads from OPENAI_API_KEY env var)
         """
-        if not OPENAI_AVAILABLE:
+        try:
+            from openai import AsyncOpenAI
+        except ImportError:
             raise ImportError("OpenAI SDK not available. Install with: pip install openai")
         
         # Get API key from parameter or environment
-        self.api_key = api_key or os.getenv("OPENAI_API_KEY")
+        self.api_key = api_key or env("OPENAI_API_KEY")
         
         if not self.api_key:
             raise ValueError("OpenAI API key not found. Set OPENAI_API_KEY environment variable or pass api_key parameter.")
@@ -53,7 +122,7 @@ class ChurnInsightsAI:
                     del os.environ[var]
             
             # Initialize with minimal parameters - only api_key
-            self.client = OpenAI(api_key=self.api_key)
+            self.client = AsyncOpenAI(api_key=self.api_key)
             logger.info("OpenAI client created successfully")
             
         except Exception as e:
@@ -68,103 +137,186 @@ class ChurnInsightsAI:
         self.max_tokens = 2000
         self.temperature = 0.3  # Lower temperature for more focused, analytical responses
     
-    def _format_churn_data_prompt(self, churn_data: Dict[str, Any]) -> str:
+    def _format_churn_data_prompt(self, churn_data: Dict[str, Any], max_feature_rows: int = MAX_FEATURE_ROWS) -> Tuple[str, int, int]:
         """
         Format churn analysis data into a structured prompt for GPT-4o.
         
         Args:
             churn_data: Dictionary containing churn analysis metrics
+            max_feature_rows: Maximum rows included per service feature (highest impact first)
             
         Returns:
-            Formatted prompt string for the AI model
+            Tuple of (formatted prompt string for the AI model, prompt length in characters,
+            number of data points included in the prompt)
         """
-        prompt = """
-You are a senior customer retention strategist specializing in Apple's subscription services ecosystem. Analyze the following subscription churn data from an Apple service (Apple Music, Apple TV+, iCloud+, etc.) and provide customer-centric insights and strategic recommendations that align with Apple's values of thoughtful innovation and exceptional user experience.
-
-# SUBSCRIPTION CHURN ANALYSIS DATA
-
-## Overall Metrics
-"""
+        # Collect fragments and join once at the end instead of repeated
+        # string concatenation; the static header/footer are module constants
+        parts: List[str] = [PROMPT_HEADER]
+        
+        # Data points (overall rate + segment rows) are counted while formatting
+        data_points = 0
         
         # Add overall metrics
         if "overall_churn_rate" in churn_data:
-            prompt += f"- Overall Churn Rate: {churn_data['overall_churn_rate']:.2%}\n"
+            data_points += 1
+            parts.append(f"- Overall Churn Rate: {churn_data['overall_churn_rate']:.2%}\n")
         
         if "total_customers" in churn_data:
-            prompt += f"- Total Subscribers: {churn_data['total_customers']:,}\n"
+            parts.append(f"- Total Subscribers: {churn_data['total_customers']:,}\n")
         
         if "churned_customers" in churn_data:
-            prompt += f"- Churned Subscribers: {churn_data['churned_customers']:,}\n"
+            parts.append(f"- Churned Subscribers: {churn_data['churned_customers']:,}\n")
         
         if "average_tenure" in churn_data:
-            prompt += f"- Average Subscription Tenure: {churn_data['average_tenure']:.1f} months\n"
+            parts.append(f"- Average Subscription Tenure: {churn_data['average_tenure']:.1f} months\n")
         
         if "average_monthly_charges" in churn_data:
-            prompt += f"- Average Monthly Subscription Cost: ${churn_data['average_monthly_charges']:.2f}\n"
+            parts.append(f"- Average Monthly Subscription Cost: ${churn_data['average_monthly_charges']:.2f}\n")
         
         # Add contract analysis
         if "churn_by_contract" in churn_data:
-            prompt += "\n## Churn by Subscription Plan\n"
-            for contract in churn_data["churn_by_contract"]:
-                prompt += f"- {contract['key']}: {contract['churn_rate']:.2%} churn rate ({contract['n']:,} subscribers)\n"
+            parts.append("\n## Churn by Subscription Plan\n")
+            data_points += len(churn_data["churn_by_contract"])
+            parts.extend(
+                f"- {contract['key']}: {contract['churn_rate']:.2%} churn rate ({contract['n']:,} subscribers)\n"
+                for contract in churn_data["churn_by_contract"]
+            )
         
         # Add payment method analysis
         if "churn_by_payment" in churn_data:
-            prompt += "\n## Churn by Payment Method\n"
-            for payment in churn_data["churn_by_payment"]:
-                prompt += f"- {payment['key']}: {payment['churn_rate']:.2%} churn rate ({payment['n']:,} subscribers)\n"
+            parts.append("\n## Churn by Payment Method\n")
+            data_points += len(churn_data["churn_by_payment"])
+            parts.extend(
+                f"- {payment['key']}: {payment['churn_rate']:.2%} churn rate ({payment['n']:,} subscribers)\n"
+                for payment in churn_data["churn_by_payment"]
+            )
         
         # Add service features analysis
         if "churn_by_features" in churn_data:
-            prompt += "\n## Churn by Service Features\n"
+            parts.append("\n## Churn by Service Features\n")
             for feature, feature_data in churn_data["churn_by_features"].items():
-                prompt += f"### {feature}\n"
-                for item in feature_data:
-                    prompt += f"- {item['key']}: {item['churn_rate']:.2%} churn rate ({item['n']:,} subscribers)\n"
+                feature_rows = _top_feature_rows(feature_data, max_feature_rows)
+                data_points += len(feature_rows)
+                parts.append(f"### {feature}\n")
+                parts.extend(
+                    f"- {item['key']}: {item['churn_rate']:.2%} churn rate ({item['n']:,} subscribers)\n"
+                    for item in feature_rows
+                )
         
         # Add tenure distribution
         if "tenure_distribution" in churn_data:
-            prompt += "\n## Churned Subscribers by Tenure\n"
-            for tenure_bin in churn_data["tenure_distribution"]:
-                prompt += f"- {tenure_bin['range']} months: {tenure_bin['count']:,} subscribers ({tenure_bin['pct']:.1%})\n"
+            parts.append("\n## Churned Subscribers by Tenure\n")
+            parts.extend(
+                f"- {tenure_bin['range']} months: {tenure_bin['count']:,} subscribers ({tenure_bin['pct']:.1%})\n"
+                for tenure_bin in churn_data["tenure_distribution"]
+            )
         
         # Add monthly charges distribution
         if "monthly_charges_distribution" in churn_data:
-            prompt += "\n## Churned Subscribers by Monthly Cost\n"
-            for charge_bin in churn_data["monthly_charges_distribution"]:
-                prompt += f"- ${charge_bin['range']}: {charge_bin['count']:,} subscribers ({charge_bin['pct']:.1%})\n"
+            parts.append("\n## Churned Subscribers by Monthly Cost\n")
+            parts.extend(
+                f"- ${charge_bin['range']}: {charge_bin['count']:,} subscribers ({charge_bin['pct']:.1%})\n"
+                for charge_bin in churn_data["monthly_charges_distribution"]
+            )
         
         # Add ML model insights if available
         if "model_insights" in churn_data:
             model_data = churn_data["model_insights"]
-            prompt += f"\n## Predictive Model Insights\n"
-            prompt += f"- Model Performance (AUC): {model_data.get('auc', 'N/A')}\n"
+            parts.append("\n## Predictive Model Insights\n")
+            parts.append(f"- Model Performance (AUC): {model_data.get('auc', 'N/A')}\n")
             
             if "top_features" in model_data:
-                prompt += "- Most Important Predictive Features:\n"
+                parts.append("- Most Important Predictive Features:\n")
                 for i, feature in enumerate(model_data["top_features"][:5], 1):
                     weight_direction = "increases" if feature["weight"] > 0 else "decreases"
-                    prompt += f"  {i}. {feature['feature']} ({weight_direction} churn likelihood)\n"
+                    parts.append(f"  {i}. {feature['feature']} ({weight_direction} churn likelihood)\n")
         
         # Add analysis request
-        prompt += """
-
-# ANALYSIS REQUEST
-
-As an Apple subscription retention strategist, provide a comprehensive analysis that reflects Apple's customer-first philosophy:
-
-1. **KEY INSIGHTS**: Identify the 3 most critical findings from this subscription data that reveal why customers are leaving Apple's service ecosystem.
-
-2. **STRATEGIC RECOMMENDATIONS**: Provide 2 specific, actionable strategies to improve subscriber retention that leverage Apple's strengths in user experience, ecosystem integration, and customer delight.
-
-3. **IMPACT FORECAST**: Write one clear paragraph predicting what will happen if no retention action is taken. Consider the potential consequences including: projected churn rate increases, revenue impact, damage to Apple's customer loyalty reputation, and long-term effects on the Apple services ecosystem. Be specific about timeframes and quantify the risks where possible based on the current data trends.
-
-Frame your analysis with Apple's focus on creating meaningful customer relationships, seamless experiences across devices, and long-term value creation. Consider how subscription churn affects the broader Apple ecosystem and customer lifetime value. Use the actual data points to support your strategic insights and recommendations.
-"""
+        parts.append(PROMPT_FOOTER)
         
-        return prompt
+        prompt = "".join(parts)
+        return prompt, len(prompt), data_points
     
-    async def generate_insights(self, churn_data: Dict[str, Any]) -> str:
+    def _build_prompt(self, churn_data: Dict[str, Any]) -> Tuple[str, int, int]:
+        """
+        Format the prompt, trimming feature rows until it fits MAX_PROMPT_TOKENS.
+        
+        Args:
+            churn_data: Dictionary containing churn analysis metrics
+            
+        Returns:
+            Tuple of (prompt within the estimated token budget where possible, prompt length,
+            number of data points included)
+        """
+        max_feature_rows = MAX_FEATURE_ROWS
+        prompt, prompt_length, data_points = self._format_churn_data_prompt(churn_data, max_feature_rows)
+        
+        while prompt_length // CHARS_PER_TOKEN > MAX_PROMPT_TOKENS and max_feature_rows > 1:
+            max_feature_rows //= 2
+            prompt, prompt_length, data_points = self._format_churn_data_prompt(churn_data, max_feature_rows)
+        
+        return prompt, prompt_length, data_points
+    
+    async def _create_completion_with_retry(self, **kwargs) -> Any:
+        """
+        Call chat.completions.create, retrying rate-limit and 5xx errors.
+        
+        Uses exponential backoff with jitter, up to MAX_RETRY_ATTEMPTS attempts.
+        
+        Args:
+            **kwargs: Arguments forwarded to chat.completions.create
+            
+        Returns:
+            OpenAI chat completion response
+        """
+        # Already in sys.modules once the client has been created
+        from openai import APIStatusError
+        
+        for attempt in range(MAX_RETRY_ATTEMPTS):
+            try:
+                return await self.client.chat.completions.create(**kwargs)
+            except APIStatusError as e:
+                if e.status_code not in RETRYABLE_STATUS_CODES or attempt == MAX_RETRY_ATTEMPTS - 1:
+                    raise
+                
+                delay = min(MAX_RETRY_DELAY_SECONDS, 2 ** attempt + random.random())
+                logger.warning(
+                    f"OpenAI request failed with status {e.status_code}, "
+                    f"retrying in {delay:.1f}s (attempt {attempt + 1}/{MAX_RETRY_ATTEMPTS})"
+                )
+                await asyncio.sleep(delay)
+    
+    def _build_messages(self, prompt: str) -> List[Dict[str, str]]:
+        """Build the chat messages (system instructions + user prompt) for a request."""
+        return [
+            SYSTEM_MESSAGE,
+            {
+                "role": "user",
+                "content": prompt
+            }
+        ]
+    
+    async def _complete_prompt(self, prompt: str) -> str:
+        """
+        Send a formatted prompt to the model and return the assistant's reply.
+        
+        Args:
+            prompt: Formatted churn analysis prompt
+            
+        Returns:
+            AI-generated insights text
+        """
+        response = await self._create_completion_with_retry(
+            model=self.model,
+            messages=self._build_messages(prompt),
+            max_tokens=self.max_tokens,
+            temperature=self.temperature
+        )
+        
+        # Extract the assistant's response
+        return response.choices[0].message.content
+    
+    async def generate_insights(self, churn_data: Dict[str, Any]) -> Tuple[str, int, int]:
         """
         Generate AI-powered insights from churn analysis data.
         
@@ -172,7 +324,8 @@ Frame your analysis with Apple's focus on creating meaningful customer relations
             churn_data: Dictionary containing churn analysis metrics
             
         Returns:
-            AI-generated insights and recommendations as text
+            Tuple of (AI-generated insights text, prompt length in characters,
+            number of data points included in the prompt)
             
         Raises:
             ValueError: If churn_data is empty or invalid
@@ -182,41 +335,94 @@ Frame your analysis with Apple's focus on creating meaningful customer relations
             raise ValueError("Churn data cannot be empty")
         
         try:
-            # Format data into prompt
-            prompt = self._format_churn_data_prompt(churn_data)
+            # Format data into prompt (trimmed to the token budget)
+            prompt, prompt_length, data_points = self._build_prompt(churn_data)
             
             logger.info(f"Generating AI insights using {self.model}")
-            logger.debug(f"Prompt length: {len(prompt)} characters")
-            
-            # Call OpenAI API
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "You are a senior customer retention analyst and business strategist with expertise in telecom and subscription businesses. Provide actionable, data-driven insights and recommendations."
-                    },
-                    {
-                        "role": "user",
-                        "content": prompt
-                    }
-                ],
-                max_tokens=self.max_tokens,
-                temperature=self.temperature
-            )
+            logger.debug(f"Prompt length: {prompt_length} characters")
             
-            # Extract the assistant's response
-            insights = response.choices[0].message.content
+            # Call OpenAI API (awaited so the event loop keeps serving other requests)
+            insights = await self._complete_prompt(prompt)
             
             logger.info(f"AI insights generated successfully ({len(insights)} characters)")
             
-            return insights
+            return insights, prompt_length, data_points
             
         except Exception as e:
             logger.error(f"Error generating AI insights: {e}")
             raise Exception(f"Failed to generate AI insights: {str(e)}")
     
-    def validate_api_key(self) -> bool:
+    async def generate_insights_stream(self, churn_data: Dict[str, Any]) -> AsyncIterator[str]:
+        """
+        Stream AI-powered insights from churn analysis data as they are generated.
+        
+        Args:
+            churn_data: Dictionary containing churn analysis metrics
+            
+        Yields:
+            Text fragments of the assistant's response in order
+            
+        Raises:
+            ValueError: If churn_data is empty or invalid
+        """
+        if not churn_data:
+            raise ValueError("Churn data cannot be empty")
+        
+        prompt, prompt_length, _ = self._build_prompt(churn_data)
+        
+        logger.info(f"Streaming AI insights using {self.model}")
+        logger.debug(f"Prompt length: {prompt_length} characters")
+        
+        stream = await self._create_completion_with_retry(
+            model=self.model,
+            messages=self._build_messages(prompt),
+            max_tokens=self.max_tokens,
+            temperature=self.temperature,
+            stream=True
+        )
+        
+        async for chunk in stream:
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
+    
+    async def generate_insights_batch(self, payloads: List[Dict[str, Any]]) -> List[str]:
+        """
+        Generate insights for several churn data payloads concurrently.
+        
+        At most MAX_CONCURRENT_REQUESTS calls are in flight at once to stay
+        within the OpenAI rate limits.
+        
+        Args:
+            payloads: List of churn data dictionaries (e.g. one per segment)
+            
+        Returns:
+            List of insights texts in the same order as payloads; an empty
+            string marks a payload whose generation failed
+        """
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+        
+        async def complete(churn_data: Dict[str, Any]) -> str:
+            if not churn_data:
+                raise ValueError("Churn data cannot be empty")
+            prompt, _, _ = self._build_prompt(churn_data)
+            async with semaphore:
+                return await self._complete_prompt(prompt)
+        
+        logger.info(f"Generating AI insights for {len(payloads)} payloads using {self.model}")
+        
+        responses = await asyncio.gather(*(complete(p) for p in payloads), return_exceptions=True)
+        
+        results = []
+        for response in responses:
+            if isinstance(response, Exception):
+                logger.error(f"Error generating AI insights in batch: {response}")
+                results.append("")
+            else:
+                results.append(response)
+        
+        return results
+    
+    async def validate_api_key(self) -> bool:
         """
         Validate OpenAI API key by making a simple test request.
         
@@ -225,7 +431,7 @@ Frame your analysis with Apple's focus on creating meaningful customer relations
         """
         try:
             # Make a minimal test request
-            response = self.client.chat.completions.create(
+            response = await self.client.chat.completions.create(
                 model="gpt-3.5-turbo",  # Use cheaper model for validation
                 messages=[{"role": "user", "content": "Hello"}],
                 max_tokens=5
@@ -236,15 +442,56 @@ Frame your analysis with Apple's focus on creating meaningful customer relations
             return False
 
 
-# Global AI insights generator instance
-_ai_generator = None
+# In-process cache of generated insights keyed on a hash of the churn payload.
+# Dashboards re-request identical analyses on reload; this skips the OpenAI call.
+# Entries are kept in insertion order, so the oldest is evicted first once
+# INSIGHTS_CACHE_MAX_ENTRIES is reached.
+INSIGHTS_CACHE_TTL_SECONDS = 3600
+INSIGHTS_CACHE_MAX_ENTRIES = 256
+_insights_cache: Dict[bytes, Tuple[float, Dict[str, Any]]] = {}
 
+
+@functools.lru_cache(maxsize=1)
 def get_ai_generator() -> ChurnInsightsAI:
-    """Get global AI insights generator instance."""
-    global _ai_generator
-    if _ai_generator is None:
-        _ai_generator = ChurnInsightsAI()
-    return _ai_generator
+    """Get global AI insights generator instance (created once, then reused)."""
+    return ChurnInsightsAI()
+
+
+def _churn_data_cache_key(churn_data: Dict[str, Any]) -> bytes:
+    """Build a stable cache key for a churn data payload."""
+    payload = orjson.dumps(churn_data, option=orjson.OPT_SORT_KEYS, default=str)
+    return hashlib.blake2b(payload, digest_size=16).digest()
+
+
+def _get_cached_insights(cache_key: bytes) -> Optional[Dict[str, Any]]:
+    """Return cached insights for the key if present and not expired."""
+    entry = _insights_cache.get(cache_key)
+    if entry is None:
+        return None
+    
+    stored_at, result = entry
+    if time.monotonic() - stored_at > INSIGHTS_CACHE_TTL_SECONDS:
+        _insights_cache.pop(cache_key, None)
+        return None
+    
+    # Hand out a copy so callers can't mutate the cached insights
+    return copy.deepcopy(result)
+
+
+def _store_cached_insights(cache_key: bytes, result: Dict[str, Any]) -> None:
+    """Store insights in the cache, evicting expired entries and then the oldest beyond the size limit."""
+    now = time.monotonic()
+    expired = [key for key, (stored_at, _) in _insights_cache.items() if now - stored_at > INSIGHTS_CACHE_TTL_SECONDS]
+    for key in expired:
+        del _insights_cache[key]
+    
+    # Re-inserting moves the key to the end (newest)
+    _insights_cache.pop(cache_key, None)
+    while len(_insights_cache) >= INSIGHTS_CACHE_MAX_ENTRIES:
+        del _insights_cache[next(iter(_insights_cache))]
+    
+    # Store a copy so later changes to the caller's dict don't leak into the cache
+    _insights_cache[cache_key] = (now, copy.deepcopy(result))
 
 
 async def generate_churn_insights(churn_data: Dict[str, Any]) -> Dict[str, Any]:
@@ -268,37 +515,53 @@ async def generate_churn_insights(churn_data: Dict[str, Any]) -> Dict[str, Any]:
         }
     """
     try:
-        ai_generator = get_ai_generator()
+        # Identical payloads within the TTL are served from cache
+        cache_key = _churn_data_cache_key(churn_data)
+        cached_result = _get_cached_insights(cache_key)
+        if cached_result is not None:
+            logger.info("Serving AI insights from cache")
+            return cached_result
         
-        # Generate insights
-        insights_text = await ai_generator.generate_insights(churn_data)
+        ai_generator = get_ai_generator()
         
-        # Count data points for metadata
-        data_points = 0
-        if "overall_churn_rate" in churn_data:
-            data_points += 1
-        if "churn_by_contract" in churn_data:
-            data_points += len(churn_data["churn_by_contract"])
-        if "churn_by_payment" in churn_data:
-            data_points += len(churn_data["churn_by_payment"])
-        if "churn_by_features" in churn_data:
-            for feature_data in churn_data["churn_by_features"].values():
-                data_points += len(feature_data)
+        # Generate insights (prompt length and data point count come back with
+        # the text so the payload is only walked once, while formatting the prompt)
+        insights_text, prompt_length, data_points = await ai_generator.generate_insights(churn_data)
         
-        return {
+        result = {
             "insights": insights_text,
             "metadata": {
-                "generated_at": datetime.utcnow().isoformat() + "Z",
+                "generated_at": utc_now_iso(),
                 "model_used": ai_generator.model,
                 "data_points_analyzed": data_points,
-                "prompt_length": len(ai_generator._format_churn_data_prompt(churn_data))
+                "prompt_length": prompt_length
             }
         }
         
+        _store_cached_insights(cache_key, result)
+        
+        return result
+        
     except Exception as e:
         raise ValueError(f"Failed to generate churn insights: {str(e)}")
 
 
+async def stream_churn_insights(churn_data: Dict[str, Any]) -> AsyncIterator[str]:
+    """
+    Stream AI-powered churn insights as text fragments while they are generated.
+    
+    Args:
+        churn_data: Dictionary containing churn analysis metrics
+        
+    Yields:
+        Text fragments of the generated insights
+    """
+    ai_generator = get_ai_generator()
+    
+    async for fragment in ai_generator.generate_insights_stream(churn_data):
+        yield fragment
+
+
 async def validate_openai_connection() -> Dict[str, Any]:
     """
     Validate OpenAI API connection and key.
@@ -308,7 +571,7 @@ async def validate_openai_connection() -> Dict[str, Any]:
     """
     try:
         ai_generator = get_ai_generator()
-        is_valid = ai_generator.validate_api_key()
+        is_valid = await ai_generator.validate_api_key()
         
         return {
             "api_key_valid": is_valid,
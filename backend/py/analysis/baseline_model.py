@@ -6,7 +6,11 @@ Implements a complete ML pipeline with data preprocessing, training, evaluation,
 
 import os
 import json
-import pickle
+import time
+import asyncio
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
 from typing import Dict, Any, List, Optional, Tuple
 from datetime import datetime
 import asyncpg
@@ -21,14 +25,182 @@ try:
     from sklearn.preprocessing import StandardScaler, LabelEncoder
     from sklearn.metrics import roc_auc_score, classification_report, confusion_matrix
     from sklearn.pipeline import Pipeline
-    import joblib
+    from scipy import sparse
     ML_AVAILABLE = True
 except ImportError:
     ML_AVAILABLE = False
 
-from ..core.db import fetch_df
+# Cross-process file locking: flock on POSIX, msvcrt byte-range locks on Windows
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+    import msvcrt
+
+# How often an async waiter retries a held training lock
+TRAINING_LOCK_POLL_SECONDS = 0.1
+
+from ..core.db import db_manager
 from ..core.utils import safe_div, round_fp
 
+# Boolean feature levels; position is the encoded value
+YES_NO_CATEGORIES = ["No", "Yes"]
+
+# Rows fetched per cursor round trip when loading training data
+TRAINING_FETCH_BATCH_SIZE = 10_000
+
+# Worker processes that fit and save models off the event loop
+TRAIN_POOL_MAX_WORKERS = 2
+
+# SQL query to get all required features
+# Exclude total_charges to avoid collinearity
+# NULL categories become 'Unknown' and Yes/No flags become 0/1 in the
+# database, so only compact values come over the wire
+TRAINING_DATA_SQL = """
+SELECT 
+    CASE WHEN "Churn" = 'Yes' THEN 1 ELSE 0 END as churn,
+    tenure,
+    "MonthlyCharges",
+    COALESCE("Contract", 'Unknown') AS "Contract",
+    COALESCE("PaymentMethod", 'Unknown') AS "PaymentMethod",
+    (CASE WHEN "OnlineSecurity" = 'Yes' THEN 1 ELSE 0 END)::smallint AS "OnlineSecurity",
+    (CASE WHEN "TechSupport" = 'Yes' THEN 1 ELSE 0 END)::smallint AS "TechSupport"
+FROM churn_customers
+WHERE tenure IS NOT NULL 
+  AND "MonthlyCharges" IS NOT NULL;
+"""
+
+
+class BaselineChurnModel:
+    """
+    Lightweight inference model rebuilt from the saved .npz artifact.
+    
+    Holds only the scaler-folded coefficients, so loading it doesn't unpickle
+    a full scikit-learn pipeline.
+    """
+    
+    def __init__(self, coef: np.ndarray, intercept: np.ndarray, scale: np.ndarray, feature_names: List[str]):
+        # StandardScaler(with_mean=False) only divides by scale_, so it folds
+        # straight into the linear weights
+        self.weights = (coef[0] / scale).astype(np.float64)
+        self.intercept = float(intercept[0])
+        self.feature_names = feature_names
+    
+    def predict_proba(self, X: Any) -> np.ndarray:
+        """
+        Predict class probabilities for a dense or sparse feature matrix.
+        
+        Args:
+            X: Feature matrix with columns in feature_names order
+            
+        Returns:
+            Array of shape (n_samples, 2) with [P(no churn), P(churn)] per row
+        """
+        logits = np.asarray(X @ self.weights).ravel() + self.intercept
+        churn_proba = 1.0 / (1.0 + np.exp(-logits))
+        return np.column_stack([1.0 - churn_proba, churn_proba])
+
+
+class TrainingLock:
+    """
+    Exclusive lock serializing model training and artifact writes across processes.
+    
+    Held on a lock file in the model directory, so every server worker (and
+    any other process training into the same directory) shares it. The OS
+    releases it if the holding process dies, so a crashed run never leaves
+    the lock stuck. The holder writes its PID into the file, which lets
+    is_held() answer without taking the lock.
+    """
+    
+    def __init__(self, path: Path):
+        self.path = path
+        self._fd: Optional[int] = None
+    
+    def acquire(self, blocking: bool = True) -> bool:
+        """
+        Acquire the lock; blocks the calling thread unless blocking is False.
+        
+        Args:
+            blocking: Wait for the lock instead of failing when it is held
+            
+        Returns:
+            True if the lock was acquired, False if it is held elsewhere (non-blocking only)
+        """
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            if fcntl is not None:
+                fcntl.flock(fd, fcntl.LOCK_EX | (0 if blocking else fcntl.LOCK_NB))
+            else:
+                while True:
+                    try:
+                        msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+                        break
+                    except OSError:
+                        if not blocking:
+                            raise BlockingIOError
+                        time.sleep(0.1)
+        except BlockingIOError:
+            os.close(fd)
+            return False
+        
+        # Fixed width, so a stale longer PID is always fully overwritten
+        os.write(fd, f"{os.getpid():<20}".encode())
+        self._fd = fd
+        return True
+    
+    async def acquire_async(self) -> None:
+        """
+        Wait for the lock without blocking the event loop.
+        
+        Retries non-blocking attempts between sleeps instead of waiting in a
+        thread, so cancelling the waiter can't leave the lock acquired by a
+        thread nobody releases it from.
+        """
+        while not self.acquire(blocking=False):
+            await asyncio.sleep(TRAINING_LOCK_POLL_SECONDS)
+    
+    def release(self) -> None:
+        """Release the lock (no-op if it is not held)."""
+        if self._fd is not None:
+            # Clear the holder PID; closing the descriptor drops the lock
+            os.ftruncate(self._fd, 0)
+            os.close(self._fd)
+            self._fd = None
+    
+    def is_held(self) -> bool:
+        """
+        Whether any process holds the lock, checked without taking it.
+        
+        Probing by acquiring would make a concurrent non-blocking acquire
+        (e.g. a retrain request) fail, so the holder PID is read instead.
+        
+        Returns:
+            True if a live process holds the lock
+        """
+        try:
+            with open(self.path, "rb") as f:
+                holder = f.read().strip()
+        except FileNotFoundError:
+            return False
+        except PermissionError:
+            # Windows: the holder's byte-range lock blocks reading the file
+            return True
+        
+        # On Windows a readable file is unlocked, whatever PID it still holds
+        if fcntl is None or not holder.isdigit():
+            return False
+        
+        try:
+            # Signal 0 only checks that the process exists
+            os.kill(int(holder), 0)
+        except ProcessLookupError:
+            # The holder died without releasing (the OS already dropped its lock)
+            return False
+        except PermissionError:
+            # Alive, but owned by another user
+            return True
+        return True
+
 
 class ChurnModelTrainer:
     """
@@ -44,16 +216,21 @@ class ChurnModelTrainer:
         self.categorical_features = ["Contract", "PaymentMethod"]
         self.boolean_features = ["OnlineSecurity", "TechSupport"]
         
-        # Model files
-        self.model_path = self.model_dir / "baseline_model.pkl"
-        self.metadata_path = self.model_dir / "baseline_metadata.json"
-        self.scaler_path = self.model_dir / "baseline_scaler.pkl"
+        # Model file (coefficients, scaler and metadata in one artifact)
+        self.model_path = self.model_dir / "baseline_model.npz"
+        
+        # Lock file guarding training runs and artifact writes (see TrainingLock)
+        self.lock_path = self.model_dir / ".training.lock"
+        
+        # Last loaded (model, metadata) and the file mtime it was loaded at
+        self._cached_model: Optional[Tuple[BaselineChurnModel, Dict[str, Any]]] = None
+        self._cached_mtime: Optional[int] = None
         
         # Model configuration
         self.test_size = 0.2
         self.random_state = 42
         self.model_params = {
-            "solver": "liblinear",
+            "solver": "saga",
             "class_weight": "balanced", 
             "max_iter": 1000,
             "random_state": self.random_state
@@ -66,29 +243,13 @@ class ChurnModelTrainer:
         Returns:
             Preprocessed DataFrame ready for training
         """
-        # SQL query to get all required features
-        # Exclude total_charges to avoid collinearity
-        sql = """
-        SELECT 
-            CASE WHEN "Churn" = 'Yes' THEN 1 ELSE 0 END as churn,
-            tenure,
-            "MonthlyCharges",
-            "Contract",
-            "PaymentMethod", 
-            "OnlineSecurity",
-            "TechSupport"
-        FROM churn_customers
-        WHERE tenure IS NOT NULL 
-          AND "MonthlyCharges" IS NOT NULL;
-        """
-        
         if conn:
             # Use provided connection
-            rows = await conn.fetch(sql)
-            df = pd.DataFrame([dict(row) for row in rows])
+            df = await self._fetch_training_frame(conn, TRAINING_DATA_SQL)
         else:
-            # Use global db manager
-            df = await fetch_df(sql)
+            # Use a connection from the shared pool
+            async with db_manager.get_connection() as pool_conn:
+                df = await self._fetch_training_frame(pool_conn, TRAINING_DATA_SQL)
         
         if df.empty:
             raise ValueError("No data available for model training")
@@ -98,104 +259,136 @@ class ChurnModelTrainer:
         
         return df
     
+    async def _fetch_training_frame(self, conn: asyncpg.Connection, sql: str) -> pd.DataFrame:
+        """
+        Stream the training query through a server-side cursor into a DataFrame.
+        
+        Rows are pulled in batches of TRAINING_FETCH_BATCH_SIZE and each batch is
+        turned into a frame right away, so only one batch of Records is alive at
+        a time instead of the whole result set.
+        
+        Args:
+            conn: Database connection
+            sql: Training data query
+            
+        Returns:
+            DataFrame with query results (empty if no rows)
+        """
+        frames = []
+        
+        # Cursors require a transaction
+        async with conn.transaction():
+            cursor = await conn.cursor(sql)
+            while True:
+                batch = await cursor.fetch(TRAINING_FETCH_BATCH_SIZE)
+                if not batch:
+                    break
+                # Build the frame straight from the Records (iterated in C)
+                # instead of materializing one dict per row
+                frames.append(pd.DataFrame.from_records(batch, columns=list(batch[0].keys())))
+        
+        if not frames:
+            return pd.DataFrame()
+        
+        return pd.concat(frames, ignore_index=True) if len(frames) > 1 else frames[0]
+    
     def _preprocess_features(self, df: pd.DataFrame) -> pd.DataFrame:
         """
         Preprocess features according to specifications.
         
+        Mutates the input; call on a freshly-loaded frame only.
+        
         Args:
             df: Raw DataFrame from database
             
         Returns:
             Preprocessed DataFrame
         """
-        df = df.copy()
-        
-        # Handle numeric features - fill missing with median
-        for col in self.numeric_features:
-            if col in df.columns:
-                median_val = df[col].median()
-                df[col] = df[col].fillna(median_val)
+        # Handle numeric features - fill missing with median (one fillna call)
+        numeric_cols = [col for col in self.numeric_features if col in df.columns]
+        df.fillna(df[numeric_cols].median().to_dict(), inplace=True)
         
-        # Handle categorical features - fill missing with "Unknown"
-        for col in self.categorical_features:
-            if col in df.columns:
-                df[col] = df[col].fillna("Unknown")
-        
-        # Handle boolean features - convert to 0/1, NULL=0
+        # Boolean features arrive as 0/1 (NULL=0) from the query. Frames that still
+        # carry raw Yes/No text are mapped through category codes: one C-level
+        # lookup where "No"=0, "Yes"=1 and anything else/NULL (code -1) becomes 0.
         for col in self.boolean_features:
-            if col in df.columns:
-                # Map Yes/No to 1/0, NULL to 0
-                df[col] = df[col].map({"Yes": 1, "No": 0}).fillna(0).astype(int)
+            if col in df.columns and not pd.api.types.is_numeric_dtype(df[col]):
+                df[col] = pd.Categorical(df[col], categories=YES_NO_CATEGORIES).codes.clip(min=0)
+        
+        # Categorical features arrive with NULLs already mapped to "Unknown";
+        # set categorical and boolean dtypes at once.
+        # Categories let one-hot encoding work on integer codes.
+        dtypes = {col: "category" for col in self.categorical_features if col in df.columns}
+        dtypes.update({col: np.int8 for col in self.boolean_features if col in df.columns})
+        df = df.astype(dtypes)
         
         return df
     
-    def _create_features(self, df: pd.DataFrame) -> Tuple[pd.DataFrame, List[str]]:
+    def _create_features(self, df: pd.DataFrame) -> Tuple["sparse.csr_matrix", List[str]]:
         """
-        Create feature matrix with one-hot encoding.
+        Create sparse feature matrix with one-hot encoding.
         
         Args:
             df: Preprocessed DataFrame
             
         Returns:
-            Tuple of (feature_matrix, feature_names)
+            Tuple of (CSR feature_matrix, feature_names)
         """
-        features = []
-        feature_names = []
-        
-        # Add numeric features
-        for col in self.numeric_features:
-            if col in df.columns:
-                features.append(df[col].values.reshape(-1, 1))
-                feature_names.append(col)
-        
-        # Add boolean features
-        for col in self.boolean_features:
-            if col in df.columns:
-                features.append(df[col].values.reshape(-1, 1))
-                feature_names.append(col)
-        
-        # One-hot encode categorical features
-        for col in self.categorical_features:
-            if col in df.columns:
-                # Get unique values
-                unique_vals = sorted(df[col].unique())
-                
-                # Create one-hot columns (drop first to avoid multicollinearity)
-                for i, val in enumerate(unique_vals[1:], 1):
-                    one_hot = (df[col] == val).astype(int).values.reshape(-1, 1)
-                    features.append(one_hot)
-                    feature_names.append(f"{col}_{val}")
-        
-        # Combine all features
-        if features:
-            X = np.hstack(features)
-        else:
+        # Numeric and boolean features go in as-is
+        dense_cols = [col for col in self.numeric_features + self.boolean_features if col in df.columns]
+        
+        # One-hot encode categorical features in one call (drop first level to
+        # avoid multicollinearity); columns are named "<feature>_<value>".
+        # The columns are category dtype (see _preprocess_features), so this
+        # works on the integer codes and levels come out in sorted order.
+        categorical_cols = [col for col in self.categorical_features if col in df.columns]
+        one_hot = pd.get_dummies(df[categorical_cols], drop_first=True, dtype=np.int8)
+        
+        feature_names = dense_cols + list(one_hot.columns)
+        if not feature_names:
             raise ValueError("No features available for training")
         
-        return pd.DataFrame(X, columns=feature_names), feature_names
+        # Single float32 CSR matrix; the one-hot block is mostly zeros, so
+        # scaling and fitting only touch the stored entries
+        X = sparse.hstack(
+            [
+                sparse.csr_matrix(df[dense_cols].to_numpy(dtype=np.float32)),
+                sparse.csr_matrix(one_hot.to_numpy(dtype=np.float32))
+            ],
+            format="csr"
+        )
+        
+        return X, feature_names
     
-    def _train_model(self, X: pd.DataFrame, y: pd.Series) -> Tuple[Pipeline, Dict[str, Any]]:
+    def _train_model(self, X: "sparse.csr_matrix", y: pd.Series, feature_names: List[str]) -> Tuple[Pipeline, Dict[str, Any]]:
         """
         Train logistic regression model with evaluation.
         
         Args:
-            X: Feature matrix
+            X: Sparse feature matrix
             y: Target variable
+            feature_names: Column names of X
             
         Returns:
             Tuple of (trained_pipeline, evaluation_metrics)
         """
-        # Split data
-        X_train, X_test, y_train, y_test = train_test_split(
-            X, y, 
+        # Split row indices (stratified), then gather each side from the
+        # matrix once
+        y_values = y.to_numpy()
+        train_idx, test_idx = train_test_split(
+            np.arange(len(y_values)),
             test_size=self.test_size,
-            stratify=y,
+            stratify=y_values,
             random_state=self.random_state
         )
+        X_train, X_test = X[train_idx], X[test_idx]
+        y_train, y_test = y_values[train_idx], y_values[test_idx]
         
-        # Create pipeline with scaling and logistic regression
+        # Create pipeline with scaling and logistic regression; the split
+        # matrices are already copies, so they are scaled in place. Sparse input
+        # can't be mean-centered, so features are scaled to unit variance only.
         pipeline = Pipeline([
-            ("scaler", StandardScaler()),
+            ("scaler", StandardScaler(with_mean=False, copy=False)),
             ("classifier", LogisticRegression(**self.model_params))
         ])
         
@@ -211,7 +404,7 @@ class ChurnModelTrainer:
         
         # Create feature importance ranking
         feature_importance = []
-        for i, (feature_name, coef) in enumerate(zip(X.columns, coefficients)):
+        for i, (feature_name, coef) in enumerate(zip(feature_names, coefficients)):
             feature_importance.append({
                 "feature": feature_name,
                 "weight": round_fp(float(coef), 4)
@@ -227,9 +420,9 @@ class ChurnModelTrainer:
         metrics = {
             "auc": round_fp(float(auc_score), 4),
             "top_features": top_features,
-            "total_features": len(X.columns),
-            "train_samples": len(X_train),
-            "test_samples": len(X_test),
+            "total_features": len(feature_names),
+            "train_samples": X_train.shape[0],
+            "test_samples": X_test.shape[0],
             "positive_rate": round_fp(float(y.mean()), 4)
         }
         
@@ -237,17 +430,14 @@ class ChurnModelTrainer:
     
     def _save_model(self, pipeline: Pipeline, metrics: Dict[str, Any], feature_names: List[str]):
         """
-        Save trained model and metadata to disk.
+        Save trained model and metadata to disk as a single compressed .npz.
         
         Args:
             pipeline: Trained model pipeline
             metrics: Evaluation metrics
             feature_names: List of feature names
         """
-        # Save model
-        joblib.dump(pipeline, self.model_path)
-        
-        # Save metadata
+        # Metadata is stored inside the artifact as a JSON string
         metadata = {
             "model_type": "LogisticRegression",
             "feature_names": feature_names,
@@ -261,34 +451,72 @@ class ChurnModelTrainer:
             "metrics": metrics
         }
         
-        with open(self.metadata_path, "w") as f:
-            json.dump(metadata, f, indent=2)
+        scaler = pipeline.named_steps["scaler"]
+        classifier = pipeline.named_steps["classifier"]
+        
+        # Write to a temporary file and swap it in, so readers never see a
+        # partially written artifact
+        tmp_path = self.model_path.with_name(self.model_path.name + ".tmp")
+        with open(tmp_path, "wb") as f:
+            np.savez_compressed(
+                f,
+                coef=classifier.coef_,
+                intercept=classifier.intercept_,
+                scale=scaler.scale_,
+                feature_names=np.asarray(feature_names),
+                metadata_json=np.asarray(json.dumps(metadata))
+            )
+        os.replace(tmp_path, self.model_path)
     
-    def _load_model(self) -> Tuple[Pipeline, Dict[str, Any]]:
+    def _load_model(self) -> Tuple[BaselineChurnModel, Dict[str, Any]]:
         """
         Load saved model and metadata from disk.
         
+        The result is kept in memory and reused until the file changes on disk.
+        
         Returns:
-            Tuple of (model_pipeline, metadata)
+            Tuple of (model, metadata)
         """
-        if not self.model_path.exists() or not self.metadata_path.exists():
-            raise FileNotFoundError("Model files not found")
-        
-        # Load model
-        pipeline = joblib.load(self.model_path)
-        
-        # Load metadata
-        with open(self.metadata_path, "r") as f:
-            metadata = json.load(f)
-        
-        return pipeline, metadata
+        # A missing artifact surfaces as FileNotFoundError from stat(); callers
+        # (load_or_train, get_model_info) handle it
+        mtime = self.model_path.stat().st_mtime_ns
+        if self._cached_model is not None and mtime == self._cached_mtime:
+            return self._cached_model
+        
+        with np.load(self.model_path) as artifact:
+            model = BaselineChurnModel(
+                coef=artifact["coef"],
+                intercept=artifact["intercept"],
+                scale=artifact["scale"],
+                feature_names=artifact["feature_names"].tolist()
+            )
+            metadata = json.loads(artifact["metadata_json"].item())
+        
+        self._cached_model = (model, metadata)
+        self._cached_mtime = mtime
+        
+        return self._cached_model
+    
+    def training_lock(self) -> TrainingLock:
+        """Get a (not yet acquired) lock on this model directory's training runs."""
+        return TrainingLock(self.lock_path)
     
-    async def train_and_save(self, conn: Optional[asyncpg.Connection] = None) -> Dict[str, Any]:
+    def is_training(self) -> bool:
+        """Whether any process currently holds the training lock."""
+        return self.training_lock().is_held()
+    
+    async def train_and_save(self, conn: Optional[asyncpg.Connection] = None, lock: Optional[TrainingLock] = None) -> Dict[str, Any]:
         """
         Train baseline churn prediction model and save to disk.
         
+        Runs under the training lock, so concurrent runs (in this or another
+        server worker) are serialized and never write the artifact at once.
+        
         Args:
             conn: Optional database connection
+            lock: Training lock already acquired by the caller, which also
+                releases it; when None the lock is acquired (waiting for any
+                running training) and released here
             
         Returns:
             Dict with model metrics and training info
@@ -296,38 +524,65 @@ class ChurnModelTrainer:
         if not ML_AVAILABLE:
             raise ImportError("scikit-learn not available. Install with: pip install scikit-learn")
         
+        owned_lock = self.training_lock() if lock is None else None
+        
         try:
-            # Load and preprocess data
-            df = await self.load_and_preprocess_data(conn)
-            
-            # Prepare features and target
-            X, feature_names = self._create_features(df)
-            y = df["churn"]
-            
-            # Train model
-            pipeline, metrics = self._train_model(X, y)
+            if owned_lock is not None:
+                await owned_lock.acquire_async()
             
-            # Save model and metadata
-            self._save_model(pipeline, metrics, feature_names)
+            # Load and preprocess data (async I/O, stays on the event loop)
+            df = await self.load_and_preprocess_data(conn)
             
-            return {
-                "status": "success",
-                "message": f"Model trained and saved successfully",
-                "model": {
-                    "auc": metrics["auc"],
-                    "top_features": metrics["top_features"]
-                },
-                "training_info": {
-                    "total_samples": len(df),
-                    "total_features": metrics["total_features"],
-                    "train_samples": metrics["train_samples"],
-                    "test_samples": metrics["test_samples"],
-                    "positive_rate": metrics["positive_rate"]
-                }
-            }
+            # Fit and save in a worker process so the CPU-bound training
+            # doesn't stall other requests; the loaded frame is shipped to the
+            # worker, which needs no database access of its own
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(_get_train_pool(), _fit_and_save_in_worker, str(self.model_dir), df)
             
         except Exception as e:
             raise ValueError(f"Model training failed: {str(e)}")
+        
+        finally:
+            if owned_lock is not None:
+                owned_lock.release()
+    
+    def fit_and_save(self, df: pd.DataFrame) -> Dict[str, Any]:
+        """
+        Train the model on already-loaded training data and save it to disk.
+        
+        Blocking and CPU-bound; train_and_save runs it in a worker process.
+        
+        Args:
+            df: Preprocessed DataFrame from load_and_preprocess_data
+            
+        Returns:
+            Dict with model metrics and training info
+        """
+        # Prepare features and target
+        X, feature_names = self._create_features(df)
+        y = df["churn"].astype(np.int8)
+        
+        # Train model
+        pipeline, metrics = self._train_model(X, y, feature_names)
+        
+        # Save model and metadata
+        self._save_model(pipeline, metrics, feature_names)
+        
+        return {
+            "status": "success",
+            "message": f"Model trained and saved successfully",
+            "model": {
+                "auc": metrics["auc"],
+                "top_features": metrics["top_features"]
+            },
+            "training_info": {
+                "total_samples": len(df),
+                "total_features": metrics["total_features"],
+                "train_samples": metrics["train_samples"],
+                "test_samples": metrics["test_samples"],
+                "positive_rate": metrics["positive_rate"]
+            }
+        }
     
     async def load_or_train(self, conn: Optional[asyncpg.Connection] = None) -> Dict[str, Any]:
         """
@@ -366,28 +621,69 @@ class ChurnModelTrainer:
 
 # Global trainer instance
 _trainer = None
+_trainer_lock = threading.Lock()
+
+# Process pool for model fitting, created on first use
+_train_pool: Optional[ProcessPoolExecutor] = None
+_train_pool_lock = threading.Lock()
+
+# Last get_model_info result and the model file mtime it was built from
+_model_info_cache: Optional[Tuple[int, Dict[str, Any]]] = None
+
+
+def _get_train_pool() -> ProcessPoolExecutor:
+    """Get the shared model-fitting process pool."""
+    global _train_pool
+    if _train_pool is None:
+        with _train_pool_lock:
+            if _train_pool is None:
+                # spawn, not fork: the server process runs an event loop and
+                # helper threads that must not be copied into the workers
+                _train_pool = ProcessPoolExecutor(
+                    max_workers=TRAIN_POOL_MAX_WORKERS,
+                    mp_context=multiprocessing.get_context("spawn")
+                )
+    return _train_pool
+
+
+def shutdown_train_pool() -> None:
+    """Shut down the model-fitting process pool (called on application shutdown)."""
+    global _train_pool
+    with _train_pool_lock:
+        if _train_pool is not None:
+            _train_pool.shutdown(cancel_futures=True)
+            _train_pool = None
+
+
+def _fit_and_save_in_worker(model_dir: str, df: pd.DataFrame) -> Dict[str, Any]:
+    """Process pool entry point: fit and save the model with a worker-local trainer."""
+    return ChurnModelTrainer(model_dir).fit_and_save(df)
+
 
 def get_trainer(model_dir: str = "models") -> ChurnModelTrainer:
     """Get global trainer instance."""
     global _trainer
     if _trainer is None:
-        _trainer = ChurnModelTrainer(model_dir)
+        with _trainer_lock:
+            if _trainer is None:
+                _trainer = ChurnModelTrainer(model_dir)
     return _trainer
 
 
-async def train_and_save(conn: Optional[asyncpg.Connection] = None, model_dir: str = "models") -> Dict[str, Any]:
+async def train_and_save(conn: Optional[asyncpg.Connection] = None, model_dir: str = "models", lock: Optional[TrainingLock] = None) -> Dict[str, Any]:
     """
     Train baseline churn prediction model and save to disk.
     
     Args:
         conn: Optional database connection
         model_dir: Directory to save model files
+        lock: Training lock already acquired by the caller (see ChurnModelTrainer.train_and_save)
         
     Returns:
         Dict with model metrics and training info
     """
     trainer = get_trainer(model_dir)
-    return await trainer.train_and_save(conn)
+    return await trainer.train_and_save(conn, lock)
 
 
 async def load_or_train(conn: Optional[asyncpg.Connection] = None, model_dir: str = "models") -> Dict[str, Any]:
@@ -415,17 +711,25 @@ async def get_model_info(model_dir: str = "models") -> Dict[str, Any]:
     Returns:
         Dict with model information
     """
+    global _model_info_cache
     trainer = get_trainer(model_dir)
     
     try:
-        _, metadata = trainer._load_model()
-        return {
-            "model_exists": True,
-            "training_date": metadata.get("training_date"),
-            "model_type": metadata.get("model_type"),
-            "auc": metadata["metrics"]["auc"],
-            "total_features": metadata["metrics"]["total_features"]
-        }
+        # Only the file mtime is checked per call (off the event loop); the
+        # artifact is re-read and the info rebuilt only after it changes
+        mtime = (await asyncio.to_thread(os.stat, trainer.model_path)).st_mtime_ns
+        if _model_info_cache is None or _model_info_cache[0] != mtime:
+            _, metadata = await asyncio.to_thread(trainer._load_model)
+            _model_info_cache = (mtime, {
+                "model_exists": True,
+                "training_date": metadata.get("training_date"),
+                "model_type": metadata.get("model_type"),
+                "auc": metadata["metrics"]["auc"],
+                "total_features": metadata["metrics"]["total_features"]
+            })
+        
+        # Hand out a copy so callers can't mutate the cached info
+        return dict(_model_info_cache[1])
     except FileNotFoundError:
         return {
             "model_exists": False,
@@ -4,10 +4,89 @@ Churn by contract type analysis.
 Computes churn rates grouped by contract type with proper NULL handling.
 """
 
-from typing import List, Dict, Any, Optional
+from operator import itemgetter
+from typing import List, Dict, Any, Optional, Tuple
 import asyncpg
-from ..core.db import fetch_df
-from ..core.utils import safe_div, round_fp
+import orjson
+from ..core.config import env
+from ..core.cache import AsyncTTLCache
+from ..core.db import fetch_rows
+from ..core.utils import round_fp, utc_now_iso
+
+# NULL/empty contract types are reported as "Unknown"
+_CONTRACT_TYPE_SQL = """CASE 
+        WHEN "Contract" IS NULL OR TRIM("Contract") = '' THEN 'Unknown'
+        ELSE "Contract"
+    END"""
+
+# Same label, precomputed per row by the generated column from
+# sql/contract_norm.sql; used when CONTRACT_USE_NORMALIZED_COLUMN=true
+CONTRACT_NORM_COLUMN = "contract_norm"
+
+
+def _churn_by_contract_sql(contract_sql: str) -> str:
+    """Build the per-contract churn query grouping on the given contract label expression."""
+    return f"""
+SELECT 
+    {contract_sql} as contract_type,
+    COUNT(*) as total_customers,
+    SUM(CASE WHEN "Churn" = 'Yes' THEN 1 ELSE 0 END) as churned_customers,
+    CASE 
+        WHEN COUNT(*) > 0 THEN 
+            SUM(CASE WHEN "Churn" = 'Yes' THEN 1 ELSE 0 END)::FLOAT / NULLIF(COUNT(*), 0)
+        ELSE 0.0
+    END as churn_rate_raw
+FROM churn_customers
+GROUP BY 1
+ORDER BY churn_rate_raw DESC;
+"""
+
+
+def _contract_summary_sql(contract_sql: str) -> str:
+    """
+    Build the per-contract rows plus the overall (customer-weighted) churn rate.
+    
+    The weighted rate is computed with window functions so the summary needs
+    a single round trip.
+    """
+    return f"""
+WITH contract_churn AS ({_churn_by_contract_sql(contract_sql).strip().rstrip(';')})
+SELECT 
+    *,
+    (SUM(churned_customers) OVER ())::FLOAT / NULLIF(SUM(total_customers) OVER (), 0) as weighted_churn_rate
+FROM contract_churn
+ORDER BY churn_rate_raw DESC;
+"""
+
+
+# Per-contract churn rows plus the weighted rate, grouped on the computed
+# label or on the contract_norm column
+CONTRACT_SUMMARY_SQL = _contract_summary_sql(_CONTRACT_TYPE_SQL)
+CONTRACT_SUMMARY_NORM_SQL = _contract_summary_sql(CONTRACT_NORM_COLUMN)
+
+# Contract aggregates change only when the table is reloaded, so the
+# contract/metadata/summary endpoints share one cached result for a short TTL
+CONTRACT_CACHE_TTL_SECONDS = 60
+_contract_cache = AsyncTTLCache(CONTRACT_CACHE_TTL_SECONDS)
+
+
+def _format_contract_rows(rows: List[asyncpg.Record]) -> List[Dict[str, Any]]:
+    """Format contract churn Records according to the response schema."""
+    # Records unpack positionally (contract_type, total_customers,
+    # churned_customers, churn_rate_raw, ...), avoiding per-row key lookups
+    return [
+        {
+            "key": str(contract_type),
+            "churn_rate": round_fp(float(churn_rate_raw or 0.0), 4) or 0.0,
+            "n": int(total_customers)
+        }
+        for contract_type, total_customers, _, churn_rate_raw, *_ in rows
+    ]
+
+
+def use_normalized_contract_column() -> bool:
+    """Whether queries should group on the contract_norm generated column (sql/contract_norm.sql)."""
+    return env("CONTRACT_USE_NORMALIZED_COLUMN", "false").lower() == "true"
 
 
 async def compute_churn_by_contract(conn: Optional[asyncpg.Connection] = None) -> List[Dict[str, Any]]:
@@ -20,6 +99,9 @@ async def compute_churn_by_contract(conn: Optional[asyncpg.Connection] = None) -
     - Calculates churn_rate = churned_customers / total_customers per group
     - Returns results sorted by churn_rate DESC
     
+    Results are cached for CONTRACT_CACHE_TTL_SECONDS; concurrent callers on a
+    cold cache wait for a single query instead of each issuing their own.
+    
     Args:
         conn: Optional asyncpg connection (uses global db if None)
         
@@ -35,83 +117,69 @@ async def compute_churn_by_contract(conn: Optional[asyncpg.Connection] = None) -
         asyncpg.PostgresError: For database connection/query errors
         ValueError: For invalid data or computation errors
     """
+    results, _ = await _get_contract_churn(conn)
+    return results
+
+
+async def compute_churn_by_contract_json(conn: Optional[asyncpg.Connection] = None) -> bytes:
+    """
+    Get the contract churn rates as a ready-to-send {"churn_rate_by_contract": [...]} JSON body.
     
-    # SQL query to group by contract type and compute churn metrics
-    # Handle NULL/empty contract types as "Unknown"
-    # Calculate churn rate and total count per contract type
-    sql = """
-    SELECT 
-        CASE 
-            WHEN "Contract" IS NULL OR TRIM("Contract") = '' THEN 'Unknown'
-            ELSE "Contract"
-        END as contract_type,
-        COUNT(*) as total_customers,
-        SUM(CASE WHEN "Churn" = 'Yes' THEN 1 ELSE 0 END) as churned_customers,
-        CASE 
-            WHEN COUNT(*) > 0 THEN 
-                SUM(CASE WHEN "Churn" = 'Yes' THEN 1 ELSE 0 END)::FLOAT / NULLIF(COUNT(*), 0)
-            ELSE 0.0
-        END as churn_rate_raw
-    FROM churn_customers
-    GROUP BY 
-        CASE 
-            WHEN "Contract" IS NULL OR TRIM("Contract") = '' THEN 'Unknown'
-            ELSE "Contract"
-        END
-    ORDER BY churn_rate_raw DESC;
+    The body is serialized with orjson once per cache fill and shared by all
+    callers, so the /contract endpoint does no per-request validation or encoding.
+    
+    Args:
+        conn: Optional asyncpg connection (uses global db if None)
+        
+    Returns:
+        UTF-8 encoded JSON bytes
     """
+    return (await _get_contract_cache(conn))[2]
+
+
+async def _get_contract_churn(conn: Optional[asyncpg.Connection] = None) -> Tuple[List[Dict[str, Any]], float]:
+    """Return (contract rows, weighted churn rate), served from the TTL cache."""
+    results, weighted_churn_rate, _ = await _get_contract_cache(conn)
     
+    # Hand out copies so callers can't mutate the cached rows
+    return [dict(item) for item in results], weighted_churn_rate
+
+
+async def _get_contract_cache(conn: Optional[asyncpg.Connection] = None) -> Tuple[List[Dict[str, Any]], float, bytes]:
+    """Return the (contract rows, weighted churn rate, JSON body) entry from the TTL cache."""
+    return await _contract_cache.get("contract", lambda: _load_contract_cache(conn))
+
+
+async def _load_contract_cache(conn: Optional[asyncpg.Connection] = None) -> Tuple[List[Dict[str, Any]], float, bytes]:
+    """Query the contract churn and build a cache entry, serializing the response body once."""
+    results, weighted_churn_rate = await _query_churn_by_contract(conn)
+    return (
+        results,
+        weighted_churn_rate,
+        orjson.dumps({"churn_rate_by_contract": results})
+    )
+
+
+async def _query_churn_by_contract(conn: Optional[asyncpg.Connection] = None) -> Tuple[List[Dict[str, Any]], float]:
+    """Run the contract churn query and format the rows (uncached)."""
     try:
-        # Fetch data using the global fetch_df function or connection-specific query
-        if conn:
-            # Use provided connection directly
-            rows = await conn.fetch(sql)
-            if not rows:
-                return []
-            
-            # Convert asyncpg Records to list of dicts
-            data = [dict(row) for row in rows]
-        else:
-            # Use global db manager
-            df = await fetch_df(sql)
-            if df.empty:
-                return []
-            
-            # Convert DataFrame to list of dicts
-            data = df.to_dict('records')
+        # Aggregation happens entirely in SQL; the handful of result rows is
+        # formatted straight from the Records (already sorted by ORDER BY).
+        # The summary query also carries the weighted rate, so one cached
+        # result serves every contract endpoint
+        sql = CONTRACT_SUMMARY_NORM_SQL if use_normalized_contract_column() else CONTRACT_SUMMARY_SQL
+        rows = await conn.fetch(sql) if conn else await fetch_rows(sql)
         
-        # Process results and format according to schema
-        results = []
+        # Overall (customer-weighted) churn rate; the window value is the same on every row
+        weighted_churn_rate = 0.0
+        if rows:
+            weighted_churn_rate = round_fp(float(rows[0]["weighted_churn_rate"] or 0.0), 4) or 0.0
         
-        for row in data:
-            contract_type = row.get('contract_type', 'Unknown')
-            total_customers = int(row.get('total_customers', 0))
-            churned_customers = int(row.get('churned_customers', 0))
-            churn_rate_raw = row.get('churn_rate_raw')
-            
-            # Calculate churn rate with safe division and proper rounding
-            if churn_rate_raw is not None:
-                churn_rate = round_fp(float(churn_rate_raw), 4) or 0.0
-            else:
-                churn_rate = round_fp(safe_div(churned_customers, total_customers), 4) or 0.0
-            
-            # Format according to required schema
-            result_item = {
-                "key": str(contract_type),
-                "churn_rate": churn_rate,
-                "n": total_customers
-            }
-            
-            results.append(result_item)
-        
-        # Results should already be sorted by churn_rate DESC from SQL ORDER BY
-        # But ensure sorting just in case
-        results.sort(key=lambda x: x["churn_rate"], reverse=True)
-        
-        return results
+        return _format_contract_rows(rows), weighted_churn_rate
         
-    except asyncpg.PostgresError as e:
-        raise asyncpg.PostgresError(f"Database error in compute_churn_by_contract: {e}")
+    except asyncpg.PostgresError:
+        # Propagate the original error (keeps sqlstate and server details)
+        raise
     except Exception as e:
         raise ValueError(f"Failed to compute churn by contract: {e}")
 
@@ -135,8 +203,6 @@ async def compute_churn_by_contract_with_metadata(conn: Optional[asyncpg.Connect
         }
     """
     try:
-        from datetime import datetime
-        
         # Get main analysis
         contract_analysis = await compute_churn_by_contract(conn)
         
@@ -149,7 +215,7 @@ async def compute_churn_by_contract_with_metadata(conn: Optional[asyncpg.Connect
             "metadata": {
                 "total_customers": total_customers,
                 "total_contracts": total_contracts,
-                "computed_at": datetime.utcnow().isoformat() + "Z"
+                "computed_at": utc_now_iso()
             }
         }
         
@@ -165,7 +231,8 @@ async def get_contract_summary_stats(conn: Optional[asyncpg.Connection] = None)
         Dict with summary stats like highest/lowest churn rates, etc.
     """
     try:
-        contract_data = await compute_churn_by_contract(conn)
+        # Per-contract rows and the weighted average come from the shared cache
+        contract_data, avg_churn_rate = await _get_contract_churn(conn)
         
         if not contract_data:
             return {
@@ -176,13 +243,9 @@ async def get_contract_summary_stats(conn: Optional[asyncpg.Connection] = None)
             }
         
         # Find highest and lowest churn rates
-        highest_churn = max(contract_data, key=lambda x: x["churn_rate"])
-        lowest_churn = min(contract_data, key=lambda x: x["churn_rate"])
-        
-        # Calculate weighted average churn rate
-        total_customers = sum(item["n"] for item in contract_data)
-        weighted_churn = sum(item["churn_rate"] * item["n"] for item in contract_data)
-        avg_churn_rate = round_fp(safe_div(weighted_churn, total_customers), 4) or 0.0
+        by_churn_rate = itemgetter("churn_rate")
+        highest_churn = max(contract_data, key=by_churn_rate)
+        lowest_churn = min(contract_data, key=by_churn_rate)
         
         return {
             "highest_churn_contract": highest_churn,
@@ -4,16 +4,59 @@ Churn by payment method analysis.
 Computes churn rates grouped by payment method with proper NULL handling.
 """
 
-from typing import List, Dict, Any, Optional
+import asyncio
+from typing import List, Dict, Any, Optional, Tuple
 import asyncpg
-from ..core.db import fetch_df
-from ..core.utils import safe_div, round_fp
+from ..core.cache import AsyncTTLCache
+from ..core.db import fetch_rows
+from ..core.utils import safe_div, round_fp, utc_now_iso
+
+# SQL query to group by payment method and compute churn metrics
+# Handle NULL/empty payment methods as "Unknown"
+# Calculate churn rate and total count per payment method, plus the overall
+# (customer-weighted) churn rate via window functions so the summary stats
+# come from the same round trip
+CHURN_BY_PAYMENT_SQL = """
+WITH payment_churn AS (
+    SELECT 
+        CASE 
+            WHEN "PaymentMethod" IS NULL OR TRIM("PaymentMethod") = '' THEN 'Unknown'
+            ELSE "PaymentMethod"
+        END as payment_method,
+        COUNT(*) as total_customers,
+        SUM(CASE WHEN "Churn" = 'Yes' THEN 1 ELSE 0 END) as churned_customers,
+        CASE 
+            WHEN COUNT(*) > 0 THEN 
+                SUM(CASE WHEN "Churn" = 'Yes' THEN 1 ELSE 0 END)::FLOAT / NULLIF(COUNT(*), 0)
+            ELSE 0.0
+        END as churn_rate_raw
+    FROM churn_customers
+    GROUP BY 
+        CASE 
+            WHEN "PaymentMethod" IS NULL OR TRIM("PaymentMethod") = '' THEN 'Unknown'
+            ELSE "PaymentMethod"
+        END
+)
+SELECT 
+    *,
+    (SUM(churned_customers) OVER ())::FLOAT / NULLIF(SUM(total_customers) OVER (), 0) as weighted_churn_rate
+FROM payment_churn
+ORDER BY churn_rate_raw DESC;
+"""
+
+# Payment method aggregates change only when the table is reloaded, so the
+# summary/metadata/compare endpoints share one cached result for a short TTL
+PAYMENT_CACHE_TTL_SECONDS = 60
+_payment_cache = AsyncTTLCache(PAYMENT_CACHE_TTL_SECONDS)
 
 
 async def compute_churn_by_payment(conn: Optional[asyncpg.Connection] = None) -> List[Dict[str, Any]]:
     """
     Compute churn rates grouped by payment method.
     
+    Results are cached for PAYMENT_CACHE_TTL_SECONDS; concurrent callers on a
+    cold cache wait for a single query instead of each issuing their own.
+    
     This function calculates churn rate and sample size for each payment method:
     - Groups customers by payment method
     - Handles NULL/empty payment methods as "Unknown"
@@ -36,83 +79,42 @@ async def compute_churn_by_payment(conn: Optional[asyncpg.Connection] = None) ->
         asyncpg.PostgresError: For database connection/query errors
         ValueError: For invalid data or computation errors
     """
+    results, _ = await _get_payment_churn(conn)
+    return results
+
+
+async def _get_payment_churn(conn: Optional[asyncpg.Connection] = None) -> Tuple[List[Dict[str, Any]], float]:
+    """Return (payment rows, weighted churn rate), served from the TTL cache."""
+    results, weighted_churn_rate = await _payment_cache.get("payment", lambda: _query_churn_by_payment(conn))
     
-    # SQL query to group by payment method and compute churn metrics
-    # Handle NULL/empty payment methods as "Unknown"
-    # Calculate churn rate and total count per payment method
-    sql = """
-    SELECT 
-        CASE 
-            WHEN "PaymentMethod" IS NULL OR TRIM("PaymentMethod") = '' THEN 'Unknown'
-            ELSE "PaymentMethod"
-        END as payment_method,
-        COUNT(*) as total_customers,
-        SUM(CASE WHEN "Churn" = 'Yes' THEN 1 ELSE 0 END) as churned_customers,
-        CASE 
-            WHEN COUNT(*) > 0 THEN 
-                SUM(CASE WHEN "Churn" = 'Yes' THEN 1 ELSE 0 END)::FLOAT / NULLIF(COUNT(*), 0)
-            ELSE 0.0
-        END as churn_rate_raw
-    FROM churn_customers
-    GROUP BY 
-        CASE 
-            WHEN "PaymentMethod" IS NULL OR TRIM("PaymentMethod") = '' THEN 'Unknown'
-            ELSE "PaymentMethod"
-        END
-    ORDER BY churn_rate_raw DESC;
-    """
-    
+    # Hand out copies so callers can't mutate the cached rows
+    return [dict(item) for item in results], weighted_churn_rate
+
+
+async def _query_churn_by_payment(conn: Optional[asyncpg.Connection] = None) -> Tuple[List[Dict[str, Any]], float]:
+    """Run the payment method churn query and format the rows (uncached)."""
     try:
-        # Fetch data using the global fetch_df function or connection-specific query
-        if conn:
-            # Use provided connection directly
-            rows = await conn.fetch(sql)
-            if not rows:
-                return []
-            
-            # Convert asyncpg Records to list of dicts
-            data = [dict(row) for row in rows]
-        else:
-            # Use global db manager
-            df = await fetch_df(sql)
-            if df.empty:
-                return []
-            
-            # Convert DataFrame to list of dicts
-            data = df.to_dict('records')
-        
-        # Process results and format according to schema
-        results = []
-        
-        for row in data:
-            payment_method = row.get('payment_method', 'Unknown')
-            total_customers = int(row.get('total_customers', 0))
-            churned_customers = int(row.get('churned_customers', 0))
-            churn_rate_raw = row.get('churn_rate_raw')
-            
-            # Calculate churn rate with safe division and proper rounding
-            if churn_rate_raw is not None:
-                churn_rate = round_fp(float(churn_rate_raw), 4) or 0.0
-            else:
-                churn_rate = round_fp(safe_div(churned_customers, total_customers), 4) or 0.0
-            
-            # Format according to required schema
-            result_item = {
+        # Single pass over the Records: no DataFrame and no intermediate dicts
+        rows = await conn.fetch(CHURN_BY_PAYMENT_SQL) if conn else await fetch_rows(CHURN_BY_PAYMENT_SQL)
+        
+        results = [
+            {
                 "key": str(payment_method),
-                "churn_rate": churn_rate,
-                "n": total_customers
+                # ::FLOAT columns already decode to Python float
+                "churn_rate": 0.0 if churn_rate_raw is None else round(churn_rate_raw, 4),
+                "n": int(total_customers)
             }
-            
-            results.append(result_item)
-        
-        # Results should already be sorted by churn_rate DESC from SQL ORDER BY
-        # But ensure sorting just in case
-        results.sort(key=lambda x: x["churn_rate"], reverse=True)
+            for payment_method, total_customers, _, churn_rate_raw, _ in rows
+        ]
         
-        return results
+        # Already sorted by churn_rate DESC via the SQL ORDER BY; rounding to
+        # 4 places can only create ties, never invert the order
+        weighted_churn_rate = float(rows[0]["weighted_churn_rate"] or 0.0) if rows else 0.0
+        return results, weighted_churn_rate
         
-    except asyncpg.PostgresError as e:
-        raise asyncpg.PostgresError(f"Database error in compute_churn_by_payment: {e}")
+    except asyncpg.PostgresError:
+        # Propagate the original error (keeps sqlstate and server details)
+        raise
     except Exception as e:
         raise ValueError(f"Failed to compute churn by payment method: {e}")
 
@@ -136,8 +138,6 @@ async def compute_churn_by_payment_with_metadata(conn: Optional[asyncpg.Connecti
         }
     """
     try:
-        from datetime import datetime
-        
         # Get main analysis
         payment_analysis = await compute_churn_by_payment(conn)
         
@@ -150,7 +150,7 @@ async def compute_churn_by_payment_with_metadata(conn: Optional[asyncpg.Connecti
             "metadata": {
                 "total_customers": total_customers,
                 "total_payment_methods": total_payment_methods,
-                "computed_at": datetime.utcnow().isoformat() + "Z"
+                "computed_at": utc_now_iso()
             }
         }
         
@@ -166,7 +166,8 @@ async def get_payment_summary_stats(conn: Optional[asyncpg.Connection] = None) -
         Dict with summary stats like highest/lowest churn rates, etc.
     """
     try:
-        payment_data = await compute_churn_by_payment(conn)
+        # Per-method rows and the weighted average come back from one query
+        payment_data, weighted_churn_rate = await _get_payment_churn(conn)
         
         if not payment_data:
             return {
@@ -176,14 +177,12 @@ async def get_payment_summary_stats(conn: Optional[asyncpg.Connection] = None) -
                 "total_payment_methods": 0
             }
         
-        # Find highest and lowest churn rates
-        highest_churn = max(payment_data, key=lambda x: x["churn_rate"])
-        lowest_churn = min(payment_data, key=lambda x: x["churn_rate"])
+        # Rows are sorted by churn_rate DESC, so the extremes are the ends
+        highest_churn = payment_data[0]
+        lowest_churn = payment_data[-1]
         
-        # Calculate weighted average churn rate
-        total_customers = sum(item["n"] for item in payment_data)
-        weighted_churn = sum(item["churn_rate"] * item["n"] for item in payment_data)
-        avg_churn_rate = round_fp(safe_div(weighted_churn, total_customers), 4) or 0.0
+        # Weighted average churn rate (total churned / total customers), from SQL
+        avg_churn_rate = round_fp(weighted_churn_rate, 4) or 0.0
         
         return {
             "highest_churn_payment": highest_churn,
@@ -206,30 +205,42 @@ async def compare_payment_vs_contract_churn(conn: Optional[asyncpg.Connection] =
         # Import here to avoid circular imports
         from .churn_by_contract import compute_churn_by_contract
         
-        # Get both analyses
-        payment_data = await compute_churn_by_payment(conn)
-        contract_data = await compute_churn_by_contract(conn)
+        # Get both analyses; a single asyncpg connection can't run queries
+        # concurrently, so only the pooled path runs them in parallel
+        if conn:
+            payment_data = await compute_churn_by_payment(conn)
+            contract_data = await compute_churn_by_contract(conn)
+        else:
+            payment_data, contract_data = await asyncio.gather(
+                compute_churn_by_payment(),
+                compute_churn_by_contract()
+            )
         
         # Calculate ranges for comparison
         payment_rates = [item["churn_rate"] for item in payment_data] if payment_data else [0]
         contract_rates = [item["churn_rate"] for item in contract_data] if contract_data else [0]
         
+        payment_high, payment_low = max(payment_rates), min(payment_rates)
+        payment_spread = payment_high - payment_low
+        contract_high, contract_low = max(contract_rates), min(contract_rates)
+        contract_spread = contract_high - contract_low
+        
         return {
             "payment_method_analysis": {
-                "highest_rate": max(payment_rates),
-                "lowest_rate": min(payment_rates),
-                "rate_spread": max(payment_rates) - min(payment_rates),
+                "highest_rate": payment_high,
+                "lowest_rate": payment_low,
+                "rate_spread": payment_spread,
                 "method_count": len(payment_data)
             },
             "contract_analysis": {
-                "highest_rate": max(contract_rates),
-                "lowest_rate": min(contract_rates),
-                "rate_spread": max(contract_rates) - min(contract_rates),
+                "highest_rate": contract_high,
+                "lowest_rate": contract_low,
+                "rate_spread": contract_spread,
                 "contract_count": len(contract_data)
             },
             "comparison": {
-                "higher_spread_segment": "payment" if (max(payment_rates) - min(payment_rates)) > (max(contract_rates) - min(contract_rates)) else "contract",
-                "payment_vs_contract_spread_ratio": round_fp(safe_div(max(payment_rates) - min(payment_rates), max(contract_rates) - min(contract_rates)), 4) or 0.0
+                "higher_spread_segment": "payment" if payment_spread > contract_spread else "contract",
+                "payment_vs_contract_spread_ratio": round_fp(safe_div(payment_spread, contract_spread), 4) or 0.0
             }
         }
         
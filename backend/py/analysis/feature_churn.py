@@ -4,28 +4,53 @@ Service features churn analysis.
 Analyzes churn rates by service add-ons and features like OnlineSecurity, TechSupport, etc.
 """
 
-from typing import Dict, Any, List, Optional
+import functools
+from operator import itemgetter
+from typing import Dict, Any, List, Optional, Tuple
 import asyncpg
-from ..core.db import fetch_df
-from ..core.utils import safe_div, round_fp
+import numpy as np
+from ..core.cache import AsyncTTLCache
+from ..core.db import fetch_rows
+from ..core.utils import round_fp, utc_now_iso
 
 
 # Whitelist of allowed feature columns for security (prevents SQL injection)
-ALLOWED_FEATURES = {
-    "OnlineSecurity": "OnlineSecurity",
-    "TechSupport": "TechSupport", 
-    "OnlineBackup": "OnlineBackup",
-    "DeviceProtection": "DeviceProtection",
-    "StreamingTV": "StreamingTV",
-    "StreamingMovies": "StreamingMovies",
-    "InternetService": "InternetService",
-    "PhoneService": "PhoneService",
-    "MultipleLines": "MultipleLines",
-    "PaperlessBilling": "PaperlessBilling"
-}
+ALLOWED_FEATURES = frozenset({
+    "OnlineSecurity",
+    "TechSupport",
+    "OnlineBackup",
+    "DeviceProtection",
+    "StreamingTV",
+    "StreamingMovies",
+    "InternetService",
+    "PhoneService",
+    "MultipleLines",
+    "PaperlessBilling"
+})
+
+# Stable ordering for API listings and error messages
+SORTED_ALLOWED_FEATURES = tuple(sorted(ALLOWED_FEATURES))
+
+# Per-feature (feature name, column value) VALUES entries for the LATERAL
+# fan-out in _build_feature_churn_sql, rendered once at import time
+# Use quoted column names for case sensitivity
+FEATURE_VALUES_SQL = {feature: f"('{feature}', \"{feature}\"::TEXT)" for feature in ALLOWED_FEATURES}
 
 DEFAULT_FEATURES = ["OnlineSecurity", "TechSupport"]
 
+# Zero-valued entries in response order ("Yes" first, then "No"); copied
+# when a feature has no rows for a value
+EMPTY_FEATURE_VALUES = (
+    {"key": "Yes", "churn_rate": 0.0, "n": 0},
+    {"key": "No", "churn_rate": 0.0, "n": 0}
+)
+
+# Feature aggregates only change when the table is reloaded, so concurrent and
+# repeated requests for the same feature set share one query for a short TTL;
+# entries are keyed by the sorted feature tuple and load independently
+FEATURE_CHURN_CACHE_TTL_SECONDS = 60
+_feature_churn_cache = AsyncTTLCache(FEATURE_CHURN_CACHE_TTL_SECONDS)
+
 
 def validate_features(features: List[str]) -> List[str]:
     """
@@ -46,11 +71,55 @@ def validate_features(features: List[str]) -> List[str]:
     valid_features = [f for f in features if f in ALLOWED_FEATURES]
     
     if not valid_features:
-        raise ValueError(f"No valid features provided. Allowed features: {list(ALLOWED_FEATURES.keys())}")
+        raise ValueError(f"No valid features provided. Allowed features: {list(SORTED_ALLOWED_FEATURES)}")
     
     return valid_features
 
 
+@functools.lru_cache(maxsize=128)
+def _build_feature_churn_sql(features: Tuple[str, ...]) -> str:
+    """
+    Build one query that aggregates churn for every requested feature.
+    
+    Each customer row is fanned out into one (feature, value) pair per feature
+    with a LATERAL VALUES list, so the table is scanned once regardless of how
+    many features are requested. Queries are cached per feature tuple, so
+    repeated requests reuse the same SQL text.
+    
+    Args:
+        features: Validated feature column names (keys of FEATURE_VALUES_SQL)
+        
+    Returns:
+        SQL returning (feature, feature_value, total_customers, churned_customers)
+    """
+    # Treat NULL as "No" using COALESCE
+    feature_values = ", ".join(FEATURE_VALUES_SQL[feature] for feature in dict.fromkeys(features))
+    
+    return f"""
+    SELECT 
+        f.feature,
+        COALESCE(f.value, 'No') as feature_value,
+        COUNT(*) as total_customers,
+        SUM(CASE WHEN "Churn" = 'Yes' THEN 1 ELSE 0 END) as churned_customers
+    FROM churn_customers
+    CROSS JOIN LATERAL (VALUES {feature_values}) AS f(feature, value)
+    GROUP BY 1, 2
+    ORDER BY 1, 2;
+    """
+
+
+async def _get_feature_churn_rows(features: Tuple[str, ...], conn: Optional[asyncpg.Connection] = None) -> List[asyncpg.Record]:
+    """Return the aggregate rows for a sorted feature tuple, served from the TTL cache."""
+    # Records are immutable, so the cached rows are shared as-is
+    return await _feature_churn_cache.get(features, lambda: _query_feature_churn_rows(features, conn))
+
+
+async def _query_feature_churn_rows(features: Tuple[str, ...], conn: Optional[asyncpg.Connection] = None) -> List[asyncpg.Record]:
+    """Run the feature churn query for a sorted feature tuple (uncached)."""
+    sql = _build_feature_churn_sql(features)
+    return await conn.fetch(sql) if conn else await fetch_rows(sql)
+
+
 async def compute_feature_churn(conn: Optional[asyncpg.Connection] = None, features: List[str] = None) -> Dict[str, Any]:
     """
     Compute churn rates by service features/add-ons.
@@ -91,90 +160,38 @@ async def compute_feature_churn(conn: Optional[asyncpg.Connection] = None, featu
     result = {"churn_rate_by_feature": {}}
     
     try:
-        # Process each feature separately to avoid complex dynamic SQL
+        # All requested features are aggregated in a single scan / round trip;
+        # rows come back ordered by feature, so the request order doesn't matter
+        # and the sorted feature set is the cache key
+        rows = await _get_feature_churn_rows(tuple(sorted(set(valid_features))), conn)
+        
+        # Calculate all churn rates at once (0.0 where a group is empty)
+        totals = np.fromiter((row[2] for row in rows), dtype=np.int64, count=len(rows))
+        churned = np.fromiter((row[3] for row in rows), dtype=np.int64, count=len(rows))
+        rates = np.divide(churned, totals, out=np.zeros(len(rows)), where=totals > 0).round(4)
+        
+        # Group results by feature
+        results_by_feature = {feature: {} for feature in valid_features}
+        
+        for (feature, feature_value, _, _), total_customers, churn_rate in zip(rows, totals.tolist(), rates.tolist()):
+            results_by_feature[feature][feature_value] = {
+                "key": feature_value,
+                "churn_rate": churn_rate,
+                "n": total_customers
+            }
+        
         for feature in valid_features:
-            column_name = ALLOWED_FEATURES[feature]
-            
-            # SQL query to analyze churn by feature value
-            # Treat NULL as "No" using COALESCE
-            # Use quoted column names for case sensitivity
-            sql = f"""
-            SELECT 
-                COALESCE("{column_name}", 'No') as feature_value,
-                COUNT(*) as total_customers,
-                SUM(CASE WHEN "Churn" = 'Yes' THEN 1 ELSE 0 END) as churned_customers
-            FROM churn_customers
-            WHERE "{column_name}" IS NOT NULL OR "{column_name}" IS NULL
-            GROUP BY COALESCE("{column_name}", 'No')
-            ORDER BY COALESCE("{column_name}", 'No');
-            """
-            
-            # Fetch data using the global fetch_df function or connection-specific query
-            if conn:
-                # Use provided connection directly
-                rows = await conn.fetch(sql)
-                
-                if not rows:
-                    # Return empty result for this feature
-                    result["churn_rate_by_feature"][feature] = [
-                        {"key": "Yes", "churn_rate": 0.0, "n": 0},
-                        {"key": "No", "churn_rate": 0.0, "n": 0}
-                    ]
-                    continue
-                
-                # Convert asyncpg Records to list of dicts
-                data = [dict(row) for row in rows]
-            else:
-                # Use global db manager
-                df = await fetch_df(sql)
-                
-                if df.empty:
-                    # Return empty result for this feature
-                    result["churn_rate_by_feature"][feature] = [
-                        {"key": "Yes", "churn_rate": 0.0, "n": 0},
-                        {"key": "No", "churn_rate": 0.0, "n": 0}
-                    ]
-                    continue
-                
-                # Convert DataFrame to list of dicts
-                data = df.to_dict('records')
-            
-            # Process results and calculate churn rates
-            feature_results = {}
+            feature_results = results_by_feature[feature]
             
-            for row in data:
-                feature_value = row.get('feature_value', 'No')
-                total_customers = int(row.get('total_customers', 0))
-                churned_customers = int(row.get('churned_customers', 0))
-                
-                # Calculate churn rate
-                churn_rate = round_fp(safe_div(churned_customers, total_customers), 4) or 0.0
-                
-                feature_results[feature_value] = {
-                    "key": feature_value,
-                    "churn_rate": churn_rate,
-                    "n": total_customers
-                }
+            # Always return "Yes" first, then "No"; missing keys get zero values
+            result["churn_rate_by_feature"][feature] = [
+                feature_results.get(empty["key"]) or dict(empty)
+                for empty in EMPTY_FEATURE_VALUES
+            ]
             
-            # Ensure both "Yes" and "No" are present in fixed order
-            ordered_results = []
-            
-            # Always return "Yes" first, then "No"
-            for key in ["Yes", "No"]:
-                if key in feature_results:
-                    ordered_results.append(feature_results[key])
-                else:
-                    # Add missing key with zero values
-                    ordered_results.append({
-                        "key": key,
-                        "churn_rate": 0.0,
-                        "n": 0
-                    })
-            
-            result["churn_rate_by_feature"][feature] = ordered_results
-            
-    except asyncpg.PostgresError as e:
-        raise asyncpg.PostgresError(f"Database error in compute_feature_churn: {e}")
+    except asyncpg.PostgresError:
+        # Propagate the original error (keeps sqlstate and server details)
+        raise
     except Exception as e:
         raise ValueError(f"Failed to compute feature churn analysis: {e}")
     
@@ -193,25 +210,24 @@ async def compute_feature_churn_with_metadata(conn: Optional[asyncpg.Connection]
         Dict with feature churn analysis and metadata
     """
     try:
-        from datetime import datetime
-        
         # Get main analysis
         churn_analysis = await compute_feature_churn(conn, features)
         
         # Calculate metadata
         analyzed_features = list(churn_analysis["churn_rate_by_feature"].keys())
-        total_combinations = sum([
-            sum([item["n"] for item in feature_data])
+        total_combinations = sum(
+            item["n"]
             for feature_data in churn_analysis["churn_rate_by_feature"].values()
-        ])
+            for item in feature_data
+        )
         
         return {
             **churn_analysis,
             "metadata": {
                 "analyzed_features": analyzed_features,
                 "total_feature_combinations": total_combinations,
-                "available_features": list(ALLOWED_FEATURES.keys()),
-                "computed_at": datetime.utcnow().isoformat() + "Z"
+                "available_features": list(SORTED_ALLOWED_FEATURES),
+                "computed_at": utc_now_iso()
             }
         }
         
@@ -240,10 +256,10 @@ async def get_feature_churn_summary(conn: Optional[asyncpg.Connection] = None, f
         
         # Analyze each feature's impact on churn
         for feature_name, feature_data in churn_data["churn_rate_by_feature"].items():
-            yes_data = next((item for item in feature_data if item["key"] == "Yes"), None)
-            no_data = next((item for item in feature_data if item["key"] == "No"), None)
+            # compute_feature_churn always returns exactly ["Yes", "No"], in that order
+            yes_data, no_data = feature_data
             
-            if yes_data and no_data and yes_data["n"] > 0 and no_data["n"] > 0:
+            if yes_data["n"] > 0 and no_data["n"] > 0:
                 # Calculate the difference in churn rates (No churn rate - Yes churn rate)
                 # Positive value means feature reduces churn (good)
                 churn_reduction = no_data["churn_rate"] - yes_data["churn_rate"]
@@ -258,7 +274,7 @@ async def get_feature_churn_summary(conn: Optional[asyncpg.Connection] = None, f
                 })
         
         # Sort by churn reduction (best retention features first)
-        feature_impacts.sort(key=lambda x: x["churn_reduction"], reverse=True)
+        feature_impacts.sort(key=itemgetter("churn_reduction"), reverse=True)
         
         return {
             "best_feature_for_retention": feature_impacts[0] if feature_impacts else None,
@@ -277,4 +293,4 @@ def get_allowed_features() -> List[str]:
     Returns:
         List of allowed feature names for API validation
     """
-    return list(ALLOWED_FEATURES.keys())
\ No newline at end of file
+    return list(SORTED_ALLOWED_FEATURES)
\ No newline at end of file
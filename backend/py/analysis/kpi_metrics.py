@@ -6,15 +6,23 @@ Computes key performance indicators from customer data using safe SQL operations
 
 from typing import Dict, Any, Optional
 import asyncpg
-import pandas as pd
-from ..core.db import fetch_df
+from ..core.cache import AsyncTTLCache
+from ..core.db import fetch_row
 from ..core.utils import safe_div, round_fp, safe_sum
 
+# Dashboard refreshes hit the KPI endpoints far more often than the table
+# changes, so the aggregate scan result is shared for a short TTL
+KPI_CACHE_TTL_SECONDS = 60
+_kpi_cache = AsyncTTLCache(KPI_CACHE_TTL_SECONDS)
+
 
 async def compute_kpis(conn: Optional[asyncpg.Connection] = None) -> Dict[str, Any]:
     """
     Compute KPI metrics for all customers in the database.
     
+    Results are cached for KPI_CACHE_TTL_SECONDS, so repeated dashboard
+    refreshes (including against an empty table) don't re-run the scan.
+    
     This function calculates:
     - churned_users: Count of customers with churn = TRUE
     - churn_rate_overall: Ratio of churned to total customers (0-1, 4 decimals)
@@ -41,6 +49,14 @@ async def compute_kpis(conn: Optional[asyncpg.Connection] = None) -> Dict[str, A
             }
         }
     """
+    result = await _kpi_cache.get("kpis", lambda: _query_kpis(conn))
+    
+    # Hand out a copy so callers can't mutate the cached metrics
+    return {"kpis": dict(result["kpis"])}
+
+
+async def _query_kpis(conn: Optional[asyncpg.Connection] = None) -> Dict[str, Any]:
+    """Run the KPI aggregate query and format the result (uncached)."""
     # SQL query to get all required metrics in a single query
     # Using NULLIF to prevent division by zero
     # Assumes table: churn_customers with columns: Churn (STRING "Yes"/"No"), tenure (NUMERIC), MonthlyCharges (NUMERIC)
@@ -66,27 +82,17 @@ async def compute_kpis(conn: Optional[asyncpg.Connection] = None) -> Dict[str, A
     """
     
     try:
-        # Fetch data using the global fetch_df function or connection-specific query
-        if conn:
-            # Use provided connection directly
-            row = await conn.fetchrow(sql)
-            if not row:
-                raise ValueError("No data returned from churn_customers table")
-            
-            # Convert asyncpg Record to dict
-            data = dict(row)
-        else:
-            # Use global db manager
-            df = await fetch_df(sql)
-            if df.empty:
-                raise ValueError("No data returned from churn_customers table")
-            
-            # Convert first row to dict
-            data = df.iloc[0].to_dict()
-        
-        # Extract raw values with null safety
-        total_customers = int(data.get('total_customers', 0))
-        churned_count = int(data.get('churned_count', 0))
+        # Single-row result: read the Record directly (no DataFrame round-trip)
+        row = await conn.fetchrow(sql) if conn else await fetch_row(sql)
+        if not row:
+            raise ValueError("No data returned from churn_customers table")
+        
+        # Convert asyncpg Record to dict
+        data = dict(row)
+        
+        # Extract raw values with null safety (SUM is NULL on an empty table)
+        total_customers = int(data.get('total_customers') or 0)
+        churned_count = int(data.get('churned_count') or 0)
         avg_tenure_raw = data.get('avg_tenure_raw')
         avg_monthly_raw = data.get('avg_monthly_raw')
         churn_rate_raw = data.get('churn_rate_raw')
@@ -126,8 +132,9 @@ async def compute_kpis(conn: Optional[asyncpg.Connection] = None) -> Dict[str, A
             }
         }
         
-    except asyncpg.PostgresError as e:
-        raise asyncpg.PostgresError(f"Database error in compute_kpis: {e}")
+    except asyncpg.PostgresError:
+        # Propagate the original error (keeps sqlstate and server details)
+        raise
     except Exception as e:
         raise ValueError(f"Failed to compute KPIs: {e}")
 
@@ -173,15 +180,15 @@ async def compute_kpis_alternative_table(table_name: str = "customers") -> Dict[
         raise ValueError(f"Table '{table_name}' not in allowed list: {allowed_tables}")
     
     try:
-        df = await fetch_df(sql)
-        if df.empty:
+        row = await fetch_row(sql)
+        if not row:
             raise ValueError(f"No data returned from {table_name} table")
         
-        data = df.iloc[0].to_dict()
+        data = dict(row)
         
         # Same processing as main compute_kpis function
-        total_customers = int(data.get('total_customers', 0))
-        churned_count = int(data.get('churned_count', 0))
+        total_customers = int(data.get('total_customers') or 0)
+        churned_count = int(data.get('churned_count') or 0)
         avg_tenure_raw = data.get('avg_tenure_raw')
         avg_monthly_raw = data.get('avg_monthly_raw')
         churn_rate_raw = data.get('churn_rate_raw')
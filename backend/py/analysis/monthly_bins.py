@@ -4,17 +4,58 @@ Monthly charges bins analysis for churned customers.
 Analyzes monthly charges distribution of churned customers in fixed bins: 0–35, 36–65, 66–95, 96+.
 """
 
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 import asyncpg
-from ..core.db import fetch_df
+import orjson
+from ..core.config import env
+from ..core.cache import AsyncTTLCache
+from ..core.db import fetch_rows
 from ..core.utils import (
     safe_div, 
     round_fp, 
+    utc_now_iso,
+    bin_label_sql,
     get_monthly_bins_definition,
     ensure_monthly_bins_order,
     create_complete_monthly_bins
 )
 
+# Monthly charge bins grouped into low / high charges
+_MONTHLY_LOW = frozenset({"0–35", "36–65"})  # Low charges: 0-65
+_MONTHLY_HIGH = frozenset({"66–95", "96+"})  # High charges: 66+
+
+# Bin labels are assigned with width_bucket over the shared bin edges
+_MONTHLY_BINS_DEFINITION = get_monthly_bins_definition()
+_MONTHLY_RANGE_SQL = bin_label_sql('"MonthlyCharges"', _MONTHLY_BINS_DEFINITION["edges"], _MONTHLY_BINS_DEFINITION["labels"])
+
+# SQL query to bin churned customers by monthly charges
+# Only analyze customers who have churned (Churn = 'Yes')
+# Percentages of the churned total come from a window over the same scan
+MONTHLY_BINS_SQL = f"""
+SELECT 
+    {_MONTHLY_RANGE_SQL} as charge_range,
+    COUNT(*) as count,
+    SUM(COUNT(*)) OVER () as total_churned,
+    ROUND(COUNT(*)::NUMERIC / NULLIF(SUM(COUNT(*)) OVER (), 0), 4)::FLOAT as pct
+FROM churn_customers
+WHERE "Churn" = 'Yes' AND "MonthlyCharges" IS NOT NULL
+GROUP BY 1;
+"""
+
+# Same rows as the live query, precomputed by sql/materialized_views.sql
+# (generated from MONTHLY_BINS_SQL by scripts/generate_materialized_views.py) and
+# refreshed by the ETL pipeline; read instead of aggregating churn_customers
+# when BINS_USE_MATERIALIZED_VIEWS=true
+MONTHLY_BINS_MV_SQL = """
+SELECT charge_range, count, total_churned, pct
+FROM mv_churn_monthly_bins;
+"""
+
+# Monthly charges bins only change when the table is reloaded, so the bins,
+# metadata, summary and insights endpoints share one cached result for a short TTL
+MONTHLY_BINS_CACHE_TTL_SECONDS = 60
+_monthly_bins_cache = AsyncTTLCache(MONTHLY_BINS_CACHE_TTL_SECONDS)
+
 
 async def compute_monthly_bins(conn: Optional[asyncpg.Connection] = None) -> List[Dict[str, Any]]:
     """
@@ -23,6 +64,9 @@ async def compute_monthly_bins(conn: Optional[asyncpg.Connection] = None) -> Lis
     This function analyzes churned customers only (WHERE Churn = 'Yes') and bins
     their monthly charges into fixed ranges: 0–35, 36–65, 66–95, 96+.
     
+    Results are cached for MONTHLY_BINS_CACHE_TTL_SECONDS; concurrent callers on a
+    cold cache wait for a single query instead of each issuing their own.
+    
     Args:
         conn: Optional asyncpg connection (uses global db if None)
         
@@ -37,96 +81,158 @@ async def compute_monthly_bins(conn: Optional[asyncpg.Connection] = None) -> Lis
         
     Raises:
         asyncpg.PostgresError: For database connection/query errors
-        ValueError: For invalid data or computation errors
     """
+    monthly_data, _, _ = await _get_monthly_bins(conn)
+    return monthly_data
+
+
+async def compute_monthly_bins_json(conn: Optional[asyncpg.Connection] = None) -> bytes:
+    """
+    Get the monthly charges bins as a ready-to-send {"monthly_charge_ranges": [...]} JSON body.
     
-    # Get monthly bins configuration
-    monthly_config = get_monthly_bins_definition()
+    The body is serialized with orjson once per cache fill and shared by all
+    callers, so the /bins endpoint does no per-request validation or encoding.
     
-    # SQL query to bin churned customers by monthly charges
-    # Only analyze customers who have churned (Churn = 'Yes')
-    sql = """
-    SELECT 
-        CASE 
-            WHEN "MonthlyCharges" <= 35 THEN '0–35'
-            WHEN "MonthlyCharges" <= 65 THEN '36–65'
-            WHEN "MonthlyCharges" <= 95 THEN '66–95'
-            ELSE '96+'
-        END as charge_range,
-        COUNT(*) as count
-    FROM churn_customers
-    WHERE "Churn" = 'Yes' AND "MonthlyCharges" IS NOT NULL
-    GROUP BY 
-        CASE 
-            WHEN "MonthlyCharges" <= 35 THEN '0–35'
-            WHEN "MonthlyCharges" <= 65 THEN '36–65'
-            WHEN "MonthlyCharges" <= 95 THEN '66–95'
-            ELSE '96+'
-        END;
+    Args:
+        conn: Optional asyncpg connection (uses global db if None)
+        
+    Returns:
+        UTF-8 encoded JSON bytes
     """
+    return (await _get_monthly_bins_cache(conn))[3]
+
+
+async def _get_monthly_bins(conn: Optional[asyncpg.Connection] = None) -> Tuple[List[Dict[str, Any]], int, str]:
+    """Return (monthly bins, total churned, computed_at timestamp), served from the TTL cache."""
+    monthly_data, total_churned, computed_at, _ = await _get_monthly_bins_cache(conn)
     
-    try:
-        # Get total churned customers for percentage calculation
-        total_churned_sql = """
-        SELECT COUNT(*) as total_churned
-        FROM churn_customers
-        WHERE "Churn" = 'Yes' AND "MonthlyCharges" IS NOT NULL;
-        """
-        
-        # Fetch data using the global fetch_df function or connection-specific query
-        if conn:
-            # Use provided connection directly
-            rows = await conn.fetch(sql)
-            total_result = await conn.fetchval(total_churned_sql)
-            
-            if not rows:
-                # Return empty bins with all ranges having zero counts
-                return create_complete_monthly_bins([])
-            
-            # Convert asyncpg Records to list of dicts
-            data = [dict(row) for row in rows]
-            total_churned = int(total_result) if total_result else 0
-        else:
-            # Use global db manager
-            df = await fetch_df(sql)
-            total_df = await fetch_df(total_churned_sql)
-            
-            if df.empty:
-                # Return empty bins with all ranges having zero counts
-                return create_complete_monthly_bins([])
-            
-            # Convert DataFrame to list of dicts
-            data = df.to_dict('records')
-            total_churned = int(total_df.iloc[0]['total_churned']) if not total_df.empty else 0
-        
-        # Process results and calculate percentages
-        results = []
-        
-        for row in data:
-            charge_range = row.get('charge_range', '')
-            count = int(row.get('count', 0))
-            
-            # Calculate percentage of total churned customers
-            pct = round_fp(safe_div(count, total_churned), 4) or 0.0
-            
-            # Format according to required schema
-            result_item = {
-                "range": str(charge_range),
-                "count": count,
-                "pct": pct
-            }
-            
-            results.append(result_item)
-        
-        # Ensure all expected monthly charge ranges are present and in correct order
-        complete_results = create_complete_monthly_bins(results)
+    # Hand out copies so callers can't mutate the cached bins
+    return [dict(item) for item in monthly_data], total_churned, computed_at
+
+
+async def _get_monthly_bins_cache(conn: Optional[asyncpg.Connection] = None) -> Tuple[List[Dict[str, Any]], int, str, bytes]:
+    """Return the (bins, total churned, computed_at, JSON body) entry from the TTL cache."""
+    return await _monthly_bins_cache.get("monthly_bins", lambda: _load_monthly_bins_cache(conn))
+
+
+async def _load_monthly_bins_cache(conn: Optional[asyncpg.Connection] = None) -> Tuple[List[Dict[str, Any]], int, str, bytes]:
+    """Query the bins and build a cache entry, serializing the response body once."""
+    monthly_data, total_churned = await _query_monthly_bins(conn)
+    return (
+        monthly_data,
+        total_churned,
+        utc_now_iso(),
+        orjson.dumps({"monthly_charge_ranges": monthly_data})
+    )
+
+
+async def _query_monthly_bins(conn: Optional[asyncpg.Connection] = None) -> Tuple[List[Dict[str, Any]], int]:
+    """Run the monthly charges bins query and format the rows (uncached)."""
+    sql = MONTHLY_BINS_MV_SQL if env("BINS_USE_MATERIALIZED_VIEWS", "false").lower() == "true" else MONTHLY_BINS_SQL
+    
+    # At most one row per bin: read the Records directly (no DataFrame)
+    rows = await conn.fetch(sql) if conn else await fetch_rows(sql)
+    
+    if not rows:
+        # Return empty bins with all ranges having zero counts
+        return create_complete_monthly_bins([]), 0
+    
+    # Format according to required schema; percentages are already computed
+    # and rounded in SQL, and asyncpg decodes the label to str and COUNT(*) to int
+    results = [
+        {"range": row["charge_range"], "count": row["count"], "pct": row["pct"]}
+        for row in rows
+    ]
+    
+    # Ensure all expected monthly charge ranges are present and in correct order
+    complete_results = create_complete_monthly_bins(results)
+    
+    # Every row carries the churned total from the window, so no re-summing
+    return complete_results, int(rows[0]['total_churned'])
+
+
+def _derive_monthly_metadata(total_churned: int, computed_at: str) -> Dict[str, Any]:
+    """Build the metadata block for already-computed monthly charges bins."""
+    monthly_config = get_monthly_bins_definition()
+    
+    return {
+        "total_churned_customers": total_churned,
+        "bins_definition": dict(monthly_config),
+        "computed_at": computed_at
+    }
+
+
+def _derive_monthly_summary(monthly_data: List[Dict[str, Any]], total_churned: int) -> Dict[str, Any]:
+    """Build summary statistics from already-computed monthly charges bins."""
+    if not monthly_data:
+        return {
+            "highest_count_range": None,
+            "lowest_count_range": None,
+            "most_common_charge_range": None,
+            "total_churned_analyzed": 0
+        }
+    
+    # Find ranges with highest and lowest counts
+    highest_count = max(monthly_data, key=lambda x: x["count"])
+    lowest_count = min(monthly_data, key=lambda x: x["count"])
+    
+    # Find most common charge range (highest percentage)
+    most_common = max(monthly_data, key=lambda x: x["pct"])
+    
+    return {
+        "highest_count_range": highest_count,
+        "lowest_count_range": lowest_count,
+        "most_common_charge_range": most_common,
+        "total_churned_analyzed": total_churned
+    }
+
+
+def _derive_monthly_insights(monthly_data: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Build distribution insights from already-computed monthly charges bins."""
+    if not monthly_data:
+        return {"insights": []}
+    
+    insights = []
+    
+    # Single pass: split counts by group (low vs high charges) and track the dominant range
+    low_count = high_count = 0
+    most_common = None
+    
+    for item in monthly_data:
+        if item["range"] in _MONTHLY_LOW:
+            low_count += item["count"]
+        elif item["range"] in _MONTHLY_HIGH:
+            high_count += item["count"]
         
-        return complete_results
+        if most_common is None or item["pct"] > most_common["pct"]:
+            most_common = item
+    
+    total_count = low_count + high_count
+    
+    if total_count > 0:
+        low_pct = round_fp(safe_div(low_count, total_count) * 100, 1)
+        high_pct = round_fp(safe_div(high_count, total_count) * 100, 1)
         
-    except asyncpg.PostgresError as e:
-        raise asyncpg.PostgresError(f"Database error in compute_monthly_bins: {e}")
-    except Exception as e:
-        raise ValueError(f"Failed to compute monthly bins: {e}")
+        insights.append({
+            "type": "low_vs_high_charges_churn",
+            "low_charges_pct": low_pct,
+            "high_charges_pct": high_pct,
+            "insight": f"{low_pct}% of churned customers have low charges ($0-65), {high_pct}% have high charges ($66+)"
+        })
+    
+    # Find dominant charge range
+    if most_common["pct"] > 0:
+        insights.append({
+            "type": "dominant_range",
+            "range": most_common["range"],
+            "percentage": most_common["pct"] * 100,
+            "insight": f"Most churned customers ({most_common['pct']*100:.1f}%) are in the ${most_common['range']} monthly charges range"
+        })
+    
+    return {
+        "insights": insights,
+        "monthly_charge_distribution": monthly_data
+    }
 
 
 async def compute_monthly_bins_with_metadata(conn: Optional[asyncpg.Connection] = None) -> Dict[str, Any]:
@@ -147,27 +253,13 @@ async def compute_monthly_bins_with_metadata(conn: Optional[asyncpg.Connection]
             }
         }
     """
-    try:
-        from datetime import datetime
-        
-        # Get main analysis
-        monthly_analysis = await compute_monthly_bins(conn)
-        
-        # Calculate metadata
-        total_churned = sum(item["count"] for item in monthly_analysis)
-        monthly_config = get_monthly_bins_definition()
-        
-        return {
-            "monthly_charge_ranges": monthly_analysis,
-            "metadata": {
-                "total_churned_customers": total_churned,
-                "bins_definition": monthly_config,
-                "computed_at": datetime.utcnow().isoformat() + "Z"
-            }
-        }
-        
-    except Exception as e:
-        raise ValueError(f"Failed to compute monthly bins with metadata: {e}")
+    # Get main analysis
+    monthly_analysis, total_churned, computed_at = await _get_monthly_bins(conn)
+    
+    return {
+        "monthly_charge_ranges": monthly_analysis,
+        "metadata": _derive_monthly_metadata(total_churned, computed_at)
+    }
 
 
 async def get_monthly_summary_stats(conn: Optional[asyncpg.Connection] = None) -> Dict[str, Any]:
@@ -177,36 +269,9 @@ async def get_monthly_summary_stats(conn: Optional[asyncpg.Connection] = None) -
     Returns:
         Dict with summary stats like highest/lowest bins, dominant range, etc.
     """
-    try:
-        monthly_data = await compute_monthly_bins(conn)
-        
-        if not monthly_data:
-            return {
-                "highest_count_range": None,
-                "lowest_count_range": None,
-                "most_common_charge_range": None,
-                "total_churned_analyzed": 0
-            }
-        
-        # Find ranges with highest and lowest counts
-        highest_count = max(monthly_data, key=lambda x: x["count"])
-        lowest_count = min(monthly_data, key=lambda x: x["count"])
-        
-        # Find most common charge range (highest percentage)
-        most_common = max(monthly_data, key=lambda x: x["pct"])
-        
-        # Calculate total churned customers
-        total_churned = sum(item["count"] for item in monthly_data)
-        
-        return {
-            "highest_count_range": highest_count,
-            "lowest_count_range": lowest_count,
-            "most_common_charge_range": most_common,
-            "total_churned_analyzed": total_churned
-        }
-        
-    except Exception as e:
-        raise ValueError(f"Failed to compute monthly summary stats: {e}")
+    monthly_data, total_churned, _ = await _get_monthly_bins(conn)
+    
+    return _derive_monthly_summary(monthly_data, total_churned)
 
 
 async def get_monthly_distribution_insights(conn: Optional[asyncpg.Connection] = None) -> Dict[str, Any]:
@@ -216,47 +281,30 @@ async def get_monthly_distribution_insights(conn: Optional[asyncpg.Connection] =
     Returns:
         Dict with analytical insights about monthly charge patterns
     """
-    try:
-        monthly_data = await compute_monthly_bins(conn)
-        
-        if not monthly_data:
-            return {"insights": []}
-        
-        insights = []
-        
-        # Analyze low vs high charge churn
-        low_ranges = ["0–35", "36–65"]      # Low charges: 0-65
-        high_ranges = ["66–95", "96+"]      # High charges: 66+
-        
-        low_count = sum(item["count"] for item in monthly_data if item["range"] in low_ranges)
-        high_count = sum(item["count"] for item in monthly_data if item["range"] in high_ranges)
-        total_count = low_count + high_count
-        
-        if total_count > 0:
-            low_pct = round_fp(safe_div(low_count, total_count) * 100, 1)
-            high_pct = round_fp(safe_div(high_count, total_count) * 100, 1)
-            
-            insights.append({
-                "type": "low_vs_high_charges_churn",
-                "low_charges_pct": low_pct,
-                "high_charges_pct": high_pct,
-                "insight": f"{low_pct}% of churned customers have low charges ($0-65), {high_pct}% have high charges ($66+)"
-            })
-        
-        # Find dominant charge range
-        most_common = max(monthly_data, key=lambda x: x["pct"])
-        if most_common["pct"] > 0:
-            insights.append({
-                "type": "dominant_range",
-                "range": most_common["range"],
-                "percentage": most_common["pct"] * 100,
-                "insight": f"Most churned customers ({most_common['pct']*100:.1f}%) are in the ${most_common['range']} monthly charges range"
-            })
-        
-        return {
-            "insights": insights,
-            "monthly_charge_distribution": monthly_data
-        }
+    monthly_data = await compute_monthly_bins(conn)
+    
+    return _derive_monthly_insights(monthly_data)
+
+
+async def compute_monthly_report(conn: Optional[asyncpg.Connection] = None) -> Dict[str, Any]:
+    """
+    Compute monthly charges bins, metadata, summary stats and insights from one query.
+    
+    Lets a dashboard render everything the /bins, /bins/metadata,
+    /bins/summary and /bins/insights endpoints return with a single
+    compute_monthly_bins call.
+    
+    Args:
+        conn: Optional asyncpg connection
         
-    except Exception as e:
-        raise ValueError(f"Failed to compute monthly distribution insights: {e}")
\ No newline at end of file
+    Returns:
+        Dict with "monthly_charge_ranges", "metadata", "summary" and "insights" keys
+    """
+    monthly_data, total_churned, computed_at = await _get_monthly_bins(conn)
+    
+    return {
+        "monthly_charge_ranges": monthly_data,
+        "metadata": _derive_monthly_metadata(total_churned, computed_at),
+        "summary": _derive_monthly_summary(monthly_data, total_churned),
+        "insights": _derive_monthly_insights(monthly_data)["insights"]
+    }
@@ -4,17 +4,58 @@ Tenure bins analysis for churned customers.
 Analyzes tenure distribution of churned customers in fixed bins: 0–3, 4–6, 7–12, 13–24, 25+.
 """
 
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 import asyncpg
-from ..core.db import fetch_df
+import orjson
+from ..core.config import env
+from ..core.cache import AsyncTTLCache
+from ..core.db import fetch_rows
 from ..core.utils import (
     safe_div, 
     round_fp, 
+    utc_now_iso,
+    bin_label_sql,
     get_tenure_bins_definition,
     ensure_tenure_bins_order,
     create_complete_tenure_bins
 )
 
+# Tenure bins grouped into churn within / after the first year
+_TENURE_EARLY = frozenset({"0–3", "4–6", "7–12"})  # 0-12 months
+_TENURE_LATE = frozenset({"13–24", "25+"})         # 13+ months
+
+# Bin labels are assigned with width_bucket over the shared bin edges
+_TENURE_BINS_DEFINITION = get_tenure_bins_definition()
+_TENURE_RANGE_SQL = bin_label_sql("tenure", _TENURE_BINS_DEFINITION["edges"], _TENURE_BINS_DEFINITION["labels"])
+
+# SQL query to bin churned customers by tenure
+# Only analyze customers who have churned (Churn = 'Yes')
+# Percentages of the churned total come from a window over the same scan
+TENURE_BINS_SQL = f"""
+SELECT 
+    {_TENURE_RANGE_SQL} as tenure_range,
+    COUNT(*) as count,
+    SUM(COUNT(*)) OVER () as total_churned,
+    ROUND(COUNT(*)::NUMERIC / NULLIF(SUM(COUNT(*)) OVER (), 0), 4)::FLOAT as pct
+FROM churn_customers
+WHERE "Churn" = 'Yes' AND tenure IS NOT NULL
+GROUP BY 1;
+"""
+
+# Same rows as the live query, precomputed by sql/materialized_views.sql
+# (generated from TENURE_BINS_SQL by scripts/generate_materialized_views.py) and
+# refreshed by the ETL pipeline; read instead of aggregating churn_customers
+# when BINS_USE_MATERIALIZED_VIEWS=true
+TENURE_BINS_MV_SQL = """
+SELECT tenure_range, count, total_churned, pct
+FROM mv_churn_tenure_bins;
+"""
+
+# Tenure bins only change when the table is reloaded, so the bins, metadata,
+# summary and insights endpoints share one cached result for a short TTL
+TENURE_BINS_CACHE_TTL_SECONDS = 60
+_tenure_bins_cache = AsyncTTLCache(TENURE_BINS_CACHE_TTL_SECONDS)
+
 
 async def compute_tenure_bins(conn: Optional[asyncpg.Connection] = None) -> List[Dict[str, Any]]:
     """
@@ -23,6 +64,9 @@ async def compute_tenure_bins(conn: Optional[asyncpg.Connection] = None) -> List
     This function analyzes churned customers only (WHERE Churn = 'Yes') and bins
     their tenure into fixed ranges: 0–3, 4–6, 7–12, 13–24, 25+ months.
     
+    Results are cached for TENURE_BINS_CACHE_TTL_SECONDS; concurrent callers on a
+    cold cache wait for a single query instead of each issuing their own.
+    
     Args:
         conn: Optional asyncpg connection (uses global db if None)
         
@@ -38,98 +82,158 @@ async def compute_tenure_bins(conn: Optional[asyncpg.Connection] = None) -> List
         
     Raises:
         asyncpg.PostgresError: For database connection/query errors
-        ValueError: For invalid data or computation errors
     """
+    tenure_data, _, _ = await _get_tenure_bins(conn)
+    return tenure_data
+
+
+async def compute_tenure_bins_json(conn: Optional[asyncpg.Connection] = None) -> bytes:
+    """
+    Get the tenure bins as a ready-to-send {"tenure_ranges": [...]} JSON body.
     
-    # Get tenure bins configuration
-    tenure_config = get_tenure_bins_definition()
+    The body is serialized with orjson once per cache fill and shared by all
+    callers, so the /bins endpoint does no per-request validation or encoding.
     
-    # SQL query to bin churned customers by tenure
-    # Only analyze customers who have churned (Churn = 'Yes')
-    sql = """
-    SELECT 
-        CASE 
-            WHEN tenure <= 3 THEN '0–3'
-            WHEN tenure <= 6 THEN '4–6'
-            WHEN tenure <= 12 THEN '7–12'
-            WHEN tenure <= 24 THEN '13–24'
-            ELSE '25+'
-        END as tenure_range,
-        COUNT(*) as count
-    FROM churn_customers
-    WHERE "Churn" = 'Yes' AND tenure IS NOT NULL
-    GROUP BY 
-        CASE 
-            WHEN tenure <= 3 THEN '0–3'
-            WHEN tenure <= 6 THEN '4–6'
-            WHEN tenure <= 12 THEN '7–12'
-            WHEN tenure <= 24 THEN '13–24'
-            ELSE '25+'
-        END;
+    Args:
+        conn: Optional asyncpg connection (uses global db if None)
+        
+    Returns:
+        UTF-8 encoded JSON bytes
     """
+    return (await _get_tenure_bins_cache(conn))[3]
+
+
+async def _get_tenure_bins(conn: Optional[asyncpg.Connection] = None) -> Tuple[List[Dict[str, Any]], int, str]:
+    """Return (tenure bins, total churned, computed_at timestamp), served from the TTL cache."""
+    tenure_data, total_churned, computed_at, _ = await _get_tenure_bins_cache(conn)
     
-    try:
-        # Get total churned customers for percentage calculation
-        total_churned_sql = """
-        SELECT COUNT(*) as total_churned
-        FROM churn_customers
-        WHERE "Churn" = 'Yes' AND tenure IS NOT NULL;
-        """
-        
-        # Fetch data using the global fetch_df function or connection-specific query
-        if conn:
-            # Use provided connection directly
-            rows = await conn.fetch(sql)
-            total_result = await conn.fetchval(total_churned_sql)
-            
-            if not rows:
-                # Return empty bins with all ranges having zero counts
-                return create_complete_tenure_bins([])
-            
-            # Convert asyncpg Records to list of dicts
-            data = [dict(row) for row in rows]
-            total_churned = int(total_result) if total_result else 0
-        else:
-            # Use global db manager
-            df = await fetch_df(sql)
-            total_df = await fetch_df(total_churned_sql)
-            
-            if df.empty:
-                # Return empty bins with all ranges having zero counts
-                return create_complete_tenure_bins([])
-            
-            # Convert DataFrame to list of dicts
-            data = df.to_dict('records')
-            total_churned = int(total_df.iloc[0]['total_churned']) if not total_df.empty else 0
-        
-        # Process results and calculate percentages
-        results = []
-        
-        for row in data:
-            tenure_range = row.get('tenure_range', '')
-            count = int(row.get('count', 0))
-            
-            # Calculate percentage of total churned customers
-            pct = round_fp(safe_div(count, total_churned), 4) or 0.0
-            
-            # Format according to required schema
-            result_item = {
-                "range": str(tenure_range),
-                "count": count,
-                "pct": pct
-            }
-            
-            results.append(result_item)
-        
-        # Ensure all expected tenure ranges are present and in correct order
-        complete_results = create_complete_tenure_bins(results)
+    # Hand out copies so callers can't mutate the cached bins
+    return [dict(item) for item in tenure_data], total_churned, computed_at
+
+
+async def _get_tenure_bins_cache(conn: Optional[asyncpg.Connection] = None) -> Tuple[List[Dict[str, Any]], int, str, bytes]:
+    """Return the (bins, total churned, computed_at, JSON body) entry from the TTL cache."""
+    return await _tenure_bins_cache.get("tenure_bins", lambda: _load_tenure_bins_cache(conn))
+
+
+async def _load_tenure_bins_cache(conn: Optional[asyncpg.Connection] = None) -> Tuple[List[Dict[str, Any]], int, str, bytes]:
+    """Query the bins and build a cache entry, serializing the response body once."""
+    tenure_data, total_churned = await _query_tenure_bins(conn)
+    return (
+        tenure_data,
+        total_churned,
+        utc_now_iso(),
+        orjson.dumps({"tenure_ranges": tenure_data})
+    )
+
+
+async def _query_tenure_bins(conn: Optional[asyncpg.Connection] = None) -> Tuple[List[Dict[str, Any]], int]:
+    """Run the tenure bins query and format the rows (uncached)."""
+    sql = TENURE_BINS_MV_SQL if env("BINS_USE_MATERIALIZED_VIEWS", "false").lower() == "true" else TENURE_BINS_SQL
+    
+    # At most one row per bin: read the Records directly (no DataFrame)
+    rows = await conn.fetch(sql) if conn else await fetch_rows(sql)
+    
+    if not rows:
+        # Return empty bins with all ranges having zero counts
+        return create_complete_tenure_bins([]), 0
+    
+    # Format according to required schema; percentages are already computed
+    # and rounded in SQL, and asyncpg decodes the label to str and COUNT(*) to int
+    results = [
+        {"range": row["tenure_range"], "count": row["count"], "pct": row["pct"]}
+        for row in rows
+    ]
+    
+    # Ensure all expected tenure ranges are present and in correct order
+    complete_results = create_complete_tenure_bins(results)
+    
+    # Every row carries the churned total from the window, so no re-summing
+    return complete_results, int(rows[0]['total_churned'])
+
+
+def _derive_tenure_metadata(total_churned: int, computed_at: str) -> Dict[str, Any]:
+    """Build the metadata block for already-computed tenure bins."""
+    tenure_config = get_tenure_bins_definition()
+    
+    return {
+        "total_churned_customers": total_churned,
+        "bins_definition": dict(tenure_config),
+        "computed_at": computed_at
+    }
+
+
+def _derive_tenure_summary(tenure_data: List[Dict[str, Any]], total_churned: int) -> Dict[str, Any]:
+    """Build summary statistics from already-computed tenure bins."""
+    if not tenure_data:
+        return {
+            "highest_count_range": None,
+            "lowest_count_range": None,
+            "most_common_tenure_range": None,
+            "total_churned_analyzed": 0
+        }
+    
+    # Find ranges with highest and lowest counts
+    highest_count = max(tenure_data, key=lambda x: x["count"])
+    lowest_count = min(tenure_data, key=lambda x: x["count"])
+    
+    # Find most common tenure range (highest percentage)
+    most_common = max(tenure_data, key=lambda x: x["pct"])
+    
+    return {
+        "highest_count_range": highest_count,
+        "lowest_count_range": lowest_count,
+        "most_common_tenure_range": most_common,
+        "total_churned_analyzed": total_churned
+    }
+
+
+def _derive_tenure_insights(tenure_data: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Build distribution insights from already-computed tenure bins."""
+    if not tenure_data:
+        return {"insights": []}
+    
+    insights = []
+    
+    # Single pass: split counts by group (early vs late tenure) and track the dominant range
+    early_count = late_count = 0
+    most_common = None
+    
+    for item in tenure_data:
+        if item["range"] in _TENURE_EARLY:
+            early_count += item["count"]
+        elif item["range"] in _TENURE_LATE:
+            late_count += item["count"]
         
-        return complete_results
+        if most_common is None or item["pct"] > most_common["pct"]:
+            most_common = item
+    
+    total_count = early_count + late_count
+    
+    if total_count > 0:
+        early_pct = round_fp(safe_div(early_count, total_count) * 100, 1)
+        late_pct = round_fp(safe_div(late_count, total_count) * 100, 1)
         
-    except asyncpg.PostgresError as e:
-        raise asyncpg.PostgresError(f"Database error in compute_tenure_bins: {e}")
-    except Exception as e:
-        raise ValueError(f"Failed to compute tenure bins: {e}")
+        insights.append({
+            "type": "early_vs_late_churn",
+            "early_churn_pct": early_pct,
+            "late_churn_pct": late_pct,
+            "insight": f"{early_pct}% of churned customers left within first year, {late_pct}% after first year"
+        })
+    
+    # Find dominant tenure range
+    if most_common["pct"] > 0:
+        insights.append({
+            "type": "dominant_range",
+            "range": most_common["range"],
+            "percentage": most_common["pct"] * 100,
+            "insight": f"Most churned customers ({most_common['pct']*100:.1f}%) are in the {most_common['range']} months tenure range"
+        })
+    
+    return {
+        "insights": insights,
+        "tenure_distribution": tenure_data
+    }
 
 
 async def compute_tenure_bins_with_metadata(conn: Optional[asyncpg.Connection] = None) -> Dict[str, Any]:
@@ -150,27 +254,13 @@ async def compute_tenure_bins_with_metadata(conn: Optional[asyncpg.Connection] =
             }
         }
     """
-    try:
-        from datetime import datetime
-        
-        # Get main analysis
-        tenure_analysis = await compute_tenure_bins(conn)
-        
-        # Calculate metadata
-        total_churned = sum(item["count"] for item in tenure_analysis)
-        tenure_config = get_tenure_bins_definition()
-        
-        return {
-            "tenure_ranges": tenure_analysis,
-            "metadata": {
-                "total_churned_customers": total_churned,
-                "bins_definition": tenure_config,
-                "computed_at": datetime.utcnow().isoformat() + "Z"
-            }
-        }
-        
-    except Exception as e:
-        raise ValueError(f"Failed to compute tenure bins with metadata: {e}")
+    # Get main analysis
+    tenure_analysis, total_churned, computed_at = await _get_tenure_bins(conn)
+    
+    return {
+        "tenure_ranges": tenure_analysis,
+        "metadata": _derive_tenure_metadata(total_churned, computed_at)
+    }
 
 
 async def get_tenure_summary_stats(conn: Optional[asyncpg.Connection] = None) -> Dict[str, Any]:
@@ -180,36 +270,9 @@ async def get_tenure_summary_stats(conn: Optional[asyncpg.Connection] = None) ->
     Returns:
         Dict with summary stats like highest/lowest bins, median range, etc.
     """
-    try:
-        tenure_data = await compute_tenure_bins(conn)
-        
-        if not tenure_data:
-            return {
-                "highest_count_range": None,
-                "lowest_count_range": None,
-                "most_common_tenure_range": None,
-                "total_churned_analyzed": 0
-            }
-        
-        # Find ranges with highest and lowest counts
-        highest_count = max(tenure_data, key=lambda x: x["count"])
-        lowest_count = min(tenure_data, key=lambda x: x["count"])
-        
-        # Find most common tenure range (highest percentage)
-        most_common = max(tenure_data, key=lambda x: x["pct"])
-        
-        # Calculate total churned customers
-        total_churned = sum(item["count"] for item in tenure_data)
-        
-        return {
-            "highest_count_range": highest_count,
-            "lowest_count_range": lowest_count,
-            "most_common_tenure_range": most_common,
-            "total_churned_analyzed": total_churned
-        }
-        
-    except Exception as e:
-        raise ValueError(f"Failed to compute tenure summary stats: {e}")
+    tenure_data, total_churned, _ = await _get_tenure_bins(conn)
+    
+    return _derive_tenure_summary(tenure_data, total_churned)
 
 
 async def get_tenure_distribution_insights(conn: Optional[asyncpg.Connection] = None) -> Dict[str, Any]:
@@ -219,47 +282,31 @@ async def get_tenure_distribution_insights(conn: Optional[asyncpg.Connection] =
     Returns:
         Dict with analytical insights about tenure patterns
     """
-    try:
-        tenure_data = await compute_tenure_bins(conn)
-        
-        if not tenure_data:
-            return {"insights": []}
-        
-        insights = []
-        
-        # Analyze early vs late tenure churn
-        early_ranges = ["0–3", "4–6", "7–12"]  # 0-12 months
-        late_ranges = ["13–24", "25+"]         # 13+ months
-        
-        early_count = sum(item["count"] for item in tenure_data if item["range"] in early_ranges)
-        late_count = sum(item["count"] for item in tenure_data if item["range"] in late_ranges)
-        total_count = early_count + late_count
-        
-        if total_count > 0:
-            early_pct = round_fp(safe_div(early_count, total_count) * 100, 1)
-            late_pct = round_fp(safe_div(late_count, total_count) * 100, 1)
-            
-            insights.append({
-                "type": "early_vs_late_churn",
-                "early_churn_pct": early_pct,
-                "late_churn_pct": late_pct,
-                "insight": f"{early_pct}% of churned customers left within first year, {late_pct}% after first year"
-            })
-        
-        # Find dominant tenure range
-        most_common = max(tenure_data, key=lambda x: x["pct"])
-        if most_common["pct"] > 0:
-            insights.append({
-                "type": "dominant_range",
-                "range": most_common["range"],
-                "percentage": most_common["pct"] * 100,
-                "insight": f"Most churned customers ({most_common['pct']*100:.1f}%) are in the {most_common['range']} months tenure range"
-            })
-        
-        return {
-            "insights": insights,
-            "tenure_distribution": tenure_data
-        }
+    tenure_data = await compute_tenure_bins(conn)
+    
+    return _derive_tenure_insights(tenure_data)
+
+
+async def compute_tenure_report(conn: Optional[asyncpg.Connection] = None) -> Dict[str, Any]:
+    """
+    Compute tenure bins, metadata, summary stats and insights from one query.
+    
+    Lets a dashboard render everything the /bins, /bins/metadata,
+    /bins/summary and /bins/insights endpoints return with a single
+    compute_tenure_bins call.
+    
+    Args:
+        conn: Optional asyncpg connection
         
-    except Exception as e:
-        raise ValueError(f"Failed to compute tenure distribution insights: {e}")
\ No newline at end of file
+    Returns:
+        Dict with "tenure_ranges", "metadata", "summary" and "insights" keys
+    """
+    tenure_data, total_churned, computed_at = await _get_tenure_bins(conn)
+    
+    return {
+        "tenure_ranges": tenure_data,
+        "metadata": _derive_tenure_metadata(total_churned, computed_at),
+        "summary": _derive_tenure_summary(tenure_data, total_churned),
+        "insights": _derive_tenure_insights(tenure_data)["insights"]
+    }
+
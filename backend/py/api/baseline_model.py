@@ -4,15 +4,25 @@ FastAPI router for baseline churn prediction model endpoints.
 Provides REST API for training, loading, and evaluating the baseline ML model.
 """
 
-from typing import Dict, Any
+from typing import Dict, Any, Tuple
+from pathlib import Path
 from fastapi import APIRouter, HTTPException, Depends, status, BackgroundTasks
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
+import os
+import asyncio
+import functools
+import uuid
 import asyncpg
 import logging
-import os
+import orjson
 
+from ..core.config import BACKEND_DIR
 from ..core.db import get_db_connection
+from ..core.utils import utc_now_iso
 from ..analysis.baseline_model import (
+    ML_AVAILABLE,
+    TrainingLock,
+    get_trainer,
     load_or_train,
     train_and_save,
     get_model_info
@@ -21,6 +31,34 @@ from ..analysis.baseline_model import (
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# Model files live in backend/models, independent of the working directory
+MODEL_DIR = str(BACKEND_DIR / "models")
+
+# Health probes, kept as constants so the text is identical on every call
+# and hits asyncpg's statement cache when DB_STATEMENT_CACHE_SIZE is enabled
+MODEL_HEALTH_SQL = """
+SELECT 
+    1 AS ok,
+    (SELECT COUNT(*)
+     FROM churn_customers
+     WHERE tenure IS NOT NULL 
+       AND "MonthlyCharges" IS NOT NULL) AS data_count
+"""
+DB_PING_SQL = "SELECT 1"
+
+# Background retrain job state, persisted next to the model so every server
+# worker (and a restarted one) reports the same job; single-flight is
+# enforced by the trainer's cross-process training lock
+RETRAIN_STATUS_PATH = Path(MODEL_DIR) / "retrain_status.json"
+IDLE_RETRAIN_STATE: Dict[str, Any] = {
+    "status": "idle",
+    "job_id": None,
+    "started_at": None,
+    "finished_at": None,
+    "result": None,
+    "error": None
+}
+
 # Create router instance
 router = APIRouter(
     prefix="/api/model",
@@ -36,14 +74,13 @@ router = APIRouter(
             response_model=Dict[str, Any],
             summary="Get Baseline Churn Prediction Model",
             description="Load pre-trained baseline model or train new one if it doesn't exist. Returns model performance metrics and top features.")
-async def get_baseline_model(
-    conn: asyncpg.Connection = Depends(get_db_connection)
-) -> Dict[str, Any]:
+async def get_baseline_model() -> Dict[str, Any]:
     """
     Get baseline churn prediction model (Logistic Regression).
     
     This endpoint loads a pre-trained model from cache if available, otherwise
-    trains a new model and caches it for future use.
+    trains a new model and caches it for future use. A pooled database
+    connection is only checked out when training data has to be loaded.
     
     Model Features:
     - Numeric: tenure, MonthlyCharges (missing = median)
@@ -52,7 +89,7 @@ async def get_baseline_model(
     - Target: churn (Yes=1, No=0)
     
     Model Configuration:
-    - Algorithm: LogisticRegression(solver="liblinear", class_weight="balanced")
+    - Algorithm: LogisticRegression(solver="saga", class_weight="balanced") on sparse features
     - Split: 80% train, 20% test (stratified, random_state=42)
     - Evaluation: ROC AUC score
     - Feature Selection: Top 10 by absolute coefficient weight
@@ -86,97 +123,191 @@ async def get_baseline_model(
         }
     """
     try:
-        logger.info("Loading or training baseline churn prediction model")
-        
-        # Get model directory path (relative to project root)
-        model_dir = os.path.join(os.getcwd(), "models")
+        logger.debug("Loading or training baseline churn prediction model")
         
         # Load existing model or train new one
-        result = await load_or_train(conn, model_dir)
+        result = await load_or_train(None, MODEL_DIR)
         
-        logger.info(f"Baseline model {result['status']}: AUC = {result['model']['auc']}")
+        logger.info("Baseline model %s: AUC = %s", result["status"], result["model"]["auc"])
         
         return result
         
     except ImportError as e:
-        logger.error(f"Missing ML dependencies: {e}")
+        logger.error("Missing ML dependencies: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Machine learning dependencies not installed. Please install scikit-learn: pip install scikit-learn"
         )
     except ValueError as e:
-        logger.error(f"Model training/loading error: {e}")
+        logger.error("Model training/loading error: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Model error: {str(e)}"
         )
     except Exception as e:
-        logger.error(f"Unexpected error in get_baseline_model: {e}")
+        logger.error("Unexpected error in get_baseline_model: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Internal server error"
         )
 
 
+def _read_retrain_status() -> Dict[str, Any]:
+    """Read the persisted retrain job state ("idle" if no retrain has run)."""
+    try:
+        return orjson.loads(RETRAIN_STATUS_PATH.read_bytes())
+    except (FileNotFoundError, orjson.JSONDecodeError):
+        return dict(IDLE_RETRAIN_STATE)
+
+
+def _write_retrain_status(state: Dict[str, Any]) -> None:
+    """Persist the retrain job state, replacing the file atomically."""
+    tmp_path = RETRAIN_STATUS_PATH.with_name(RETRAIN_STATUS_PATH.name + ".tmp")
+    tmp_path.write_bytes(orjson.dumps(state))
+    os.replace(tmp_path, RETRAIN_STATUS_PATH)
+
+
+async def _run_retrain(state: Dict[str, Any], lock: TrainingLock) -> None:
+    """Train and save the baseline model in the background, persisting the outcome."""
+    job_id = state["job_id"]
+    
+    try:
+        # No request connection is passed: a pooled connection is checked
+        # out only while the training data is loaded
+        result = await train_and_save(None, MODEL_DIR, lock)
+        
+        logger.info("Model retrained successfully (job %s): AUC = %s", job_id, result["model"]["auc"])
+        
+        state = {**state, "status": "succeeded", "result": result}
+        
+    except Exception as e:
+        logger.error("Background retrain %s failed: %s", job_id, e)
+        state = {**state, "status": "failed", "error": str(e)}
+    
+    try:
+        # Record the outcome before releasing the lock, so a poll never sees
+        # "running" without a lock holder (which reads as interrupted)
+        state["finished_at"] = utc_now_iso()
+        await asyncio.to_thread(_write_retrain_status, state)
+    
+    except Exception as e:
+        logger.error("Failed to record the outcome of retrain %s: %s", job_id, e)
+    
+    finally:
+        lock.release()
+
+
 @router.post("/baseline/retrain",
              response_model=Dict[str, Any],
+             status_code=status.HTTP_202_ACCEPTED,
              summary="Retrain Baseline Model",
-             description="Force retrain the baseline model with fresh data and save to cache.")
+             description="Start retraining the baseline model with fresh data in the background; poll /baseline/retrain/status for the result.")
 async def retrain_baseline_model(
-    background_tasks: BackgroundTasks,
-    conn: asyncpg.Connection = Depends(get_db_connection)
-) -> Dict[str, Any]:
+    background_tasks: BackgroundTasks
+) -> JSONResponse:
     """
     Force retrain the baseline churn prediction model.
     
-    This endpoint forces retraining of the model with the latest data,
-    overwriting any existing cached model.
+    Training runs as a background task after the response is sent, so
+    neither the HTTP worker nor a database connection is held for the
+    training run. Only one retrain runs at a time across all server workers;
+    a request made while one is in progress gets the running job back
+    instead of starting another.
     
     Returns:
-        JSON response with new model performance metrics
+        202 JSON response with the job id of the scheduled (or running) retrain
         
     Example Response:
         {
-            "status": "success",
-            "message": "Model trained and saved successfully",
-            "model": {
-                "auc": 0.8456,
-                "top_features": [...]
-            },
-            "training_info": {...}
+            "status": "accepted",
+            "message": "Model retraining started",
+            "job_id": "3f2b9c1e-...",
+            "status_url": "/api/model/baseline/retrain/status"
         }
     """
-    try:
-        logger.info("Forcing retrain of baseline churn prediction model")
-        
-        # Get model directory path
-        model_dir = os.path.join(os.getcwd(), "models")
-        
-        # Force retrain model
-        result = await train_and_save(conn, model_dir)
-        
-        logger.info(f"Model retrained successfully: AUC = {result['model']['auc']}")
-        
-        return result
-        
-    except ImportError as e:
-        logger.error(f"Missing ML dependencies: {e}")
+    if not ML_AVAILABLE:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Machine learning dependencies not installed. Please install scikit-learn"
         )
-    except ValueError as e:
-        logger.error(f"Model training error: {e}")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Training error: {str(e)}"
+    
+    # The training lock is taken here and handed to the background task,
+    # which releases it when the run is over. The non-blocking attempt is
+    # taken inline: awaiting it in a thread could leave the lock held if
+    # the request were cancelled meanwhile
+    lock = get_trainer(MODEL_DIR).training_lock()
+    if not lock.acquire(blocking=False):
+        current = await asyncio.to_thread(_read_retrain_status)
+        return JSONResponse(
+            status_code=status.HTTP_202_ACCEPTED,
+            content={
+                "status": "already_running",
+                "message": "Model retraining is already in progress",
+                # The winning request may not have recorded its job yet
+                "job_id": current["job_id"] if current["status"] == "running" else None,
+                "status_url": "/api/model/baseline/retrain/status"
+            }
         )
+    
+    state = {
+        **IDLE_RETRAIN_STATE,
+        "status": "running",
+        "job_id": str(uuid.uuid4()),
+        "started_at": utc_now_iso()
+    }
+    
+    try:
+        await asyncio.to_thread(_write_retrain_status, state)
     except Exception as e:
-        logger.error(f"Unexpected error in retrain_baseline_model: {e}")
+        lock.release()
+        logger.error("Failed to record retrain job: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Internal server error"
+            detail="Failed to start model retraining"
         )
+    
+    logger.info("Scheduling background retrain of baseline churn prediction model (job %s)", state["job_id"])
+    
+    background_tasks.add_task(_run_retrain, state, lock)
+    
+    return JSONResponse(
+        status_code=status.HTTP_202_ACCEPTED,
+        content={
+            "status": "accepted",
+            "message": "Model retraining started",
+            "job_id": state["job_id"],
+            "status_url": "/api/model/baseline/retrain/status"
+        }
+    )
+
+
+@router.get("/baseline/retrain/status",
+            response_model=Dict[str, Any],
+            summary="Baseline Model Retrain Status",
+            description="Get the status of the most recent background retrain.")
+async def get_retrain_status() -> Dict[str, Any]:
+    """
+    Get the status of the most recent baseline model retrain.
+    
+    Any server worker can answer: the state is read from the status file
+    next to the model. A job still marked "running" while no process holds
+    the training lock was cut off (e.g. by a restart) and is reported as failed.
+    
+    Returns:
+        JSON response with status ("idle", "running", "succeeded" or "failed"),
+        job id, timestamps, and the training result or error message
+    """
+    state = await asyncio.to_thread(_read_retrain_status)
+    
+    if state["status"] == "running" and not await asyncio.to_thread(get_trainer(MODEL_DIR).is_training):
+        # The job records its outcome before releasing the lock, so it may
+        # have finished since the first read; only a job still "running"
+        # now was cut off
+        state = await asyncio.to_thread(_read_retrain_status)
+        if state["status"] == "running":
+            state.update(status="failed", error="Retraining was interrupted before it finished")
+    
+    return state
 
 
 @router.get("/baseline/info",
@@ -203,26 +334,47 @@ async def get_baseline_model_info() -> Dict[str, Any]:
         }
     """
     try:
-        logger.info("Getting baseline model information")
-        
-        # Get model directory path
-        model_dir = os.path.join(os.getcwd(), "models")
+        logger.debug("Getting baseline model information")
         
         # Get model info
-        info = await get_model_info(model_dir)
+        info = await get_model_info(MODEL_DIR)
         
-        logger.info(f"Model info retrieved: exists = {info.get('model_exists', False)}")
+        logger.debug("Model info retrieved: exists = %s", info.get("model_exists", False))
         
         return info
         
     except Exception as e:
-        logger.error(f"Error getting model info: {e}")
+        logger.error("Error getting model info: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to get model information: {str(e)}"
         )
 
 
+async def _probe_database(conn: asyncpg.Connection) -> Tuple[bool, bool, int]:
+    """Return (database connected, training data available, sample count) for the health check."""
+    try:
+        # Test database connectivity and data availability in one round trip
+        row = await conn.fetchrow(MODEL_HEALTH_SQL)
+        data_count = row["data_count"]
+        
+        return row["ok"] == 1, data_count is not None and data_count > 0, data_count
+        
+    except Exception:
+        # Data not readable: still report whether the database itself is reachable
+        db_result = await conn.fetchval(DB_PING_SQL)
+        return db_result == 1, False, 0
+
+
+async def _probe_model_cached() -> bool:
+    """Return whether a trained model is saved, for the health check."""
+    try:
+        info = await get_model_info(MODEL_DIR)
+        return info.get("model_exists", False)
+    except Exception:
+        return False
+
+
 @router.get("/baseline/health",
             response_model=Dict[str, Any],
             summary="Model API Health Check",
@@ -250,37 +402,15 @@ async def baseline_model_health_check(
         }
     """
     try:
-        # Test basic database connectivity
-        db_result = await conn.fetchval("SELECT 1")
-        db_connected = db_result == 1
-        
-        # Test ML dependencies
-        try:
-            import sklearn
-            ml_available = True
-        except ImportError:
-            ml_available = False
+        # ML dependencies are probed once when the analysis module is imported
+        ml_available = ML_AVAILABLE
         
-        # Test data availability
-        try:
-            data_count = await conn.fetchval("""
-                SELECT COUNT(*)
-                FROM churn_customers
-                WHERE tenure IS NOT NULL 
-                  AND "MonthlyCharges" IS NOT NULL
-            """)
-            data_available = data_count is not None and data_count > 0
-        except Exception:
-            data_available = False
-            data_count = 0
-        
-        # Check if model is cached
-        try:
-            model_dir = os.path.join(os.getcwd(), "models")
-            info = await get_model_info(model_dir)
-            model_cached = info.get("model_exists", False)
-        except Exception:
-            model_cached = False
+        # The model file check doesn't use the database, so it runs while the
+        # probe queries are in flight (they share one connection and stay sequential)
+        (db_connected, data_available, data_count), model_cached = await asyncio.gather(
+            _probe_database(conn),
+            _probe_model_cached()
+        )
         
         # Determine overall status
         can_function = db_connected and ml_available and data_available
@@ -297,7 +427,7 @@ async def baseline_model_health_check(
         }
         
     except Exception as e:
-        logger.error(f"Model health check failed: {e}")
+        logger.error("Model health check failed: %s", e)
         return {
             "status": "unhealthy",
             "service": "baseline-model",
@@ -309,11 +439,36 @@ async def baseline_model_health_check(
         }
 
 
+@functools.lru_cache(maxsize=1)
+def _baseline_features_body() -> bytes:
+    """Serialize the (static) baseline model feature configuration once."""
+    trainer = get_trainer(MODEL_DIR)
+    
+    return orjson.dumps({
+        "feature_groups": {
+            "numeric": trainer.numeric_features,
+            "categorical": trainer.categorical_features,
+            "boolean": trainer.boolean_features
+        },
+        "preprocessing": {
+            "numeric_imputation": "median",
+            "categorical_imputation": "Unknown", 
+            "boolean_imputation": 0,
+            "categorical_encoding": "one_hot_drop_first"
+        },
+        "model_config": {
+            "algorithm": "LogisticRegression",
+            **trainer.model_params,
+            "test_size": trainer.test_size
+        }
+    })
+
+
 @router.get("/baseline/features",
             response_model=Dict[str, Any],
             summary="Get Model Feature Information",
             description="Get detailed information about features used in the baseline model.")
-async def get_baseline_features() -> Dict[str, Any]:
+async def get_baseline_features() -> Response:
     """
     Get information about features used in the baseline model.
     
@@ -335,7 +490,7 @@ async def get_baseline_features() -> Dict[str, Any]:
             },
             "model_config": {
                 "algorithm": "LogisticRegression",
-                "solver": "liblinear",
+                "solver": "saga",
                 "class_weight": "balanced",
                 "test_size": 0.2,
                 "random_state": 42
@@ -343,31 +498,11 @@ async def get_baseline_features() -> Dict[str, Any]:
         }
     """
     try:
-        from ..analysis.baseline_model import ChurnModelTrainer
-        
-        trainer = ChurnModelTrainer()
-        
-        return {
-            "feature_groups": {
-                "numeric": trainer.numeric_features,
-                "categorical": trainer.categorical_features,
-                "boolean": trainer.boolean_features
-            },
-            "preprocessing": {
-                "numeric_imputation": "median",
-                "categorical_imputation": "Unknown", 
-                "boolean_imputation": 0,
-                "categorical_encoding": "one_hot_drop_first"
-            },
-            "model_config": {
-                "algorithm": "LogisticRegression",
-                **trainer.model_params,
-                "test_size": trainer.test_size
-            }
-        }
+        # The feature configuration is static, so the body is built once
+        return Response(content=_baseline_features_body(), media_type="application/json")
         
     except Exception as e:
-        logger.error(f"Error getting feature info: {e}")
+        logger.error("Error getting feature info: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to get feature information: {str(e)}"
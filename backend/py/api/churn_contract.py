@@ -6,20 +6,45 @@ Provides REST API for analyzing churn rates grouped by contract type.
 
 from typing import Dict, Any, List
 from fastapi import APIRouter, HTTPException, Depends, status
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
 import asyncpg
 import logging
 
 from ..core.db import get_db_connection
 from ..analysis.churn_by_contract import (
-    compute_churn_by_contract,
+    compute_churn_by_contract_json,
     compute_churn_by_contract_with_metadata,
-    get_contract_summary_stats
+    get_contract_summary_stats,
+    use_normalized_contract_column
 )
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# Health probe: connectivity and access to contract data in one query. Kept
+# as a constant so the text is identical on every call and hits asyncpg's
+# statement cache when DB_STATEMENT_CACHE_SIZE is enabled
+CONTRACT_HEALTH_SQL = """
+SELECT 
+    1 AS ok,
+    COUNT(DISTINCT 
+        CASE 
+            WHEN "Contract" IS NULL OR TRIM("Contract") = '' THEN 'Unknown'
+            ELSE "Contract"
+        END
+    ) AS contract_count
+FROM churn_customers
+"""
+
+# Same probe over the contract_norm generated column (sql/contract_norm.sql),
+# which its index can answer without evaluating TRIM/CASE per row
+CONTRACT_HEALTH_NORM_SQL = """
+SELECT 
+    1 AS ok,
+    COUNT(DISTINCT contract_norm) AS contract_count
+FROM churn_customers
+"""
+
 # Create router instance
 router = APIRouter(
     prefix="/api/churn",
@@ -31,11 +56,14 @@ router = APIRouter(
 )
 
 
+# The analysis endpoints are served from the analysis module's TTL cache, so
+# they take no request-scoped connection: a pooled connection is only checked
+# out (through fetch_rows) on a cache miss
 @router.get("/contract", 
             response_model=Dict[str, List[Dict[str, Any]]],
             summary="Get Churn Rate by Contract Type",
             description="Retrieve churn rates grouped by contract type, sorted by churn rate descending.")
-async def get_churn_by_contract(conn: asyncpg.Connection = Depends(get_db_connection)) -> Dict[str, Any]:
+async def get_churn_by_contract() -> Response:
     """
     Get churn rates grouped by contract type.
     
@@ -62,34 +90,30 @@ async def get_churn_by_contract(conn: asyncpg.Connection = Depends(get_db_connec
         }
     """
     try:
-        logger.info("Computing churn rates by contract type")
-        
-        # Compute churn analysis using the provided database connection
-        contract_analysis = await compute_churn_by_contract(conn)
+        logger.debug("Computing churn rates by contract type")
         
-        logger.info(f"Contract analysis computed successfully: {len(contract_analysis)} contract types found")
+        # The response body is serialized once per cache fill, so it is sent
+        # as-is instead of being validated and encoded on every request
+        body = await compute_churn_by_contract_json()
         
-        # Format response according to required schema
-        response = {
-            "churn_rate_by_contract": contract_analysis
-        }
+        logger.debug("Contract analysis computed successfully")
         
-        return response
+        return Response(content=body, media_type="application/json")
         
     except asyncpg.PostgresError as e:
-        logger.error(f"Database error in get_churn_by_contract: {e}")
+        logger.error("Database error in get_churn_by_contract: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Database error: {str(e)}"
         )
     except ValueError as e:
-        logger.error(f"Computation error in get_churn_by_contract: {e}")
+        logger.error("Computation error in get_churn_by_contract: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Computation error: {str(e)}"
         )
     except Exception as e:
-        logger.error(f"Unexpected error in get_churn_by_contract: {e}")
+        logger.error("Unexpected error in get_churn_by_contract: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Internal server error"
@@ -100,7 +124,7 @@ async def get_churn_by_contract(conn: asyncpg.Connection = Depends(get_db_connec
             response_model=Dict[str, Any],
             summary="Get Churn by Contract with Metadata",
             description="Get churn rates by contract type with additional metadata and computation details.")
-async def get_churn_by_contract_with_metadata(conn: asyncpg.Connection = Depends(get_db_connection)) -> Dict[str, Any]:
+async def get_churn_by_contract_with_metadata() -> Dict[str, Any]:
     """
     Get churn rates by contract type with additional metadata.
     
@@ -123,16 +147,16 @@ async def get_churn_by_contract_with_metadata(conn: asyncpg.Connection = Depends
         }
     """
     try:
-        logger.info("Computing churn rates by contract type with metadata")
+        logger.debug("Computing churn rates by contract type with metadata")
         
-        result = await compute_churn_by_contract_with_metadata(conn)
+        result = await compute_churn_by_contract_with_metadata()
         
-        logger.info(f"Contract analysis with metadata computed successfully")
+        logger.debug("Contract analysis with metadata computed successfully")
         
         return result
         
     except Exception as e:
-        logger.error(f"Error in get_churn_by_contract_with_metadata: {e}")
+        logger.error("Error in get_churn_by_contract_with_metadata: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to compute churn by contract with metadata: {str(e)}"
@@ -143,7 +167,7 @@ async def get_churn_by_contract_with_metadata(conn: asyncpg.Connection = Depends
             response_model=Dict[str, Any],
             summary="Get Contract Churn Summary Statistics",
             description="Get summary statistics for contract churn analysis including highest/lowest rates.")
-async def get_contract_churn_summary(conn: asyncpg.Connection = Depends(get_db_connection)) -> Dict[str, Any]:
+async def get_contract_churn_summary() -> Dict[str, Any]:
     """
     Get summary statistics for contract churn analysis.
     
@@ -165,16 +189,16 @@ async def get_contract_churn_summary(conn: asyncpg.Connection = Depends(get_db_c
         }
     """
     try:
-        logger.info("Computing contract churn summary statistics")
+        logger.debug("Computing contract churn summary statistics")
         
-        summary_stats = await get_contract_summary_stats(conn)
+        summary_stats = await get_contract_summary_stats()
         
-        logger.info("Contract summary statistics computed successfully")
+        logger.debug("Contract summary statistics computed successfully")
         
         return summary_stats
         
     except Exception as e:
-        logger.error(f"Error in get_contract_churn_summary: {e}")
+        logger.error("Error in get_contract_churn_summary: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to compute contract churn summary: {str(e)}"
@@ -204,20 +228,11 @@ async def contract_health_check(conn: asyncpg.Connection = Depends(get_db_connec
         }
     """
     try:
-        # Test basic database connectivity
-        result = await conn.fetchval("SELECT 1")
-        db_connected = result == 1
-        
-        # Test if we can access contract data
-        contract_count = await conn.fetchval("""
-            SELECT COUNT(DISTINCT 
-                CASE 
-                    WHEN "Contract" IS NULL OR TRIM("Contract") = '' THEN 'Unknown'
-                    ELSE "Contract"
-                END
-            )
-            FROM churn_customers
-        """)
+        # Test database connectivity and access to contract data in one round trip
+        sql = CONTRACT_HEALTH_NORM_SQL if use_normalized_contract_column() else CONTRACT_HEALTH_SQL
+        row = await conn.fetchrow(sql)
+        db_connected = row["ok"] == 1
+        contract_count = row["contract_count"]
         
         can_analyze = db_connected and contract_count is not None
         
@@ -232,7 +247,7 @@ async def contract_health_check(conn: asyncpg.Connection = Depends(get_db_connec
         }
         
     except Exception as e:
-        logger.error(f"Contract health check failed: {e}")
+        logger.error("Contract health check failed: %s", e)
         return {
             "status": "unhealthy",
             "service": "churn-by-contract",
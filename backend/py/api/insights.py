@@ -4,14 +4,15 @@ FastAPI router for AI-powered churn insights endpoints.
 Provides REST API for generating strategic churn analysis insights using OpenAI GPT-4o.
 """
 
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 from fastapi import APIRouter, HTTPException, status
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, StreamingResponse
 from pydantic import BaseModel, Field
 import logging
 
 from ..analysis.ai_insights import (
     generate_churn_insights,
+    stream_churn_insights,
     validate_openai_connection
 )
 
@@ -171,6 +172,63 @@ async def generate_insights(request: ChurnInsightsRequest) -> Dict[str, Any]:
         )
 
 
+def _sse_event(data: str, event: Optional[str] = None) -> str:
+    """Format a Server-Sent Events message (multi-line data split per the SSE spec)."""
+    lines = [f"event: {event}"] if event else []
+    lines.extend(f"data: {line}" for line in data.split("\n"))
+    return "\n".join(lines) + "\n\n"
+
+
+@router.post("/insights/stream",
+             response_class=StreamingResponse,
+             summary="Stream AI-Powered Churn Insights",
+             description="Stream strategic insights from churn analysis data as Server-Sent Events while GPT-4o generates them.")
+async def stream_insights(request: ChurnInsightsRequest) -> StreamingResponse:
+    """
+    Stream AI-powered strategic insights from churn analysis data.
+    
+    Accepts the same request body as POST /api/insights. The response is a
+    text/event-stream where each message carries the next fragment of the
+    generated text. A final "done" event marks completion; an "error" event
+    is sent if generation fails after the stream has started.
+    
+    Raises:
+        HTTPException: 400 for an empty request body
+        
+    Example Stream:
+        data: # KEY INSIGHTS
+        
+        data: 1. **Critical Churn Rate**
+        
+        event: done
+        data: 
+    """
+    churn_data = request.dict(exclude_none=True)
+    
+    if not churn_data:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Request body cannot be empty. Please provide churn analysis data."
+        )
+    
+    logger.info(f"Streaming AI insights for churn data with {len(churn_data)} data fields")
+    
+    async def event_stream():
+        try:
+            async for fragment in stream_churn_insights(churn_data):
+                yield _sse_event(fragment)
+            yield _sse_event("", event="done")
+        except Exception as e:
+            logger.error(f"Error streaming insights: {e}")
+            yield _sse_event(f"Failed to generate insights: {str(e)}", event="error")
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache"}
+    )
+
+
 @router.get("/insights/health",
             response_model=Dict[str, Any],
             summary="AI Insights Health Check",
@@ -6,16 +6,17 @@ Provides REST API for analyzing monthly charges distribution of churned customer
 
 from typing import Dict, Any, List
 from fastapi import APIRouter, HTTPException, Depends, status
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
 import asyncpg
 import logging
 
 from ..core.db import get_db_connection
 from ..analysis.monthly_bins import (
-    compute_monthly_bins,
+    compute_monthly_bins_json,
     compute_monthly_bins_with_metadata,
     get_monthly_summary_stats,
-    get_monthly_distribution_insights
+    get_monthly_distribution_insights,
+    compute_monthly_report
 )
 
 # Configure logging
@@ -32,11 +33,14 @@ router = APIRouter(
 )
 
 
+# The analysis endpoints are served from the analysis module's TTL cache, so
+# they take no request-scoped connection: a pooled connection is only checked
+# out (through fetch_rows) on a cache miss
 @router.get("/bins", 
             response_model=Dict[str, List[Dict[str, Any]]],
             summary="Get Monthly Charges Distribution for Churned Customers",
             description="Retrieve monthly charges distribution of churned customers in fixed bins: 0–35, 36–65, 66–95, 96+.")
-async def get_monthly_bins(conn: asyncpg.Connection = Depends(get_db_connection)) -> Dict[str, Any]:
+async def get_monthly_bins() -> Response:
     """
     Get monthly charges distribution for churned customers in fixed bins.
     
@@ -68,17 +72,13 @@ async def get_monthly_bins(conn: asyncpg.Connection = Depends(get_db_connection)
     try:
         logger.info("Computing monthly bins for churned customers")
         
-        # Compute monthly bins analysis using the provided database connection
-        monthly_analysis = await compute_monthly_bins(conn)
+        # The response body is serialized once per cache fill, so it is sent
+        # as-is instead of being validated and encoded on every request
+        body = await compute_monthly_bins_json()
         
-        logger.info(f"Monthly bins analysis computed successfully: {len(monthly_analysis)} bins found")
+        logger.info("Monthly bins analysis computed successfully")
         
-        # Format response according to required schema
-        response = {
-            "monthly_charge_ranges": monthly_analysis
-        }
-        
-        return response
+        return Response(content=body, media_type="application/json")
         
     except asyncpg.PostgresError as e:
         logger.error(f"Database error in get_monthly_bins: {e}")
@@ -104,7 +104,7 @@ async def get_monthly_bins(conn: asyncpg.Connection = Depends(get_db_connection)
             response_model=Dict[str, Any],
             summary="Get Monthly Bins with Metadata",
             description="Get monthly charges distribution with additional metadata and computation details.")
-async def get_monthly_bins_with_metadata(conn: asyncpg.Connection = Depends(get_db_connection)) -> Dict[str, Any]:
+async def get_monthly_bins_with_metadata() -> Dict[str, Any]:
     """
     Get monthly bins with additional metadata.
     
@@ -133,7 +133,7 @@ async def get_monthly_bins_with_metadata(conn: asyncpg.Connection = Depends(get_
     try:
         logger.info("Computing monthly bins with metadata")
         
-        result = await compute_monthly_bins_with_metadata(conn)
+        result = await compute_monthly_bins_with_metadata()
         
         logger.info("Monthly bins analysis with metadata computed successfully")
         
@@ -151,7 +151,7 @@ async def get_monthly_bins_with_metadata(conn: asyncpg.Connection = Depends(get_
             response_model=Dict[str, Any],
             summary="Get Monthly Bins Summary Statistics",
             description="Get summary statistics for monthly bins analysis including highest/lowest ranges.")
-async def get_monthly_bins_summary(conn: asyncpg.Connection = Depends(get_db_connection)) -> Dict[str, Any]:
+async def get_monthly_bins_summary() -> Dict[str, Any]:
     """
     Get summary statistics for monthly bins analysis.
     
@@ -175,7 +175,7 @@ async def get_monthly_bins_summary(conn: asyncpg.Connection = Depends(get_db_con
     try:
         logger.info("Computing monthly bins summary statistics")
         
-        summary_stats = await get_monthly_summary_stats(conn)
+        summary_stats = await get_monthly_summary_stats()
         
         logger.info("Monthly bins summary statistics computed successfully")
         
@@ -193,7 +193,7 @@ async def get_monthly_bins_summary(conn: asyncpg.Connection = Depends(get_db_con
             response_model=Dict[str, Any],
             summary="Get Monthly Charges Distribution Insights",
             description="Get analytical insights about monthly charges distribution patterns for churned customers.")
-async def get_monthly_distribution_insights_endpoint(conn: asyncpg.Connection = Depends(get_db_connection)) -> Dict[str, Any]:
+async def get_monthly_distribution_insights_endpoint() -> Dict[str, Any]:
     """
     Get analytical insights about monthly charges distribution patterns.
     
@@ -227,7 +227,7 @@ async def get_monthly_distribution_insights_endpoint(conn: asyncpg.Connection =
     try:
         logger.info("Computing monthly charges distribution insights")
         
-        insights = await get_monthly_distribution_insights(conn)
+        insights = await get_monthly_distribution_insights()
         
         logger.info("Monthly charges distribution insights computed successfully")
         
@@ -241,6 +241,37 @@ async def get_monthly_distribution_insights_endpoint(conn: asyncpg.Connection =
         )
 
 
+@router.get("/bins/report",
+            response_model=Dict[str, Any],
+            summary="Get Monthly Bins Report",
+            description="Get monthly charges bins, metadata, summary statistics and insights computed from a single query.")
+async def get_monthly_bins_report() -> Dict[str, Any]:
+    """
+    Get the full monthly charges bins report in one response.
+    
+    Combines what /bins, /bins/metadata, /bins/summary and /bins/insights
+    return, so a dashboard can render all of them from one database query.
+    
+    Returns:
+        JSON response with "monthly_charge_ranges", "metadata", "summary" and "insights"
+    """
+    try:
+        logger.info("Computing monthly charges bins report")
+        
+        report = await compute_monthly_report()
+        
+        logger.info("Monthly bins report computed successfully")
+        
+        return report
+        
+    except Exception as e:
+        logger.error(f"Error in get_monthly_bins_report: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to compute monthly charges bins report: {str(e)}"
+        )
+
+
 @router.get("/bins/health",
             response_model=Dict[str, Any],
             summary="Monthly Bins Analysis Health Check",
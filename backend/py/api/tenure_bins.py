@@ -6,16 +6,17 @@ Provides REST API for analyzing tenure distribution of churned customers.
 
 from typing import Dict, Any, List
 from fastapi import APIRouter, HTTPException, Depends, status
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
 import asyncpg
 import logging
 
 from ..core.db import get_db_connection
 from ..analysis.tenure_bins import (
-    compute_tenure_bins,
+    compute_tenure_bins_json,
     compute_tenure_bins_with_metadata,
     get_tenure_summary_stats,
-    get_tenure_distribution_insights
+    get_tenure_distribution_insights,
+    compute_tenure_report
 )
 
 # Configure logging
@@ -32,11 +33,14 @@ router = APIRouter(
 )
 
 
+# The analysis endpoints are served from the analysis module's TTL cache, so
+# they take no request-scoped connection: a pooled connection is only checked
+# out (through fetch_rows) on a cache miss
 @router.get("/bins", 
             response_model=Dict[str, List[Dict[str, Any]]],
             summary="Get Tenure Distribution for Churned Customers",
             description="Retrieve tenure distribution of churned customers in fixed bins: 0–3, 4–6, 7–12, 13–24, 25+ months.")
-async def get_tenure_bins(conn: asyncpg.Connection = Depends(get_db_connection)) -> Dict[str, Any]:
+async def get_tenure_bins() -> Response:
     """
     Get tenure distribution for churned customers in fixed bins.
     
@@ -70,17 +74,13 @@ async def get_tenure_bins(conn: asyncpg.Connection = Depends(get_db_connection))
     try:
         logger.info("Computing tenure bins for churned customers")
         
-        # Compute tenure bins analysis using the provided database connection
-        tenure_analysis = await compute_tenure_bins(conn)
+        # The response body is serialized once per cache fill, so it is sent
+        # as-is instead of being validated and encoded on every request
+        body = await compute_tenure_bins_json()
         
-        logger.info(f"Tenure bins analysis computed successfully: {len(tenure_analysis)} bins found")
+        logger.info("Tenure bins analysis computed successfully")
         
-        # Format response according to required schema
-        response = {
-            "tenure_ranges": tenure_analysis
-        }
-        
-        return response
+        return Response(content=body, media_type="application/json")
         
     except asyncpg.PostgresError as e:
         logger.error(f"Database error in get_tenure_bins: {e}")
@@ -106,7 +106,7 @@ async def get_tenure_bins(conn: asyncpg.Connection = Depends(get_db_connection))
             response_model=Dict[str, Any],
             summary="Get Tenure Bins with Metadata",
             description="Get tenure distribution with additional metadata and computation details.")
-async def get_tenure_bins_with_metadata(conn: asyncpg.Connection = Depends(get_db_connection)) -> Dict[str, Any]:
+async def get_tenure_bins_with_metadata() -> Dict[str, Any]:
     """
     Get tenure bins with additional metadata.
     
@@ -135,7 +135,7 @@ async def get_tenure_bins_with_metadata(conn: asyncpg.Connection = Depends(get_d
     try:
         logger.info("Computing tenure bins with metadata")
         
-        result = await compute_tenure_bins_with_metadata(conn)
+        result = await compute_tenure_bins_with_metadata()
         
         logger.info("Tenure bins analysis with metadata computed successfully")
         
@@ -153,7 +153,7 @@ async def get_tenure_bins_with_metadata(conn: asyncpg.Connection = Depends(get_d
             response_model=Dict[str, Any],
             summary="Get Tenure Bins Summary Statistics",
             description="Get summary statistics for tenure bins analysis including highest/lowest ranges.")
-async def get_tenure_bins_summary(conn: asyncpg.Connection = Depends(get_db_connection)) -> Dict[str, Any]:
+async def get_tenure_bins_summary() -> Dict[str, Any]:
     """
     Get summary statistics for tenure bins analysis.
     
@@ -177,7 +177,7 @@ async def get_tenure_bins_summary(conn: asyncpg.Connection = Depends(get_db_conn
     try:
         logger.info("Computing tenure bins summary statistics")
         
-        summary_stats = await get_tenure_summary_stats(conn)
+        summary_stats = await get_tenure_summary_stats()
         
         logger.info("Tenure bins summary statistics computed successfully")
         
@@ -195,7 +195,7 @@ async def get_tenure_bins_summary(conn: asyncpg.Connection = Depends(get_db_conn
             response_model=Dict[str, Any],
             summary="Get Tenure Distribution Insights",
             description="Get analytical insights about tenure distribution patterns for churned customers.")
-async def get_tenure_distribution_insights_endpoint(conn: asyncpg.Connection = Depends(get_db_connection)) -> Dict[str, Any]:
+async def get_tenure_distribution_insights_endpoint() -> Dict[str, Any]:
     """
     Get analytical insights about tenure distribution patterns.
     
@@ -229,7 +229,7 @@ async def get_tenure_distribution_insights_endpoint(conn: asyncpg.Connection = D
     try:
         logger.info("Computing tenure distribution insights")
         
-        insights = await get_tenure_distribution_insights(conn)
+        insights = await get_tenure_distribution_insights()
         
         logger.info("Tenure distribution insights computed successfully")
         
@@ -243,6 +243,37 @@ async def get_tenure_distribution_insights_endpoint(conn: asyncpg.Connection = D
         )
 
 
+@router.get("/bins/report",
+            response_model=Dict[str, Any],
+            summary="Get Tenure Bins Report",
+            description="Get tenure bins, metadata, summary statistics and insights computed from a single query.")
+async def get_tenure_bins_report() -> Dict[str, Any]:
+    """
+    Get the full tenure bins report in one response.
+    
+    Combines what /bins, /bins/metadata, /bins/summary and /bins/insights
+    return, so a dashboard can render all of them from one database query.
+    
+    Returns:
+        JSON response with "tenure_ranges", "metadata", "summary" and "insights"
+    """
+    try:
+        logger.info("Computing tenure bins report")
+        
+        report = await compute_tenure_report()
+        
+        logger.info("Tenure bins report computed successfully")
+        
+        return report
+        
+    except Exception as e:
+        logger.error(f"Error in get_tenure_bins_report: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to compute tenure bins report: {str(e)}"
+        )
+
+
 @router.get("/bins/health",
             response_model=Dict[str, Any],
             summary="Tenure Bins Analysis Health Check",
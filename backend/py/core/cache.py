@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Async TTL cache for the analysis aggregates.
+Concurrent misses on a key share one in-flight load; other keys are never blocked.
+"""
+
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Dict, Hashable, Tuple
+
+
+class AsyncTTLCache:
+    """
+    Per-key async TTL cache with single-flight loading.
+
+    The first caller on a missing or expired key starts the load as a task;
+    callers arriving while it runs await the same task instead of issuing their
+    own query. No lock is held across a load, so keys load independently, and
+    a cancelled caller doesn't cancel the load the others are waiting on.
+    Failed loads are not cached. Expired entries are dropped on every write.
+    """
+
+    def __init__(self, ttl_seconds: float):
+        self.ttl_seconds = ttl_seconds
+        self._entries: Dict[Hashable, Tuple[float, Any]] = {}
+        self._inflight: Dict[Hashable, asyncio.Task] = {}
+
+    async def get(self, key: Hashable, loader: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Return the cached value for key, calling loader() when it is missing or stale.
+
+        Args:
+            key: Cache key
+            loader: Zero-argument coroutine function producing the value
+
+        Returns:
+            The cached (shared) value; callers must not mutate it
+        """
+        entry = self._entries.get(key)
+        if entry is not None and time.monotonic() - entry[0] <= self.ttl_seconds:
+            return entry[1]
+
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._load(key, loader))
+            # Mark a failure as retrieved even if every waiter was cancelled
+            task.add_done_callback(lambda t: t.cancelled() or t.exception())
+            self._inflight[key] = task
+        return await asyncio.shield(task)
+
+    async def _load(self, key: Hashable, loader: Callable[[], Awaitable[Any]]) -> Any:
+        """Run loader() and store its result under key."""
+        try:
+            value = await loader()
+            now = time.monotonic()
+            for stale in [k for k, (ts, _) in self._entries.items() if now - ts > self.ttl_seconds]:
+                del self._entries[stale]
+            self._entries[key] = (now, value)
+            return value
+        finally:
+            self._inflight.pop(key, None)
+
+    def clear(self) -> None:
+        """Drop all cached entries (in-flight loads still complete)."""
+        self._entries.clear()
@@ -0,0 +1,38 @@
+#!/usr/bin/env python3
+"""
+Environment configuration for the churn analysis backend.
+Loads backend/.env exactly once and reads environment variables.
+"""
+
+import os
+import functools
+from pathlib import Path
+from typing import Optional
+
+from dotenv import load_dotenv
+
+# backend/ directory (this file lives in backend/py/core/)
+BACKEND_DIR = Path(__file__).resolve().parents[2]
+
+
+@functools.lru_cache(maxsize=1)
+def load_env() -> None:
+    """Load backend/.env into the process environment (parsed only on first call)."""
+    load_dotenv(BACKEND_DIR / ".env")
+
+
+def env(name: str, default: Optional[str] = None) -> Optional[str]:
+    """
+    Read an environment variable.
+
+    Reads os.environ on every call (a dict lookup), so values loaded later by
+    load_env() or changed at runtime are always visible.
+
+    Args:
+        name: Environment variable name
+        default: Value returned when the variable is not set
+
+    Returns:
+        Variable value or default
+    """
+    return os.environ.get(name, default)
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Pure ASGI CORS middleware for the churn analysis API.
+Answers preflight requests directly and decorates regular responses without
+routing through FastAPI's request/dependency machinery.
+"""
+
+from typing import Any, Awaitable, Callable, Dict, Sequence
+
+Scope = Dict[str, Any]
+Message = Dict[str, Any]
+Receive = Callable[[], Awaitable[Message]]
+Send = Callable[[Message], Awaitable[None]]
+ASGIApp = Callable[[Scope, Receive, Send], Awaitable[None]]
+
+
+class FastCORSMiddleware:
+    """
+    Minimal CORS middleware implemented as a raw ASGI callable.
+
+    Preflight (OPTIONS with Access-Control-Request-Method) requests are answered
+    with a 204 without ever reaching the wrapped application. Simple requests from
+    an allowed origin get the CORS response headers appended to ``http.response.start``.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        allow_origins: Sequence[str] = (),
+        allow_methods: Sequence[str] = ("GET",),
+        allow_headers: Sequence[str] = (),
+        allow_credentials: bool = False,
+        max_age: int = 600,
+    ):
+        self.app = app
+        self.allow_all_origins = "*" in allow_origins
+        self.allow_all_headers = "*" in allow_headers
+
+        # Everything below is encoded once here so the per-request path only does
+        # set lookups and list concatenation.
+        self._origin_set = frozenset(origin.encode("latin-1") for origin in allow_origins)
+        self._method_set = frozenset(method.encode("latin-1") for method in allow_methods)
+
+        simple_headers = [(b"vary", b"Origin")]
+        if allow_credentials:
+            simple_headers.append((b"access-control-allow-credentials", b"true"))
+        self._simple_headers = tuple(simple_headers)
+
+        preflight_headers = list(simple_headers) + [
+            (b"access-control-allow-methods", ", ".join(allow_methods).encode("latin-1")),
+            (b"access-control-max-age", str(max_age).encode("latin-1")),
+        ]
+        if allow_headers and not self.allow_all_headers:
+            preflight_headers.append(
+                (b"access-control-allow-headers", ", ".join(allow_headers).encode("latin-1"))
+            )
+        self._preflight_headers = tuple(preflight_headers)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_headers = dict(scope["headers"])
+        origin = request_headers.get(b"origin")
+
+        if origin is None:
+            # Not a cross-origin request
+            await self.app(scope, receive, send)
+            return
+
+        if scope["method"] == "OPTIONS" and b"access-control-request-method" in request_headers:
+            await self._preflight_response(origin, request_headers, send)
+            return
+
+        if not self._is_allowed_origin(origin):
+            await self.app(scope, receive, send)
+            return
+
+        cors_headers = [(b"access-control-allow-origin", origin), *self._simple_headers]
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                message["headers"] = list(message.get("headers", [])) + cors_headers
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
+
+    def _is_allowed_origin(self, origin: bytes) -> bool:
+        return self.allow_all_origins or origin in self._origin_set
+
+    async def _preflight_response(self, origin: bytes, request_headers: Dict[bytes, bytes], send: Send) -> None:
+        requested_method = request_headers[b"access-control-request-method"]
+
+        if not self._is_allowed_origin(origin) or requested_method not in self._method_set:
+            body = b"Disallowed CORS request"
+            await send({
+                "type": "http.response.start",
+                "status": 400,
+                "headers": [
+                    (b"content-type", b"text/plain; charset=utf-8"),
+                    (b"content-length", str(len(body)).encode("latin-1")),
+                ],
+            })
+            await send({"type": "http.response.body", "body": body})
+            return
+
+        headers = [(b"access-control-allow-origin", origin), *self._preflight_headers]
+
+        if self.allow_all_headers:
+            # Mirror whatever the browser asked for
+            requested_headers = request_headers.get(b"access-control-request-headers")
+            if requested_headers:
+                headers.append((b"access-control-allow-headers", requested_headers))
+
+        await send({"type": "http.response.start", "status": 204, "headers": headers})
+        await send({"type": "http.response.body", "body": b""})
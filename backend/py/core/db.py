@@ -4,36 +4,44 @@ Database connection and utilities using asyncpg for PostgreSQL/Supabase.
 Production-ready with connection pooling and proper error handling.
 """
 
-import os
 import asyncio
 from typing import Optional, Any, Dict, List
 import asyncpg
 import pandas as pd
 from contextlib import asynccontextmanager
 
+from .config import env
+
 
 class DatabaseManager:
     """Async PostgreSQL database manager with connection pooling."""
     
     def __init__(self, database_url: Optional[str] = None):
-        self.database_url = database_url or os.getenv("DATABASE_URL")
+        self.database_url = database_url or env("DATABASE_URL")
         self._pool: Optional[asyncpg.Pool] = None
+        self._pool_lock = asyncio.Lock()
     
     async def create_pool(self, **kwargs) -> asyncpg.Pool:
         """Create connection pool with production settings."""
         if not self.database_url:
             raise ValueError("DATABASE_URL environment variable is required")
-            
-        if self._pool is None or self._pool._closed:
-            self._pool = await asyncpg.create_pool(
-                self.database_url,
-                min_size=2,
-                max_size=10,
-                max_queries=50000,
-                max_inactive_connection_lifetime=300.0,
-                statement_cache_size=0,  # Disable prepared statements for Supabase/pgbouncer
-                **kwargs
-            )
+        
+        # Serialize creation so concurrent first requests share one pool
+        async with self._pool_lock:
+            if self._pool is None or self._pool._closed:
+                self._pool = await asyncpg.create_pool(
+                    self.database_url,
+                    min_size=int(env("DB_POOL_MIN_SIZE", "4")),
+                    max_size=int(env("DB_POOL_MAX_SIZE", "20")),
+                    max_queries=50000,
+                    max_inactive_connection_lifetime=300.0,
+                    # Prepared statements are off by default for Supabase/pgbouncer
+                    # (transaction pooling); with a direct or session-mode connection,
+                    # a non-zero size lets asyncpg reuse each query's parse/plan per
+                    # connection (the analysis queries use stable SQL text)
+                    statement_cache_size=int(env("DB_STATEMENT_CACHE_SIZE", "0")),
+                    **kwargs
+                )
         return self._pool
     
     async def close_pool(self):
@@ -44,7 +52,9 @@ class DatabaseManager:
     @asynccontextmanager
     async def get_connection(self):
         """Get a connection from the pool with automatic cleanup."""
-        pool = await self.create_pool()
+        pool = self._pool
+        if pool is None or pool._closed:
+            pool = await self.create_pool()
         async with pool.acquire() as conn:
             yield conn
     
@@ -77,17 +87,50 @@ class DatabaseManager:
                     # Return empty DataFrame with proper structure if no results
                     return pd.DataFrame()
                 
-                # Convert asyncpg Records to list of dicts for pandas
-                data = [dict(row) for row in rows]
-                df = pd.DataFrame(data)
-                
-                return df
+                # Records are tuples; build the frame directly without per-row dicts
+                return pd.DataFrame.from_records(rows, columns=list(rows[0].keys()))
                 
-        except asyncpg.PostgresError as e:
-            raise asyncpg.PostgresError(f"Database query failed: {e}")
+        except asyncpg.PostgresError:
+            # Propagate the original error (keeps sqlstate and server details)
+            raise
         except Exception as e:
             raise ValueError(f"Failed to create DataFrame: {e}")
     
+    async def fetch_rows(self, sql: str, params: Optional[List[Any]] = None) -> List[asyncpg.Record]:
+        """
+        Execute SQL query and return the raw asyncpg Records.
+        
+        Cheaper than fetch_df for small result sets that are post-processed
+        in Python anyway.
+        
+        Args:
+            sql: SQL query string with $1, $2, ... placeholders
+            params: Optional list of parameters for the query
+            
+        Returns:
+            List of asyncpg Records
+        """
+        params = params or []
+        
+        async with self.get_connection() as conn:
+            return await conn.fetch(sql, *params)
+    
+    async def fetch_row(self, sql: str, params: Optional[List[Any]] = None) -> Optional[asyncpg.Record]:
+        """
+        Execute SQL query and return the first row as an asyncpg Record.
+        
+        Args:
+            sql: SQL query string with $1, $2, ... placeholders
+            params: Optional list of parameters for the query
+            
+        Returns:
+            First Record, or None if the query returned no rows
+        """
+        params = params or []
+        
+        async with self.get_connection() as conn:
+            return await conn.fetchrow(sql, *params)
+    
     async def execute(self, sql: str, params: Optional[List[Any]] = None) -> str:
         """
         Execute SQL command (INSERT, UPDATE, DELETE) and return status.
@@ -101,12 +144,9 @@ class DatabaseManager:
         """
         params = params or []
         
-        try:
-            async with self.get_connection() as conn:
-                status = await conn.execute(sql, *params)
-                return status
-        except asyncpg.PostgresError as e:
-            raise asyncpg.PostgresError(f"Database command failed: {e}")
+        async with self.get_connection() as conn:
+            status = await conn.execute(sql, *params)
+            return status
     
     async def fetch_val(self, sql: str, params: Optional[List[Any]] = None) -> Any:
         """
@@ -121,11 +161,8 @@ class DatabaseManager:
         """
         params = params or []
         
-        try:
-            async with self.get_connection() as conn:
-                return await conn.fetchval(sql, *params)
-        except asyncpg.PostgresError as e:
-            raise asyncpg.PostgresError(f"Database query failed: {e}")
+        async with self.get_connection() as conn:
+            return await conn.fetchval(sql, *params)
 
 
 # Global database manager instance
@@ -152,6 +189,34 @@ async def fetch_df(sql: str, params: Optional[List[Any]] = None) -> pd.DataFrame
     return await db_manager.fetch_df(sql, params)
 
 
+async def fetch_rows(sql: str, params: Optional[List[Any]] = None) -> List[asyncpg.Record]:
+    """
+    Convenience function to fetch raw Records using global db_manager.
+    
+    Args:
+        sql: SQL query string with $1, $2, ... placeholders
+        params: Optional list of parameters for the query
+        
+    Returns:
+        List of asyncpg Records
+    """
+    return await db_manager.fetch_rows(sql, params)
+
+
+async def fetch_row(sql: str, params: Optional[List[Any]] = None) -> Optional[asyncpg.Record]:
+    """
+    Convenience function to fetch a single Record using global db_manager.
+    
+    Args:
+        sql: SQL query string with $1, $2, ... placeholders
+        params: Optional list of parameters for the query
+        
+    Returns:
+        First Record, or None if the query returned no rows
+    """
+    return await db_manager.fetch_row(sql, params)
+
+
 async def health_check() -> Dict[str, Any]:
     """
     Check database connectivity and return health status.
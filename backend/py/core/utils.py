@@ -4,8 +4,11 @@ Core utility functions for safe mathematical operations and data processing.
 Production-ready with comprehensive error handling and type safety.
 """
 
-from typing import Union, Optional, Any, List, Dict
+from typing import Union, Optional, Any, List, Dict, Sequence
+from datetime import datetime, timezone
+import functools
 import math
+import time
 import pandas as pd
 
 
@@ -292,22 +295,75 @@ def create_bins(
         return pd.Series([None] * len(values), dtype="category")
 
 
+@functools.lru_cache(maxsize=1)
+def _format_utc_second(epoch_second: int) -> str:
+    """Format a Unix timestamp (whole seconds) as an ISO-8601 UTC string."""
+    return datetime.fromtimestamp(epoch_second, tz=timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def utc_now_iso() -> str:
+    """
+    Get the current UTC time as an ISO-8601 string with a "Z" suffix.
+
+    Resolution is one second; the formatted value is cached, so repeated calls
+    within the same second return the same string without re-formatting.
+
+    Returns:
+        Timestamp string like "2024-01-15T10:30:00Z"
+    """
+    return _format_utc_second(time.time_ns() // 1_000_000_000)
+
+
+def bin_label_sql(column: str, edges: Sequence[Union[int, float]], labels: Sequence[str]) -> str:
+    """
+    Build a SQL expression that maps a numeric column to its bin label.
+    
+    Bins are upper-inclusive (first bin: value <= edges[1], ..., last bin:
+    everything above edges[-2]), matching the bins definitions in this
+    module. width_bucket() buckets by lower-inclusive thresholds, so it is
+    applied to the negated value against the negated upper edges.
+    
+    Args:
+        column: Quoted column name or SQL expression to bin
+        edges: Bin edges as in get_*_bins_definition() (first and last are sentinels)
+        labels: One label per bin, in ascending order
+        
+    Returns:
+        SQL expression evaluating to the label of the bin containing column
+        
+    Examples:
+        >>> bin_label_sql("tenure", [0, 3, 999], ["0–3", "4+"])
+        "(ARRAY['0–3', '4+'])[2 - width_bucket((-tenure)::NUMERIC, ARRAY[-3]::NUMERIC[])]"
+    """
+    upper_edges = ", ".join(str(-edge) for edge in reversed(edges[1:-1]))
+    label_array = ", ".join("'" + label.replace("'", "''") + "'" for label in labels)
+    
+    return (
+        f"(ARRAY[{label_array}])"
+        f"[{len(labels)} - width_bucket((-{column})::NUMERIC, ARRAY[{upper_edges}]::NUMERIC[])]"
+    )
+
+
+@functools.lru_cache(maxsize=1)
 def get_tenure_bins_definition() -> Dict[str, Any]:
     """
     Get the standard tenure bins definition for consistent use across the application.
     
+    The definition is built once and shared by all callers, so its values are
+    tuples; copy the dict before modifying it.
+    
     Returns:
         Dict with tenure bins configuration:
         {
-            "edges": [0, 3, 6, 12, 24, 999],
-            "labels": ["0–3", "4–6", "7–12", "13–24", "25+"],
-            "order": ["0–3", "4–6", "7–12", "13–24", "25+"]
+            "edges": (0, 3, 6, 12, 24, 999),
+            "labels": ("0–3", "4–6", "7–12", "13–24", "25+"),
+            "order": ("0–3", "4–6", "7–12", "13–24", "25+")
         }
     """
     return {
-        "edges": [0, 3, 6, 12, 24, 999],  # 999 represents max tenure
-        "labels": ["0–3", "4–6", "7–12", "13–24", "25+"],
-        "order": ["0–3", "4–6", "7–12", "13–24", "25+"]
+        "edges": (0, 3, 6, 12, 24, 999),  # 999 represents max tenure
+        "labels": ("0–3", "4–6", "7–12", "13–24", "25+"),
+        "order": ("0–3", "4–6", "7–12", "13–24", "25+")
     }
 
 
@@ -373,22 +429,26 @@ def create_complete_tenure_bins(bins_data: List[Dict[str, Any]]) -> List[Dict[st
     return complete_bins
 
 
+@functools.lru_cache(maxsize=1)
 def get_monthly_bins_definition() -> Dict[str, Any]:
     """
     Get the standard monthly charges bins definition for consistent use across the application.
     
+    The definition is built once and shared by all callers, so its values are
+    tuples; copy the dict before modifying it.
+    
     Returns:
         Dict with monthly charges bins configuration:
         {
-            "edges": [0, 35, 65, 95, 999],
-            "labels": ["0–35", "36–65", "66–95", "96+"],
-            "order": ["0–35", "36–65", "66–95", "96+"]
+            "edges": (0, 35, 65, 95, 999),
+            "labels": ("0–35", "36–65", "66–95", "96+"),
+            "order": ("0–35", "36–65", "66–95", "96+")
         }
     """
     return {
-        "edges": [0, 35, 65, 95, 999],  # 999 represents max monthly charges
-        "labels": ["0–35", "36–65", "66–95", "96+"],
-        "order": ["0–35", "36–65", "66–95", "96+"]
+        "edges": (0, 35, 65, 95, 999),  # 999 represents max monthly charges
+        "labels": ("0–35", "36–65", "66–95", "96+"),
+        "order": ("0–35", "36–65", "66–95", "96+")
     }
 
 
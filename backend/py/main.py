@@ -10,15 +10,18 @@ from contextlib import asynccontextmanager
 from typing import Dict, Any
 
 # Load environment variables first
-from dotenv import load_dotenv
-load_dotenv()
+from .core.config import load_env
+load_env()
 
 from fastapi import FastAPI, HTTPException, status
-from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, ORJSONResponse
 import uvicorn
 
 from .core.db import db_manager, health_check
+from .core.cors import FastCORSMiddleware
+from .core.config import env
+from .analysis.ai_insights import get_ai_generator
+from .analysis.baseline_model import shutdown_train_pool
 from .api.kpis import router as kpis_router
 from .api.churn_contract import router as churn_contract_router
 from .api.churn_payment import router as churn_payment_router
@@ -64,6 +67,20 @@ async def lifespan(app: FastAPI):
         logger.error(f"❌ Failed to initialize database: {e}")
         # Continue startup even if DB is not available (for health checks)
     
+    # Warm the AI insights client so the first /api/insights request doesn't pay for it
+    try:
+        ai_generator = get_ai_generator()
+        logger.info("✅ AI insights client initialized")
+        
+        # Key validation makes a (paid) API call, so it is opt-in
+        if env("OPENAI_VALIDATE_ON_STARTUP", "false").lower() == "true":
+            if await ai_generator.validate_api_key():
+                logger.info("✅ OpenAI API key validated")
+            else:
+                logger.warning("⚠️ OpenAI API key validation failed")
+    except Exception as e:
+        logger.warning(f"⚠️ AI insights unavailable: {e}")
+    
     yield
     
     # Shutdown
@@ -74,6 +91,9 @@ async def lifespan(app: FastAPI):
         logger.info("✅ Database connection pool closed")
     except Exception as e:
         logger.error(f"❌ Error closing database pool: {e}")
+    
+    # Stop any model-fitting worker processes
+    shutdown_train_pool()
 
 
 # Create FastAPI application
@@ -83,12 +103,13 @@ app = FastAPI(
     version="1.0.0",
     docs_url="/docs",
     redoc_url="/redoc",
+    default_response_class=ORJSONResponse,
     lifespan=lifespan
 )
 
-# Add CORS middleware for frontend integration
+# Add CORS middleware for frontend integration (pure ASGI, preflight answered inline)
 app.add_middleware(
-    CORSMiddleware,
+    FastCORSMiddleware,
     allow_origins=[
         "http://localhost:3000",  # Next.js dev server
         "http://localhost:8000",  # FastAPI dev server
@@ -219,11 +240,13 @@ async def root() -> Dict[str, Any]:
             "tenure_bins_metadata": "/api/tenure/bins/metadata - Tenure analysis with metadata",
             "tenure_bins_summary": "/api/tenure/bins/summary - Tenure summary statistics",
             "tenure_bins_insights": "/api/tenure/bins/insights - Tenure distribution insights",
+            "tenure_bins_report": "/api/tenure/bins/report - Tenure bins, metadata, summary and insights in one response",
             "tenure_bins_health": "/api/tenure/bins/health - Tenure analysis health check",
             "monthly_bins": "/api/monthly/bins - Monthly charges distribution for churned customers",
             "monthly_bins_metadata": "/api/monthly/bins/metadata - Monthly analysis with metadata",
             "monthly_bins_summary": "/api/monthly/bins/summary - Monthly summary statistics",
             "monthly_bins_insights": "/api/monthly/bins/insights - Monthly charges distribution insights",
+            "monthly_bins_report": "/api/monthly/bins/report - Monthly bins, metadata, summary and insights in one response",
             "monthly_bins_health": "/api/monthly/bins/health - Monthly analysis health check",
             "feature_churn": "/api/features/churn - Churn rates by service features (supports ?names= query param)",
             "feature_churn_metadata": "/api/features/churn/metadata - Feature churn analysis with metadata",
@@ -236,6 +259,7 @@ async def root() -> Dict[str, Any]:
             "baseline_model_features": "/api/model/baseline/features - Get model feature configuration",
             "baseline_model_health": "/api/model/baseline/health - ML model health check",
             "ai_insights": "/api/insights - AI-powered strategic churn insights (POST with churn data)",
+            "ai_insights_stream": "/api/insights/stream - Stream AI insights as Server-Sent Events (POST with churn data)",
             "ai_insights_health": "/api/insights/health - AI insights service health check",
             "ai_insights_sample": "/api/insights/sample - Get sample request data for testing AI insights",
             "docs": "/docs - Interactive API documentation",
@@ -276,9 +300,5 @@ def run_dev_server():
 
 
 if __name__ == "__main__":
-    # Load environment variables if running directly
-    from dotenv import load_dotenv
-    load_dotenv()
-    
     # Run development server
     run_dev_server()
\ No newline at end of file
@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""
+Tests for the baseline model training lock and the background retrain endpoints.
+"""
+
+import asyncio
+import subprocess
+import sys
+from pathlib import Path
+import orjson
+import pytest
+from fastapi import BackgroundTasks
+
+from py.analysis import baseline_model as model
+from py.analysis.baseline_model import ML_AVAILABLE, TRAINING_LOCK_POLL_SECONDS, ChurnModelTrainer
+from py.api import baseline_model as api
+
+BACKEND_DIR = Path(__file__).resolve().parents[2]
+
+# Runs the status endpoint's lock-holder check in a tight loop from a separate
+# process (like another server worker), against the model dir in argv[1]
+STATUS_POLLER = """
+import sys
+from py.analysis.baseline_model import ChurnModelTrainer
+
+trainer = ChurnModelTrainer(sys.argv[1])
+trainer.is_training()
+print("polling", flush=True)
+while True:
+    trainer.is_training()
+"""
+
+pytestmark = pytest.mark.skipif(not ML_AVAILABLE, reason="scikit-learn not installed")
+
+
+@pytest.fixture
+def trainer(tmp_path, monkeypatch):
+    """Point the retrain endpoints and the global trainer at a tmp model dir."""
+    trainer = ChurnModelTrainer(str(tmp_path))
+    monkeypatch.setattr(model, "_trainer", trainer)
+    monkeypatch.setattr(api, "MODEL_DIR", str(tmp_path))
+    monkeypatch.setattr(api, "RETRAIN_STATUS_PATH", tmp_path / "retrain_status.json")
+    return trainer
+
+
+class FakeTraining:
+    """Stand-in for train_and_save that runs until the test finishes it."""
+    
+    RESULT = {"status": "success", "model": {"auc": 0.85, "top_features": []}}
+    
+    def __init__(self):
+        self.finish = asyncio.Event()
+        self.error = None
+        self.calls = 0
+    
+    async def __call__(self, conn, model_dir, lock):
+        self.calls += 1
+        await self.finish.wait()
+        if self.error is not None:
+            raise self.error
+        return self.RESULT
+
+
+@pytest.fixture
+def training(trainer, monkeypatch):
+    """Replace the retrain endpoint's training run with a FakeTraining."""
+    training = FakeTraining()
+    monkeypatch.setattr(api, "train_and_save", training)
+    return training
+
+
+async def start_retrain():
+    """Call the retrain endpoint; returns (response body, scheduled background tasks)."""
+    background_tasks = BackgroundTasks()
+    response = await api.retrain_baseline_model(background_tasks)
+    assert response.status_code == 202
+    return orjson.loads(response.body), background_tasks
+
+
+@pytest.mark.asyncio
+async def test_cancelled_train_and_save_does_not_keep_the_lock(tmp_path):
+    trainer = ChurnModelTrainer(str(tmp_path))
+    holder = trainer.training_lock()
+    assert holder.acquire(blocking=False)
+    
+    # Cancel a run while it is still waiting for the lock
+    waiter = asyncio.create_task(trainer.train_and_save())
+    await asyncio.sleep(TRAINING_LOCK_POLL_SECONDS * 2)
+    waiter.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await waiter
+    
+    holder.release()
+    await asyncio.sleep(TRAINING_LOCK_POLL_SECONDS * 2)
+    
+    lock = trainer.training_lock()
+    assert lock.acquire(blocking=False)
+    lock.release()
+
+
+def test_is_training_ignores_a_dead_holder(trainer):
+    lock = trainer.training_lock()
+    assert lock.acquire(blocking=False)
+    assert trainer.is_training()
+    lock.release()
+    assert not trainer.is_training()
+    
+    # PID left behind by a holder that died without releasing
+    trainer.lock_path.write_text(f"{2 ** 22 + 1:<20}")
+    assert not trainer.is_training()
+
+
+@pytest.mark.asyncio
+async def test_status_poll_concurrent_with_retrain_request(trainer):
+    poller = subprocess.Popen(
+        [sys.executable, "-c", STATUS_POLLER, str(trainer.model_dir)],
+        cwd=BACKEND_DIR,
+        stdout=subprocess.PIPE
+    )
+    try:
+        assert poller.stdout.readline() == b"polling\n"
+        
+        for _ in range(200):
+            body, background_tasks = await start_retrain()
+            assert body["status"] == "accepted"
+            background_tasks.tasks[0].args[1].release()
+            
+            # Let the poller run between requests
+            await asyncio.sleep(0.001)
+    finally:
+        poller.kill()
+        poller.wait()
+
+
+
+@pytest.mark.asyncio
+async def test_status_is_idle_before_any_retrain(trainer):
+    assert (await api.get_retrain_status())["status"] == "idle"
+
+
+@pytest.mark.asyncio
+async def test_retrain_runs_to_success(trainer, training):
+    body, background_tasks = await start_retrain()
+    assert body["status"] == "accepted"
+    
+    run = asyncio.create_task(background_tasks())
+    await asyncio.sleep(0)
+    status = await api.get_retrain_status()
+    assert status["status"] == "running"
+    assert status["job_id"] == body["job_id"]
+    assert status["finished_at"] is None
+    
+    training.finish.set()
+    await run
+    
+    status = await api.get_retrain_status()
+    assert status["status"] == "succeeded"
+    assert status["job_id"] == body["job_id"]
+    assert status["result"] == FakeTraining.RESULT
+    assert status["finished_at"] is not None
+    assert not trainer.is_training()
+
+
+@pytest.mark.asyncio
+async def test_retrain_failure_is_reported(trainer, training):
+    training.error = ValueError("Model training failed: no data")
+    body, background_tasks = await start_retrain()
+    
+    training.finish.set()
+    await background_tasks()
+    
+    status = await api.get_retrain_status()
+    assert status["status"] == "failed"
+    assert status["job_id"] == body["job_id"]
+    assert status["error"] == "Model training failed: no data"
+    assert not trainer.is_training()
+
+
+@pytest.mark.asyncio
+async def test_retrain_while_running_returns_the_running_job(trainer, training):
+    first, background_tasks = await start_retrain()
+    run = asyncio.create_task(background_tasks())
+    await asyncio.sleep(0)
+    
+    second, second_tasks = await start_retrain()
+    assert second["status"] == "already_running"
+    assert second["job_id"] == first["job_id"]
+    assert not second_tasks.tasks
+    
+    training.finish.set()
+    await run
+    assert training.calls == 1
+    
+    # Once the run is over a new retrain starts
+    third, background_tasks = await start_retrain()
+    assert third["status"] == "accepted"
+    assert third["job_id"] != first["job_id"]
+    background_tasks.tasks[0].args[1].release()
+
+
+@pytest.mark.asyncio
+async def test_running_job_without_lock_holder_is_reported_interrupted(trainer):
+    api._write_retrain_status({**api.IDLE_RETRAIN_STATE, "status": "running", "job_id": "lost"})
+    
+    status = await api.get_retrain_status()
+    assert status["status"] == "failed"
+    assert status["job_id"] == "lost"
+    assert status["error"] == "Retraining was interrupted before it finished"
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Tests for the shared async TTL cache used by the analysis modules.
+"""
+
+import asyncio
+import pytest
+
+from py.core.cache import AsyncTTLCache
+
+
+class CountingLoader:
+    """Loader that counts calls and can be held open until released."""
+    
+    def __init__(self, value="value"):
+        self.value = value
+        self.calls = 0
+        self.release = asyncio.Event()
+        self.release.set()
+    
+    async def __call__(self):
+        self.calls += 1
+        await self.release.wait()
+        return self.value
+
+
+@pytest.mark.asyncio
+async def test_concurrent_misses_share_one_load():
+    cache = AsyncTTLCache(60)
+    loader = CountingLoader()
+    loader.release.clear()
+    
+    waiters = [asyncio.create_task(cache.get("key", loader)) for _ in range(5)]
+    await asyncio.sleep(0)
+    loader.release.set()
+    
+    assert await asyncio.gather(*waiters) == ["value"] * 5
+    assert loader.calls == 1
+    
+    # Fresh entry is served without loading again
+    assert await cache.get("key", loader) == "value"
+    assert loader.calls == 1
+
+
+@pytest.mark.asyncio
+async def test_slow_key_does_not_block_other_keys():
+    cache = AsyncTTLCache(60)
+    slow = CountingLoader("slow")
+    slow.release.clear()
+    
+    slow_task = asyncio.create_task(cache.get("slow", slow))
+    await asyncio.sleep(0)
+    
+    assert await asyncio.wait_for(cache.get("fast", CountingLoader("fast")), timeout=1) == "fast"
+    assert not slow_task.done()
+    
+    slow.release.set()
+    assert await slow_task == "slow"
+
+
+@pytest.mark.asyncio
+async def test_failed_load_is_not_cached():
+    cache = AsyncTTLCache(60)
+    
+    async def failing():
+        raise ValueError("boom")
+    
+    with pytest.raises(ValueError):
+        await cache.get("key", failing)
+    
+    assert await cache.get("key", CountingLoader()) == "value"
+
+
+@pytest.mark.asyncio
+async def test_cancelled_waiter_does_not_cancel_shared_load():
+    cache = AsyncTTLCache(60)
+    loader = CountingLoader()
+    loader.release.clear()
+    
+    first = asyncio.create_task(cache.get("key", loader))
+    second = asyncio.create_task(cache.get("key", loader))
+    await asyncio.sleep(0)
+    first.cancel()
+    loader.release.set()
+    
+    assert await second == "value"
+    with pytest.raises(asyncio.CancelledError):
+        await first
+    assert loader.calls == 1
+
+
+@pytest.mark.asyncio
+async def test_expired_entries_are_dropped_on_write():
+    cache = AsyncTTLCache(0)
+    
+    await cache.get("a", CountingLoader("a"))
+    await asyncio.sleep(0.01)
+    await cache.get("b", CountingLoader("b"))
+    
+    assert list(cache._entries) == ["b"]
@@ -72,6 +72,19 @@ def create_bins(df):
     
     return df
 
+def value_count_rows(counts, total, key_name):
+    """Turn value_counts() output into rows, computing every pct in one vectorized step."""
+    
+    pcts = (counts / total * 100).tolist()
+    return [
+        {
+            key_name: str(key),
+            'count': int(count),
+            'pct': pct
+        }
+        for (key, count), pct in zip(counts.items(), pcts)
+    ]
+
 def calculate_aggregations(df):
     """Calculate all required aggregations and return as a summary dict."""
     
@@ -94,47 +107,19 @@ def calculate_aggregations(df):
     # Contract analysis (churned customers only)
     contract_counts = churned_df['Contract'].value_counts()
     total_churned = len(churned_df)
-    summary['by_contract'] = [
-        {
-            'key': str(contract),
-            'count': int(count),
-            'pct': float(count / total_churned * 100)
-        }
-        for contract, count in contract_counts.items()
-    ]
+    summary['by_contract'] = value_count_rows(contract_counts, total_churned, 'key')
     
     # Payment method analysis (churned customers only)
     payment_counts = churned_df['PaymentMethod'].value_counts()
-    summary['by_payment'] = [
-        {
-            'key': str(payment),
-            'count': int(count),
-            'pct': float(count / total_churned * 100)
-        }
-        for payment, count in payment_counts.items()
-    ]
+    summary['by_payment'] = value_count_rows(payment_counts, total_churned, 'key')
     
     # Tenure ranges (churned customers only)
     tenure_counts = churned_df['tenure_range'].value_counts()
-    summary['tenure_ranges'] = [
-        {
-            'range': str(tenure_range),
-            'count': int(count),
-            'pct': float(count / total_churned * 100)
-        }
-        for tenure_range, count in tenure_counts.items()
-    ]
+    summary['tenure_ranges'] = value_count_rows(tenure_counts, total_churned, 'range')
     
     # Monthly charge ranges (churned customers only)
     charge_counts = churned_df['monthly_charge_range'].value_counts()
-    summary['monthly_charge_ranges'] = [
-        {
-            'range': str(charge_range),
-            'count': int(count),
-            'pct': float(count / total_churned * 100)
-        }
-        for charge_range, count in charge_counts.items()
-    ]
+    summary['monthly_charge_ranges'] = value_count_rows(charge_counts, total_churned, 'range')
     
     # Churn rates by contract (across full dataset)
     contract_churn = df.groupby('Contract')['Churn'].apply(
@@ -191,6 +176,19 @@ create index if not exists idx_churn_summary_snapshot on churn_summary (snapshot
         """)
         return False
 
+def refresh_bins_views(supabase):
+    """Refresh the bins materialized views (see sql/materialized_views.sql)."""
+    
+    try:
+        supabase.rpc("refresh_churn_bins").execute()
+        print("✅ Refreshed bins materialized views.")
+        return True
+        
+    except Exception as e:
+        # The views are optional; the API aggregates live when they are not used
+        print(f"⚠️ Skipped bins materialized views refresh: {str(e)}")
+        return False
+
 def main():
     """Main pipeline execution."""
     
@@ -232,6 +230,7 @@ def main():
         else:
             # Write to Supabase
             write_to_supabase(supabase, summary)
+            refresh_bins_views(supabase)
         
         print("🎉 Pipeline completed successfully!")
         
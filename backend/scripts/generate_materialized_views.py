@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Generate sql/materialized_views.sql from the live bins queries.
+The view bodies are the TENURE_BINS_SQL / MONTHLY_BINS_SQL constants, which are
+built from the bins definitions in py/core/utils.py, so views and API can't drift.
+
+Usage:
+    python scripts/generate_materialized_views.py          # rewrite the SQL file
+    python scripts/generate_materialized_views.py --check  # exit 1 if it is stale
+"""
+
+import sys
+from pathlib import Path
+
+# Make the backend's py package importable when run from anywhere
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(BACKEND_DIR))
+
+from py.analysis.tenure_bins import TENURE_BINS_SQL
+from py.analysis.monthly_bins import MONTHLY_BINS_SQL
+
+SQL_PATH = BACKEND_DIR / "sql" / "materialized_views.sql"
+
+HEADER = """-- GENERATED by scripts/generate_materialized_views.py; do not edit by hand.
+-- Optional precomputed aggregates for the tenure / monthly charges bins.
+-- Safe to re-run; apply with: psql "$DATABASE_URL" -f sql/materialized_views.sql
+-- then set BINS_USE_MATERIALIZED_VIEWS=true so the API reads from the views.
+--
+-- The view bodies are TENURE_BINS_SQL and MONTHLY_BINS_SQL from
+-- py/analysis/tenure_bins.py and py/analysis/monthly_bins.py (labels and edges
+-- come from the bins definitions in py/core/utils.py). After changing the bins,
+-- regenerate this file and re-apply it; the views are dropped and recreated so
+-- existing databases pick up the new definitions. They are refreshed by
+-- scripts/clean_and_aggregate.py via refresh_churn_bins().
+"""
+
+FOOTER = """
+-- Unique indexes let the views be refreshed CONCURRENTLY (readers are not blocked)
+CREATE UNIQUE INDEX IF NOT EXISTS mv_churn_tenure_bins_range_idx
+    ON mv_churn_tenure_bins (tenure_range);
+
+CREATE UNIQUE INDEX IF NOT EXISTS mv_churn_monthly_bins_range_idx
+    ON mv_churn_monthly_bins (charge_range);
+
+-- Called by the ETL pipeline (supabase.rpc("refresh_churn_bins")) after a load
+CREATE OR REPLACE FUNCTION refresh_churn_bins() RETURNS void
+LANGUAGE plpgsql AS $$
+BEGIN
+    REFRESH MATERIALIZED VIEW CONCURRENTLY mv_churn_tenure_bins;
+    REFRESH MATERIALIZED VIEW CONCURRENTLY mv_churn_monthly_bins;
+END;
+$$;
+"""
+
+def view_sql(name, query):
+    """Render DROP + CREATE statements for one materialized view over a bins query."""
+    
+    return f"""
+DROP MATERIALIZED VIEW IF EXISTS {name};
+CREATE MATERIALIZED VIEW {name} AS
+{query.strip()}
+"""
+
+def render():
+    """Render the full materialized views SQL file."""
+    
+    return (
+        HEADER
+        + view_sql("mv_churn_tenure_bins", TENURE_BINS_SQL)
+        + view_sql("mv_churn_monthly_bins", MONTHLY_BINS_SQL)
+        + FOOTER
+    )
+
+def main():
+    """Write (or with --check, verify) sql/materialized_views.sql."""
+    
+    sql = render()
+    current = SQL_PATH.read_text(encoding="utf-8") if SQL_PATH.exists() else None
+    
+    if "--check" in sys.argv[1:]:
+        if current != sql:
+            print(f"❌ {SQL_PATH.name} is out of date with the bins definitions; run scripts/generate_materialized_views.py")
+            return 1
+        print(f"✅ {SQL_PATH.name} matches the bins definitions.")
+        return 0
+    
+    SQL_PATH.write_text(sql, encoding="utf-8")
+    print(f"✅ Wrote {SQL_PATH}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,20 @@
+-- Optional normalized contract type column for the contract churn queries.
+-- Safe to re-run; apply with: psql "$DATABASE_URL" -f sql/contract_norm.sql
+-- then set CONTRACT_USE_NORMALIZED_COLUMN=true so the API groups on it.
+--
+-- The generated column stores the same label the queries in
+-- py/analysis/churn_by_contract.py compute per row (NULL/blank contracts
+-- become 'Unknown'), so grouping and COUNT(DISTINCT ...) skip the per-row
+-- TRIM/CASE, and on large tables can use an index-only scan. Adding a STORED
+-- column rewrites the table once.
+ALTER TABLE churn_customers
+    ADD COLUMN IF NOT EXISTS contract_norm text
+    GENERATED ALWAYS AS (
+        CASE
+            WHEN "Contract" IS NULL OR TRIM("Contract") = '' THEN 'Unknown'
+            ELSE "Contract"
+        END
+    ) STORED;
+
+CREATE INDEX IF NOT EXISTS churn_customers_contract_norm_idx
+    ON churn_customers (contract_norm);
@@ -0,0 +1,13 @@
+-- Optional indexes for the churn analysis queries.
+-- Safe to re-run; apply with: psql "$DATABASE_URL" -f sql/indexes.sql
+
+-- Tenure / monthly charges bins only aggregate churned customers. These
+-- partial indexes cover exactly those rows, so the bins queries can be
+-- answered with an index-only scan instead of a full heap scan.
+CREATE INDEX IF NOT EXISTS churn_customers_churned_tenure_idx
+    ON churn_customers (tenure)
+    WHERE "Churn" = 'Yes' AND tenure IS NOT NULL;
+
+CREATE INDEX IF NOT EXISTS churn_customers_churned_monthly_charges_idx
+    ON churn_customers ("MonthlyCharges")
+    WHERE "Churn" = 'Yes' AND "MonthlyCharges" IS NOT NULL;
@@ -0,0 +1,49 @@
+-- GENERATED by scripts/generate_materialized_views.py; do not edit by hand.
+-- Optional precomputed aggregates for the tenure / monthly charges bins.
+-- Safe to re-run; apply with: psql "$DATABASE_URL" -f sql/materialized_views.sql
+-- then set BINS_USE_MATERIALIZED_VIEWS=true so the API reads from the views.
+--
+-- The view bodies are TENURE_BINS_SQL and MONTHLY_BINS_SQL from
+-- py/analysis/tenure_bins.py and py/analysis/monthly_bins.py (labels and edges
+-- come from the bins definitions in py/core/utils.py). After changing the bins,
+-- regenerate this file and re-apply it; the views are dropped and recreated so
+-- existing databases pick up the new definitions. They are refreshed by
+-- scripts/clean_and_aggregate.py via refresh_churn_bins().
+
+DROP MATERIALIZED VIEW IF EXISTS mv_churn_tenure_bins;
+CREATE MATERIALIZED VIEW mv_churn_tenure_bins AS
+SELECT 
+    (ARRAY['0–3', '4–6', '7–12', '13–24', '25+'])[5 - width_bucket((-tenure)::NUMERIC, ARRAY[-24, -12, -6, -3]::NUMERIC[])] as tenure_range,
+    COUNT(*) as count,
+    SUM(COUNT(*)) OVER () as total_churned,
+    ROUND(COUNT(*)::NUMERIC / NULLIF(SUM(COUNT(*)) OVER (), 0), 4)::FLOAT as pct
+FROM churn_customers
+WHERE "Churn" = 'Yes' AND tenure IS NOT NULL
+GROUP BY 1;
+
+DROP MATERIALIZED VIEW IF EXISTS mv_churn_monthly_bins;
+CREATE MATERIALIZED VIEW mv_churn_monthly_bins AS
+SELECT 
+    (ARRAY['0–35', '36–65', '66–95', '96+'])[4 - width_bucket((-"MonthlyCharges")::NUMERIC, ARRAY[-95, -65, -35]::NUMERIC[])] as charge_range,
+    COUNT(*) as count,
+    SUM(COUNT(*)) OVER () as total_churned,
+    ROUND(COUNT(*)::NUMERIC / NULLIF(SUM(COUNT(*)) OVER (), 0), 4)::FLOAT as pct
+FROM churn_customers
+WHERE "Churn" = 'Yes' AND "MonthlyCharges" IS NOT NULL
+GROUP BY 1;
+
+-- Unique indexes let the views be refreshed CONCURRENTLY (readers are not blocked)
+CREATE UNIQUE INDEX IF NOT EXISTS mv_churn_tenure_bins_range_idx
+    ON mv_churn_tenure_bins (tenure_range);
+
+CREATE UNIQUE INDEX IF NOT EXISTS mv_churn_monthly_bins_range_idx
+    ON mv_churn_monthly_bins (charge_range);
+
+-- Called by the ETL pipeline (supabase.rpc("refresh_churn_bins")) after a load
+CREATE OR REPLACE FUNCTION refresh_churn_bins() RETURNS void
+LANGUAGE plpgsql AS $$
+BEGIN
+    REFRESH MATERIALIZED VIEW CONCURRENTLY mv_churn_tenure_bins;
+    REFRESH MATERIALIZED VIEW CONCURRENTLY mv_churn_monthly_bins;
+END;
+$$;
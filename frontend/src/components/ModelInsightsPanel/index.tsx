@@ -47,6 +47,21 @@ interface BaselineModelResponse {
   training_info: TrainingInfo;
 }
 
+interface RetrainJobResponse {
+  status: string;
+  job_id: string | null;
+}
+
+interface RetrainStatusResponse {
+  status: string;
+  job_id: string | null;
+  error: string | null;
+}
+
+// Retraining runs in the background; poll its status every second, for up to 5 minutes
+const RETRAIN_POLL_INTERVAL_MS = 1000;
+const RETRAIN_MAX_POLLS = 300;
+
 const ModelInsightsPanel: React.FC = () => {
   const [modelData, setModelData] = useState<BaselineModelResponse | null>(null);
   const [loading, setLoading] = useState(true);
@@ -122,6 +137,40 @@ const ModelInsightsPanel: React.FC = () => {
         throw new Error(`Retrain API error! status: ${response.status}`);
       }
 
+      const retrainJob: RetrainJobResponse = await response.json();
+      let jobId = retrainJob.job_id;
+
+      // Poll the job until it finishes; only 'succeeded' counts as success
+      let succeeded = false;
+      for (let attempt = 0; attempt < RETRAIN_MAX_POLLS && !succeeded; attempt++) {
+        await new Promise(resolve => setTimeout(resolve, RETRAIN_POLL_INTERVAL_MS));
+
+        const statusResponse = await fetch(`${API_BASE_URL}/api/model/baseline/retrain/status`);
+
+        if (!statusResponse.ok) {
+          throw new Error(`Retrain status API error! status: ${statusResponse.status}`);
+        }
+
+        const retrainStatus: RetrainStatusResponse = await statusResponse.json();
+
+        // A retrain already in progress may not have reported its job id yet
+        if (jobId === null && retrainStatus.status === 'running') {
+          jobId = retrainStatus.job_id;
+        }
+        if (jobId === null || retrainStatus.job_id !== jobId) {
+          continue;
+        }
+
+        if (retrainStatus.status === 'failed') {
+          throw new Error(retrainStatus.error || 'Failed to retrain model');
+        }
+        succeeded = retrainStatus.status === 'succeeded';
+      }
+
+      if (!succeeded) {
+        throw new Error('Model retraining is taking longer than expected; check back later');
+      }
+
       // Show success toast
       showToast('Model retrained successfully!', 'success');
       